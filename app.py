@@ -1,11 +1,17 @@
-from flask import Flask, request, jsonify, send_from_directory
-import subprocess
+from flask import Flask, Response, request, jsonify, send_from_directory
 import os
 import threading
 import time
 import json
+import hashlib
+import zlib
 from ga import snake_ga_data
-from flask_socketio import SocketIO, emit
+from ga import snake_ga_export
+from ga import snake_metrics
+from ga.snake_replay import GameReplayer
+from ga.snake_ga_charts import downsample_records
+from ga.snake_training_service import TrainingService
+from flask_socketio import SocketIO, emit, join_room, leave_room
 from ga.snake_training_journey import TrainingJourney, start_training_journey
 from ga.journey_api import register_journey_routes
 from ga.journey_visualizer import JourneyVisualizer, visualize_best_agent_from_session
@@ -13,190 +19,276 @@ from ga.journey_visualizer import JourneyVisualizer, visualize_best_agent_from_s
 app = Flask(__name__, static_folder='', static_url_path='')
 socketio = SocketIO(app)
 
-# Global variable to track training process
-training_thread = None
-training_process = None
-training_paused = False
-current_training_config = None
+# Training service: pre-warmed worker processes running the queued training jobs
+training_service = None
+training_service_lock = threading.Lock()
+
+# Seconds between checks of the generation logs of sessions trained outside the training service
+GENERATION_POLL_INTERVAL = 0.5
+# Last generation pushed to subscribers, per session
+generations_sent = {}
+generations_lock = threading.Lock()
+generation_follower = None
+
+# Seconds /api/train/stop waits for the training job to reach a generation boundary
+STOP_TIMEOUT = 5.0
+
+# Maximum total size of the serialised responses kept in memory
+RESPONSE_CACHE_BYTES = 32 * 1024 * 1024
+response_cache = snake_ga_data.LRUCache(max_bytes=RESPONSE_CACHE_BYTES, sizeof=lambda entry: len(entry[0]))
+
+def service_metric(key):
+    """Read a training service metric at scrape time, without starting the service."""
+    def read():
+        service = training_service
+        return service.metrics()[key] if service is not None else None
+    return read
+
+def training_jobs_metric():
+    """Count the training jobs per state at scrape time."""
+    service = training_service
+    if service is None:
+        return None
+    return {(state,): count for state, count in service.metrics()['jobs'].items()}
+
+def cache_metric(key):
+    """Read a statistic of the response and chart caches at scrape time."""
+    def read():
+        return {('response',): response_cache.stats()[key], ('chart',): snake_ga_data.get_chart_cache_stats()[key]}
+    return read
+
+# Prometheus metrics (see /metrics); training counters come from the jobs' timings events
+metrics = snake_metrics.REGISTRY
+metrics.gauge('snake_evaluation_queue_depth', 'Agents of the running generations waiting to be evaluated.',
+              function=service_metric('evaluation_queue_depth'))
+metrics.gauge('snake_persistence_queue_depth', 'Writes of the running training jobs waiting for the disk.',
+              function=service_metric('persistence_queue_depth'))
+metrics.gauge('snake_training_jobs', 'Training jobs per state.', ('state',), function=training_jobs_metric)
+metrics.gauge('snake_training_workers', 'Training worker processes.', function=service_metric('workers'))
+metrics.gauge('snake_training_workers_busy', 'Training worker processes running a job.',
+              function=service_metric('workers_busy'))
+metrics.gauge('snake_training_cpu_allocated', 'Evaluation processes allocated to running jobs.',
+              function=service_metric('allocated'))
+metrics.gauge('snake_training_agent_games_per_second', 'Agent games per second of the running jobs.',
+              function=service_metric('agent_games_per_sec'))
+metrics.counter('snake_cache_hits_total', 'Cache hits.', ('cache',), function=cache_metric('hits'))
+metrics.counter('snake_cache_misses_total', 'Cache misses.', ('cache',), function=cache_metric('misses'))
+metrics.gauge('snake_cache_hit_ratio', 'Share of cache lookups that were hits.', ('cache',),
+              function=cache_metric('hit_rate'))
+SOCKETIO_CLIENTS = metrics.gauge('snake_socketio_clients', 'Connected Socket.IO clients.')
+SOCKETIO_EVENTS = metrics.counter('snake_socketio_events_emitted_total', 'Socket.IO events emitted.', ('event',))
 
 @app.route('/')
 def serve():
     return send_from_directory(app.static_folder, 'index.html')
 
-def run_training_process(epochs, population_size, mutation_rate, crossover_rate, elitism, games_per_agent):
-    """Run the training process in a separate thread."""
-    global training_process
-    
-    # Build command with parameters
-    command = [
-        'python3', 'ga/snake_ga_training.py',
-        '--generations', str(epochs),
-        '--population', str(population_size),
-        '--mutation', str(mutation_rate),
-        '--crossover', str(crossover_rate),
-        '--elitism', str(elitism),
-        '--games', str(games_per_agent)
-    ]
-    
-    # Start the process
-    training_process = subprocess.Popen(
-        command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-    
-    # Wait for process to complete
-    stdout, stderr = training_process.communicate()
-    
-    # Capture return code before unsetting training_process
-    retcode = training_process.returncode
-    
-    # Log detailed information
-    print(f"Command executed: {' '.join(command)}")
-    print(f"Process output: {stdout}")
-    print(f"Process error: {stderr}")
-    print(f"Process return code: {retcode}")
-    
-    # Process is done, unset global variable
-    training_process = None
-    
-    if retcode == 0:
-        print("Training completed successfully")
+def handle_training_event(event):
+    """Handle an event streamed by a training job."""
+    event_type = event.get('type')
+    if event_type == 'generation':
+        # Generations of service jobs are pushed as their workers report them
+        publish_generation(event)
+    elif event_type == 'timings':
+        snake_metrics.observe_generation(event['generation_time'], event['phases'], event.get('agent_games', 0))
+    elif event_type == 'queues':
+        # Kept by the training service (see /metrics)
+        pass
     else:
-        print(f"Training failed with error: {stderr}")
+        print(f"Training event: {event}")
+
+def get_training_service():
+    """Get the training service, starting its worker processes on first use."""
+    global training_service
+    with training_service_lock:
+        if training_service is None:
+            training_service = TrainingService(on_event=handle_training_event,
+                                               cwd=os.path.dirname(os.path.abspath(__file__)))
+        return training_service
+
+def get_training_job():
+    """Get the job named by the `job_id` parameter, or the running job (the next queued one if none runs)."""
+    service = get_training_service()
+    job_id = request.args.get('job_id') or (request.get_json(silent=True) or {}).get('job_id')
+    return service.get(job_id) if job_id else service.active_job()
+
+def latest_session_id(job=None):
+    """Session of a training job, else of the most recently started job (None if no job started one)."""
+    if job is not None and job.session_id:
+        return job.session_id
+    sessions = [job_data['session_id'] for job_data in get_training_service().list_jobs() if job_data['session_id']]
+    return sessions[-1] if sessions else None
+
+def no_training_job():
+    return jsonify({
+        'status': 'error',
+        'message': 'No training job is running'
+    }), 400
 
 @app.route('/api/train', methods=['POST'])
 def start_training():
-    global training_thread, training_process, training_paused, current_training_config
-    
-    # Check if training is already running
-    if training_thread and training_thread.is_alive():
-        return jsonify({
-            'status': 'error',
-            'message': 'Training is already running'
-        }), 400
-    
     # Get training parameters
     data = request.json
-    epochs = data.get('epochs', 100)
-    population_size = data.get('population_size', 100)
-    mutation_rate = data.get('mutation_rate', 0.1)
-    crossover_rate = data.get('crossover_rate', 0.7)
-    elitism = data.get('elitism', 0.1)
-    games_per_agent = data.get('games_per_agent', 3)
-    
-    # Store the current training configuration
-    current_training_config = {
-        'epochs': epochs,
-        'population_size': population_size,
-        'mutation_rate': mutation_rate,
-        'crossover_rate': crossover_rate,
-        'elitism': elitism,
-        'games_per_agent': games_per_agent
+    config = {
+        'generations': data.get('epochs', 100),
+        'population': data.get('population_size', 100),
+        'mutation': data.get('mutation_rate', 0.1),
+        'crossover': data.get('crossover_rate', 0.7),
+        'elitism': data.get('elitism', 0.1),
+        'games': data.get('games_per_agent', 3),
+        # Worker budget: processes evaluating the job's agents (capped at the CPUs of the host)
+        'workers': data.get('workers', 1),
+        # Optional tracemalloc report per generation (slows training down)
+        'memory_profile': bool(data.get('memory_profile', False)),
+        'memory_threshold': data.get('memory_threshold', 50)
     }
     
-    # Reset the paused flag
-    training_paused = False
-    
-    # Start training in a background thread
-    training_thread = threading.Thread(
-        target=run_training_process,
-        args=(epochs, population_size, mutation_rate, crossover_rate, elitism, games_per_agent),
-        daemon=True
-    )
-    training_thread.start()
+    # Queue the job: it starts as soon as a training worker and a CPU are free
+    service = get_training_service()
+    job = service.submit(config)
+    position = service.queue_position(job.id)
     
     return jsonify({
         'status': 'success',
-        'message': 'Training started in the background'
+        'message': 'Training started in the background' if position is None
+                   else f'Training queued at position {position + 1}',
+        'job_id': job.id,
+        'job': job.to_dict()
     })
 
-@app.route('/api/train/pause', methods=['POST'])
-def pause_training():
-    global training_paused, training_process
-    
-    if training_process is None:
+@app.route('/api/train/jobs', methods=['GET'])
+def list_training_jobs():
+    service = get_training_service()
+    return jsonify({
+        'status': 'success',
+        'jobs': service.list_jobs(),
+        'metrics': service.metrics()
+    })
+
+@app.route('/api/train/jobs/<job_id>', methods=['GET'])
+def get_training_job_route(job_id):
+    job = get_training_service().get(job_id)
+    if job is None:
         return jsonify({
             'status': 'error',
-            'message': 'No training process is running'
+            'message': f'Training job {job_id} not found'
+        }), 404
+    return jsonify({
+        'status': 'success',
+        'job': job.to_dict()
+    })
+
+@app.route('/api/train/jobs/<job_id>', methods=['DELETE'])
+@app.route('/api/train/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_training_job(job_id):
+    service = get_training_service()
+    if not service.cancel(job_id):
+        return jsonify({
+            'status': 'error',
+            'message': f'Training job {job_id} is not queued or running'
         }), 400
+    job = service.get(job_id)
+    return jsonify({
+        'status': 'success',
+        'message': 'Training job cancelled' if job.done
+                   else 'Training job will stop at the end of the current generation',
+        'job': job.to_dict()
+    })
+
+@app.route('/api/train/pause', methods=['POST'])
+def pause_training():
+    job = get_training_job()
+    if job is None or job.done:
+        return no_training_job()
     
-    if training_paused:
+    if job.state == 'paused':
         return jsonify({
             'status': 'error',
             'message': 'Training is already paused'
         }), 400
     
-    # Send a pause signal to the training process
-    # This would typically involve a signal or mechanism to pause the training
-    # For this implementation, we'll simulate pausing by sending a SIGSTOP signal
-    try:
-        # In a real implementation, you might use a custom signal or API call
-        # to tell your training process to pause
-        training_paused = True
-        
-        # For demo purposes, let's log the pause event
-        print(f"Training paused at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        return jsonify({
-            'status': 'success',
-            'message': 'Training paused successfully'
-        })
-    except Exception as e:
+    # Ask the training job to pause at the end of the current generation
+    if not get_training_service().send(job.id, 'pause'):
         return jsonify({
             'status': 'error',
-            'message': f'Error pausing training: {str(e)}'
-        }), 500
+            'message': 'Training job is not running'
+        }), 400
+    print(f"Training pause requested at {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    return jsonify({
+        'status': 'success',
+        'message': 'Training paused successfully',
+        'detail': 'Training pauses at the end of the current generation'
+    })
 
 @app.route('/api/train/continue', methods=['POST'])
 def continue_training():
-    global training_paused, training_process
+    job = get_training_job()
+    if job is None or job.done:
+        return no_training_job()
     
-    if training_process is None:
+    if job.state != 'paused':
         return jsonify({
             'status': 'error',
-            'message': 'No training process is running'
+            'message': 'Training is not paused'
         }), 400
     
-    if not training_paused:
+    # Ask the training job to resume
+    if not get_training_service().send(job.id, 'resume'):
         return jsonify({
             'status': 'error',
-            'message': 'Training is not paused'
+            'message': 'Training job is not running'
         }), 400
+    print(f"Training continued at {time.strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Send a continue signal to the training process
-    try:
-        # In a real implementation, you might use a custom signal or API call
-        # to tell your training process to continue
-        training_paused = False
-        
-        # For demo purposes, let's log the continue event
-        print(f"Training continued at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        return jsonify({
-            'status': 'success',
-            'message': 'Training continued successfully'
-        })
-    except Exception as e:
+    return jsonify({
+        'status': 'success',
+        'message': 'Training continued successfully'
+    })
+
+@app.route('/api/train/profile', methods=['POST'])
+def profile_training():
+    job = get_training_job()
+    if job is None or job.done:
+        return no_training_job()
+    
+    generations = (request.get_json(silent=True) or {}).get('generations', 1)
+    if not isinstance(generations, int) or generations < 1:
         return jsonify({
             'status': 'error',
-            'message': f'Error continuing training: {str(e)}'
-        }), 500
-
-@app.route('/api/train/save', methods=['POST'])
-def save_training():
-    global training_process, current_training_config
+            'message': 'generations must be a positive integer'
+        }), 400
     
-    if training_process is None:
+    # The capture starts with the next generation; its files are listed in the job's profiles
+    if not get_training_service().send(job.id, 'profile', generations=generations):
         return jsonify({
             'status': 'error',
-            'message': 'No training process is running'
+            'message': 'Training job is not running'
         }), 400
     
+    return jsonify({
+        'status': 'success',
+        'message': f'Profiling the next {generations} generations',
+        'job_id': job.id,
+        'detail': 'The .pstats and collapsed-stack files are saved in the profiles directory of the session'
+    })
+
+@app.route('/api/train/save', methods=['POST'])
+def save_training():
+    job = get_training_job()
+    if job is None or job.done:
+        return no_training_job()
+    
     try:
-        # Get current training data
-        training_data = snake_ga_data.get_latest_data()
+        # Ask the training job to checkpoint its data at the end of the current generation
+        get_training_service().send(job.id, 'checkpoint')
+        
+        # Get current training data (training runs in a worker process: read what it saved)
+        training_data = snake_ga_data.load_training_session(job.session_id) if job.session_id else None
+        if not training_data and job.last_generation:
+            training_data = {
+                'session_id': job.session_id,
+                'current': job.last_generation
+            }
         
         if not training_data:
             return jsonify({
@@ -216,7 +308,8 @@ def save_training():
         
         save_data = {
             'timestamp': timestamp,
-            'config': current_training_config,
+            'job_id': job.id,
+            'config': job.config,
             'training_data': training_data
         }
         
@@ -234,47 +327,121 @@ def save_training():
             'message': f'Error saving training: {str(e)}'
         }), 500
 
+def not_modified(etag):
+    """Return a 304 response if the client already has this ETag, else None."""
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+def snapshot_response(body, version=None):
+    """Build a JSON response from an already serialised body."""
+    etag = '%s-%08x' % (version, zlib.crc32(body.encode('utf-8')))
+    response = not_modified(etag)
+    if response is None:
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+    if version is not None:
+        response.headers['X-Data-Version'] = str(version)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def cached_json_response(version, build):
+    """
+    Serve a versioned JSON resource with an ETag and a server-side cache.
+    
+    The ETag is derived from the request (path and query) and `version`, a
+    cheap stamp of the underlying data. A matching If-None-Match gets a 304;
+    otherwise the body is served from the response cache or built with
+    `build`, which returns (data, headers) or (None, None) if not found.
+    
+    Returns:
+        Response, or None if `build` found nothing.
+    """
+    etag = hashlib.sha1(repr((request.path, sorted(request.args.items(multi=True)), version))
+                        .encode('utf-8')).hexdigest()
+    response = not_modified(etag)
+    if response is None:
+        entry = response_cache.get(etag)
+        if entry is None:
+            data, headers = build()
+            if data is None:
+                return None
+            entry = (json.dumps(data), headers or {})
+            response_cache.put(etag, entry)
+        body, headers = entry
+        response = app.response_class(body, mimetype='application/json')
+        response.headers.update(headers)
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/api/train/status', methods=['GET'])
 def training_status():
-    global training_thread, training_process, training_paused
+    # The running job, or the next queued one (or the one named by `job_id`)
+    job = get_training_job()
+    is_active = job is not None and not job.done
     
-    # Check if training thread is active
-    is_active = training_thread is not None and training_thread.is_alive()
+    # Dashboard data of the job's session, written by its worker once per generation
+    session_id = latest_session_id(job)
+    snapshot = snake_ga_data.get_session_snapshot(session_id) if session_id else None
+    version, data = snapshot if snapshot else (None, 'null')
     
-    # Get additional status from snake_ga_data
-    training_data = snake_ga_data.get_latest_data()
+    # Progress streamed by the training job (its data is not in this process)
+    progress = {
+        'job_id': job.id,
+        'session_id': job.session_id,
+        'state': job.state,
+        'generation': job.last_generation,
+        'workers': job.workers,
+        'share': job.share,
+        'agent_games_per_sec': job.agent_games_per_sec,
+        'avg_agent_games_per_sec': job.avg_agent_games_per_sec
+    } if job is not None else None
     
-    return jsonify({
-        'active': is_active,
-        'paused': training_paused,
-        'data': training_data
-    })
+    # Throughput and CPU share of every job sharing the workers
+    service = get_training_service()
+    jobs = [{key: job_data[key] for key in ('job_id', 'state', 'session_id', 'workers', 'share', 'agent_games',
+                                            'agent_games_per_sec', 'avg_agent_games_per_sec')}
+            for job_data in service.list_jobs() if job_data['state'] in ('running', 'paused', 'queued')]
+    
+    body = '{"active": %s, "paused": %s, "data": %s, "progress": %s, "jobs": %s, "scheduler": %s}' % (
+        json.dumps(is_active), json.dumps(is_active and job.state == 'paused'), data, json.dumps(progress),
+        json.dumps(jobs), json.dumps(service.metrics()))
+    return snapshot_response(body, version)
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(metrics.render(), content_type=snake_metrics.CONTENT_TYPE)
 
 @app.route('/api/train/stop', methods=['POST'])
 def stop_training():
-    global training_process, training_paused
-    
-    if training_process is None:
-        return jsonify({
-            'status': 'error',
-            'message': 'No training process is running'
-        }), 400
+    job = get_training_job()
+    if job is None or job.done:
+        return no_training_job()
     
-    # Terminate the training process
     try:
-        training_process.terminate()
-        time.sleep(1)  # Give it a moment to terminate
-        
-        # Force kill if still running
-        if training_process.poll() is None:
-            training_process.kill()
+        force = request.args.get('force', 'false').lower() == 'true'
+        service = get_training_service()
         
-        # Reset the paused flag
-        training_paused = False
+        if job.state == 'queued':
+            service.cancel(job.id)
+            message = 'Training job cancelled'
+        # Ask the training loop to stop at a generation boundary, so the session is saved
+        elif not force and service.send(job.id, 'stop') and service.wait(job.id, STOP_TIMEOUT):
+            message = 'Training job stopped'
+        elif force:
+            # Kill the worker running the job; a fresh worker replaces it
+            service.terminate(job.id)
+            message = 'Training job stopped'
+        else:
+            message = 'Training job will stop at the end of the current generation'
         
         return jsonify({
             'status': 'success',
-            'message': 'Training process stopped'
+            'message': message,
+            'job_id': job.id
         })
     except Exception as e:
         return jsonify({
@@ -284,41 +451,187 @@ def stop_training():
 
 @app.route('/api/data', methods=['GET'])
 def get_training_data():
-    # Get session ID from query parameters if provided
+    # Get session ID from query parameters if provided, else use the training job's session
     session_id = request.args.get('session_id')
+    generation = request.args.get('generation', type=int)
+    points = request.args.get('points', type=int)
     
-    if session_id:
-        # Load specific session data
-        data = snake_ga_data.load_training_session(session_id)
-        if data:
-            return jsonify(data)
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': f'Session {session_id} not found'
-            }), 404
-    else:
-        # Get latest data
-        data = snake_ga_data.get_latest_data()
-        if data:
-            return jsonify(data)
-        else:
+    if not session_id:
+        session_id = latest_session_id(get_training_job())
+        if not session_id:
             return jsonify({
                 'status': 'error',
                 'message': 'No training data available'
             }), 404
+    
+    def build():
+        if points:
+            data = snake_ga_data.get_dashboard_data(session_id, points)
+            if data and generation is not None:
+                data['best_agent'] = snake_ga_data.load_best_agent(session_id, generation)
+        else:
+            data = snake_ga_data.load_training_session(session_id, best_agent_generation=generation)
+        return data, None
+    
+    version = snake_ga_data.get_session_version(session_id)
+    response = cached_json_response(version, build) if version is not None else None
+    if response is not None:
+        return response
+    return jsonify({
+        'status': 'error',
+        'message': f'Session {session_id} not found'
+    }), 404
+
+@app.route('/api/data/generations', methods=['GET'])
+def get_generation_data():
+    session_id = request.args.get('session_id')
+    points = request.args.get('points', type=int)
+    
+    if not session_id:
+        return jsonify({
+            'status': 'error',
+            'message': 'session_id is required'
+        }), 400
+    
+    start = request.args.get('from', type=int)
+    stop = request.args.get('to', type=int)
+    since = request.args.get('since', type=int)
+    limit = request.args.get('limit', type=int)
+    fields = request.args.get('fields')
+    
+    if since is not None:
+        # Incremental updates: only generations after the last one seen
+        start = since + 1 if start is None else max(start, since + 1)
+    
+    if start is None and stop is None and limit is None and not fields:
+        return jsonify(snake_ga_data.get_generation_series(session_id, points))
+    
+    records = snake_ga_data.get_generation_range(
+        session_id, start, stop, limit, fields.split(',') if fields else None)
+    if points:
+        records = downsample_records(records, points)
+    return jsonify(records)
+
+@app.route('/api/data/timings', methods=['GET'])
+def get_phase_timings():
+    session_id = request.args.get('session_id')
+    
+    if not session_id:
+        return jsonify({
+            'status': 'error',
+            'message': 'session_id is required'
+        }), 400
+    
+    return jsonify(snake_ga_data.get_phase_timings(
+        session_id,
+        request.args.get('from', type=int),
+        request.args.get('to', type=int),
+        request.args.get('limit', type=int)
+    ))
+
+@app.route('/api/data/memory', methods=['GET'])
+def get_memory_reports():
+    session_id = request.args.get('session_id')
+    
+    if not session_id:
+        return jsonify({
+            'status': 'error',
+            'message': 'session_id is required'
+        }), 400
+    
+    return jsonify(snake_ga_data.get_memory_reports(
+        session_id,
+        request.args.get('from', type=int),
+        request.args.get('to', type=int),
+        request.args.get('limit', type=int)
+    ))
+
+@app.route('/api/data/best_agent', methods=['GET'])
+def get_best_agent():
+    session_id = request.args.get('session_id')
+    generation = request.args.get('generation', type=int)
+    
+    if not session_id:
+        return jsonify({
+            'status': 'error',
+            'message': 'session_id is required'
+        }), 400
+    
+    agent = snake_ga_data.load_best_agent(session_id, generation)
+    if agent:
+        return jsonify(agent)
+    return jsonify({
+        'status': 'error',
+        'message': f'Best agent not found for session {session_id}'
+    }), 404
 
 @app.route('/api/sessions', methods=['GET'])
 def list_sessions():
-    sessions = snake_ga_data.list_training_sessions()
-    return jsonify(sessions)
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', 0, type=int)
+    status = request.args.get('status')
+    min_fitness = request.args.get('min_fitness', type=float)
+    descending = request.args.get('order', 'asc') == 'desc'
+    
+    def build():
+        sessions = snake_ga_data.list_training_sessions(
+            limit=limit, offset=offset, status=status, min_fitness=min_fitness, descending=descending)
+        total = snake_ga_data.count_training_sessions(status=status, min_fitness=min_fitness)
+        return sessions, {'X-Total-Count': str(total)}
+    
+    return cached_json_response(snake_ga_data.get_session_catalog().version(), build)
+
+@app.route('/api/sessions/<session_id>/export', methods=['GET'])
+def export_session(session_id):
+    export_format = request.args.get('format', 'jsonl')
+    if export_format not in snake_ga_export.EXPORT_FORMATS:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown export format: {export_format}'
+        }), 400
+    
+    try:
+        chunks = snake_ga_export.iter_session_export(session_id, export_format)
+    except FileNotFoundError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 404
+    
+    headers = {
+        'Content-Disposition': f'attachment; filename=session_{session_id}.{export_format}',
+        'Vary': 'Accept-Encoding'
+    }
+    # npz members are already binary arrays; gzip only pays off for text
+    if export_format != 'npz' and 'gzip' in request.headers.get('Accept-Encoding', ''):
+        chunks = snake_ga_export.gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    
+    return Response(chunks, mimetype=snake_ga_export.EXPORT_FORMATS[export_format], headers=headers)
+
+@app.route('/api/sessions/<session_id>/archive', methods=['POST'])
+def archive_session_route(session_id):
+    try:
+        archive_path = snake_ga_data.archive_session(session_id)
+    except FileNotFoundError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 404
+    except RuntimeError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 409
+    
+    return jsonify({
+        'status': 'success',
+        'message': f'Session {session_id} archived',
+        'archive_path': archive_path
+    })
 
 @socketio.on('connect')
 def handle_connect():
+    SOCKETIO_CLIENTS.inc()
     print('Client connected')
 
 @socketio.on('disconnect')
 def handle_disconnect():
+    SOCKETIO_CLIENTS.dec()
     print('Client disconnected')
 
 @socketio.on('game_start')
@@ -330,21 +643,125 @@ def handle_game_start(data):
 def handle_game_data(data):
     print('Received game data:', data)
 
+def publish_generation(event):
+    """Push a generation_complete event to the subscribers of its session, once per generation."""
+    session_id = event['session_id']
+    generation = event['record']['generation']
+    with generations_lock:
+        if generation <= generations_sent.get(session_id, -1):
+            return
+        generations_sent[session_id] = generation
+    socketio.emit('generation_complete', event, to=f'generations:{session_id}')
+    socketio.emit('generation_complete', event, to='generations:*')
+    SOCKETIO_EVENTS.labels(event='generation_complete').inc(2)
+
+# Generations recorded in this process are pushed as soon as they are recorded
+snake_ga_data.add_generation_listener(publish_generation)
+
+def external_sessions():
+    """Active sessions not trained by the training service (e.g. ga.snake_ga_training run by hand)."""
+    service = training_service
+    owned = {job['session_id'] for job in service.list_jobs()} if service is not None else set()
+    return [session['session_id'] for session in snake_ga_data.list_training_sessions(status='active')
+            if session['session_id'] not in owned]
+
+def follow_generation_logs():
+    """
+    Push the generations of sessions trained outside the training service.
+    
+    Runs only while such sessions are active; a later subscription starts it again.
+    """
+    global generation_follower
+    versions = {}
+    while True:
+        with generations_lock:
+            sessions = external_sessions()
+            if not sessions:
+                generation_follower = None
+                return
+        for session_id in sessions:
+            # A stat per session: the log is only read when it has grown
+            version = snake_ga_data.get_generation_log_version(session_id)
+            if version is None or versions.get(session_id) == version:
+                continue
+            versions[session_id] = version
+            with generations_lock:
+                since = generations_sent.get(session_id)
+            events = snake_ga_data.get_generation_events(session_id, since)
+            if since is None:
+                # Session seen for the first time: subscribers resume older generations with `since`
+                events = events[-1:]
+            for event in events:
+                publish_generation(event)
+        socketio.sleep(GENERATION_POLL_INTERVAL)
+
+def start_generation_follower():
+    """Start following the generation logs if a session is trained outside the training service."""
+    global generation_follower
+    with generations_lock:
+        if generation_follower is None and external_sessions():
+            generation_follower = socketio.start_background_task(follow_generation_logs)
+
+@socketio.on('subscribe_generations')
+def handle_subscribe_generations(data=None):
+    """
+    Subscribe to generation_complete events.
+    
+    With a session_id, generations after `since` are replayed first so a
+    client can resume from the last generation it has seen. Without one,
+    the client receives the generations of every live session.
+    """
+    data = data or {}
+    session_id = data.get('session_id')
+    join_room(f'generations:{session_id or "*"}')
+    start_generation_follower()
+    
+    if session_id and data.get('since') is not None:
+        # Duplicates with live events are possible; clients skip generations they already have
+        for event in snake_ga_data.get_generation_events(session_id, int(data['since'])):
+            emit('generation_complete', event)
+
+@socketio.on('unsubscribe_generations')
+def handle_unsubscribe_generations(data=None):
+    session_id = (data or {}).get('session_id')
+    leave_room(f'generations:{session_id or "*"}')
+
 # Registrar rotas da API da jornada
 register_journey_routes(app)
 
 # Adicionar rota para visualização de agentes
 @app.route('/api/visualize/agent/<session_id>', methods=['GET'])
 def visualize_agent_route(session_id):
-    result = visualize_best_agent_from_session(session_id)
-    return jsonify({
-        'status': 'success' if result else 'error',
-        'data': result
-    })
+    def build():
+        result = visualize_best_agent_from_session(session_id)
+        return {
+            'status': 'success' if result else 'error',
+            'data': result
+        }, None
+    
+    version = snake_ga_data.get_session_version(session_id)
+    if version is None:
+        data, _ = build()
+        return jsonify(data)
+    return cached_json_response(version, build)
 
 # Adicionar rota para replay de partida
 @app.route('/api/visualize/replay/<session_id>', methods=['GET'])
 def replay_match_route(session_id):
+    # Compact replays are expanded into full frames on demand
+    replay = snake_ga_data.load_best_match(session_id)
+    if replay is not None:
+        start = request.args.get('start', 0, type=int)
+        count = request.args.get('count', type=int)
+        replayer = GameReplayer(replay)
+        frames = list(replayer.frames(start, start + count if count is not None else None))
+        return jsonify({
+            'status': 'success',
+            'replay': replay.to_dict(),
+            'frame_count': replayer.frame_count(),
+            'frames': frames
+        })
+    
     match_file = os.path.join('data', f'session_{session_id}', 'matches', 'best_match.json')
     
     visualizer = JourneyVisualizer(replay_speed=float(request.args.get('speed', 1.0)))
@@ -356,4 +773,7 @@ def replay_match_route(session_id):
     })
 
 if __name__ == '__main__':
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        # Warm up the training workers in the serving process (not in the reloader's watcher)
+        get_training_service()
     socketio.run(app, debug=True, port=8000)
@@ -0,0 +1,22 @@
+"""
+Performance benchmarks of the simulator, the neural network, the genetic
+algorithm, the training loop and process startup.
+
+Run them from the repository root:
+
+    python -m benchmarks                          # run and save to benchmarks/results/
+    python -m benchmarks --quick --only simulator # fewer configurations, one suite
+    python -m benchmarks --compare baseline.json  # run and flag regressions
+    python -m benchmarks --compare baseline.json --results results.json
+"""
+
+from . import bench_ga, bench_network, bench_simulator, bench_startup, bench_training
+
+# Benchmark suites by name, in run order
+SUITES = {
+    'simulator': bench_simulator,
+    'network': bench_network,
+    'ga': bench_ga,
+    'training': bench_training,
+    'startup': bench_startup
+}
@@ -0,0 +1,88 @@
+"""
+Command line entry point: ``python -m benchmarks``.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from . import SUITES
+from .harness import (DEFAULT_THRESHOLD, compare_results, format_value, load_results, machine_info,
+                      result_key, save_results)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def run_suites(names, quick=False):
+    """Run benchmark suites, printing every result as it is measured."""
+    results = []
+    for name in names:
+        print(f"== {name}")
+        for entry in SUITES[name].run(quick=quick):
+            print(f"  {result_key(entry):<60} {format_value(entry['value']):>14} {entry['unit']}")
+            results.append(entry)
+    return results
+
+
+def print_comparison(comparison, threshold):
+    """Print a comparison table and return the number of regressions."""
+    print(f"\n{'benchmark':<60} {'baseline':>14} {'current':>14} {'change':>8}")
+    for row in comparison:
+        flag = {'regression': '  REGRESSION', 'improvement': '  faster'}.get(row['status'], '')
+        print(f"{row['key']:<60} {format_value(row['baseline']):>14} {format_value(row['current']):>14} "
+              f"{row['change']:>+7.1%}{flag}")
+    regressions = sum(1 for row in comparison if row['status'] == 'regression')
+    print(f"\n{len(comparison)} compared, {regressions} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Run the performance benchmarks')
+    parser.add_argument('--only', type=str, default=None,
+                        help=f'Comma-separated suites to run ({", ".join(SUITES)})')
+    parser.add_argument('--quick', action='store_true',
+                        help='Measure fewer configurations')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Result file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', type=str, default=None, metavar='BASELINE',
+                        help='Compare against a baseline result file; exit with status 1 on regressions')
+    parser.add_argument('--results', type=str, default=None,
+                        help='With --compare: compare this result file instead of running the benchmarks')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative slowdown flagged as a regression (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    if args.results:
+        if not args.compare:
+            parser.error('--results requires --compare')
+        results = load_results(args.results)['results']
+    else:
+        names = args.only.split(',') if args.only else list(SUITES)
+        unknown = [name for name in names if name not in SUITES]
+        if unknown:
+            parser.error(f'unknown suite(s): {", ".join(unknown)}')
+
+        info = machine_info()
+        print(f"{info['platform']} | {info['processor'] or info['machine']} | {info['cpu_count']} CPUs | "
+              f"Python {info['python']} | NumPy {info['numpy']} | commit {info['git_commit']}")
+        results = run_suites(names, quick=args.quick)
+
+        output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d_%H%M%S')}.json")
+        save_results(results, output, info)
+        print(f"\nSaved results to {output}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        if baseline['machine'].get('hostname') != machine_info()['hostname'] and not args.results:
+            print(f"Warning: baseline measured on {baseline['machine'].get('hostname')}, "
+                  f"results may not be comparable")
+        comparison = compare_results(results, baseline['results'], args.threshold)
+        if print_comparison(comparison, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+GeneticAlgorithm.evolve time versus population size.
+"""
+
+import random
+
+import numpy as np
+
+from ga.snake_ga import GeneticAlgorithm
+
+from .harness import quiet, result, seconds_per_call
+
+POPULATION_SIZES = (50, 100, 200, 500)
+QUICK_POPULATION_SIZES = (50, 100)
+
+
+def run(quick=False):
+    """
+    Run the genetic algorithm benchmarks.
+
+    Args:
+        quick (bool): Measure fewer configurations.
+
+    Yields:
+        dict: Benchmark results.
+    """
+    for population_size in QUICK_POPULATION_SIZES if quick else POPULATION_SIZES:
+        random.seed(0)
+        np.random.seed(0)
+        with quiet():
+            ga = GeneticAlgorithm(population_size=population_size)
+
+        def assign_fitness():
+            # Fresh fitness values: evolve sorts and selects on them
+            for agent in ga.population:
+                agent.fitness = random.random() * 100
+
+        with quiet():
+            elapsed = seconds_per_call(ga.evolve, setup=assign_fitness)
+        yield result('ga.evolve', {'population': population_size}, elapsed, 's', higher_is_better=False)
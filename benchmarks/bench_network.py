@@ -0,0 +1,37 @@
+"""
+NeuralNetwork and Agent decision throughput.
+"""
+
+import numpy as np
+
+from ga.snake_agent import Agent
+from ga.snake_nn import NeuralNetwork
+from ga.snake_simulator import SnakeGameSimulator
+
+from .harness import calls_per_second, result
+
+# Network sizes: (input, hidden, output); the first one is the agents' network
+NETWORK_SIZES = ((24, 16, 4), (24, 64, 4))
+
+
+def run(quick=False):
+    """
+    Run the network benchmarks.
+
+    Args:
+        quick (bool): Measure fewer configurations.
+
+    Yields:
+        dict: Benchmark results.
+    """
+    rng = np.random.RandomState(0)
+    for input_size, hidden_size, output_size in NETWORK_SIZES[:1] if quick else NETWORK_SIZES:
+        network = NeuralNetwork(input_size, hidden_size, output_size)
+        inputs = rng.uniform(0, 1, input_size)
+        params = {'input': input_size, 'hidden': hidden_size, 'output': output_size}
+        yield result('network.forward', params, calls_per_second(lambda: network.forward(inputs)), 'calls/s')
+
+    # Full decision as made during training: sensors to inputs, forward pass and argmax
+    agent = Agent()
+    state = SnakeGameSimulator(seed=0).get_state()
+    yield result('agent.decide_action', {}, calls_per_second(lambda: agent.decide_action(state)), 'calls/s')
@@ -0,0 +1,96 @@
+"""
+SnakeGameSimulator throughput across grid sizes and snake lengths.
+
+The snake follows a Hamiltonian cycle of the grid, so it never collides, and
+its tail is trimmed after eating, so its length stays fixed while measuring.
+Energy is not spent, so games never end.
+"""
+
+from ga.snake_simulator import SnakeGameSimulator
+
+from .harness import calls_per_second, result
+
+GRID_SIZES = (10, 25, 50)
+SNAKE_LENGTHS = (3, 20, 80)
+QUICK_GRID_SIZES = (10, 25)
+QUICK_SNAKE_LENGTHS = (3, 20)
+
+
+def hamiltonian_cycle(grid_size):
+    """
+    Build a cycle visiting every cell of the largest even square of the grid.
+
+    Row 0 is walked to the right, rows 1 to n-1 in a zigzag over columns 1 to
+    n-1, and column 0 upwards back to the start.
+
+    Args:
+        grid_size (int): Size of the grid.
+
+    Returns:
+        list: (x, y) cells of the cycle.
+    """
+    n = grid_size - grid_size % 2
+    cycle = [(x, 0) for x in range(n)]
+    for y in range(1, n):
+        columns = range(n - 1, 0, -1) if y % 2 else range(1, n)
+        cycle.extend((x, y) for x in columns)
+    cycle.extend((0, y) for y in range(n - 1, 0, -1))
+    return cycle
+
+
+def snake_stepper(grid_size, length, with_state=False):
+    """
+    Build a function advancing a simulator by one step along the cycle.
+
+    Args:
+        grid_size (int): Size of the grid.
+        length (int): Length of the snake.
+        with_state (bool): Also compute the state seen by the agents (get_state).
+
+    Returns:
+        tuple: (simulator, step function)
+    """
+    simulator = SnakeGameSimulator(grid_size, initial_energy=1, energy_per_step=0, seed=0)
+    cycle = hamiltonian_cycle(grid_size)
+    simulator.snake = [{'x': x, 'y': y} for x, y in reversed(cycle[:length])]
+    simulator.generate_food()
+    position = [length - 1]
+
+    def step():
+        if with_state:
+            simulator.get_state()
+        position[0] = (position[0] + 1) % len(cycle)
+        x, y = cycle[position[0]]
+        head = simulator.snake[0]
+        simulator.direction = {'x': x - head['x'], 'y': y - head['y']}
+        simulator.step()
+        if len(simulator.snake) > length:
+            simulator.snake.pop()
+
+    return simulator, step
+
+
+def run(quick=False):
+    """
+    Run the simulator benchmarks.
+
+    Args:
+        quick (bool): Measure fewer configurations.
+
+    Yields:
+        dict: Benchmark results.
+    """
+    for grid_size in QUICK_GRID_SIZES if quick else GRID_SIZES:
+        for length in QUICK_SNAKE_LENGTHS if quick else SNAKE_LENGTHS:
+            if length >= len(hamiltonian_cycle(grid_size)):
+                continue
+            params = {'grid': grid_size, 'length': length}
+
+            _, step = snake_stepper(grid_size, length)
+            yield result('simulator.step', params, calls_per_second(step), 'steps/s')
+
+            simulator, _ = snake_stepper(grid_size, length)
+            yield result('simulator.get_state', params, calls_per_second(simulator.get_state), 'calls/s')
+
+            _, step = snake_stepper(grid_size, length, with_state=True)
+            yield result('simulator.step_with_state', params, calls_per_second(step), 'steps/s')
@@ -0,0 +1,79 @@
+"""
+Cold-start and worker spawn times.
+
+Cold start is the wall time of a fresh interpreter importing a module: the
+headless core (``ga.core``), the training worker entry point and, for
+reference, the SnakeMach web server. Worker spawn is the time until a new
+training worker process (``--worker``) announces it is ready, and until a
+new evaluation pool process has run its first task.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+from ga.snake_ga_evaluation import EvaluationPool
+from ga.snake_ipc import TrainingProcess
+
+from .harness import result, seconds_per_call
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules imported by a fresh interpreter
+MODULES = ('ga.core', 'ga.snake_ga_training', 'ga.snake_mach')
+QUICK_MODULES = ('ga.core', 'ga.snake_ga_training')
+
+# Seconds to wait for a worker to get ready
+SPAWN_TIMEOUT = 60
+
+
+def _import_in_new_interpreter(module):
+    subprocess.run([sys.executable, '-c', f'import {module}'], cwd=REPO_DIR, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _spawn_training_worker():
+    ready = threading.Event()
+    worker = TrainingProcess(['--worker'], on_event=lambda event: event.get('type') == 'ready' and ready.set(),
+                             on_output=lambda line: None, cwd=REPO_DIR)
+    try:
+        if not ready.wait(SPAWN_TIMEOUT):
+            raise RuntimeError("Training worker did not get ready")
+    finally:
+        worker.close()
+        if worker.wait(SPAWN_TIMEOUT) is None:
+            worker.terminate()
+
+
+def _spawn_evaluation_pool():
+    pool = EvaluationPool(1)
+    try:
+        pool.pool.apply(os.getpid)
+    finally:
+        pool.close()
+
+
+def run(quick=False):
+    """
+    Run the startup benchmarks.
+
+    Args:
+        quick (bool): Measure fewer configurations.
+
+    Yields:
+        dict: Benchmark results.
+    """
+    repeat = 1 if quick else 3
+    for module in QUICK_MODULES if quick else MODULES:
+        try:
+            elapsed = seconds_per_call(lambda: _import_in_new_interpreter(module), repeat=repeat)
+        except subprocess.CalledProcessError:
+            # Optional dependency missing (e.g. Flask for the web server)
+            continue
+        yield result('startup.cold_start', {'module': module}, elapsed, 's', higher_is_better=False)
+
+    yield result('startup.training_worker', {}, seconds_per_call(_spawn_training_worker, repeat=repeat),
+                 's', higher_is_better=False)
+    yield result('startup.evaluation_pool', {}, seconds_per_call(_spawn_evaluation_pool, repeat=repeat),
+                 's', higher_is_better=False)
@@ -0,0 +1,45 @@
+"""
+End-to-end generation wall time of train_population.
+
+Every agent plays its games on the simulator, as in a training generation
+(without evolution and data recording, which have their own benchmarks).
+"""
+
+import random
+
+import numpy as np
+
+from ga.snake_ga import GeneticAlgorithm
+from ga.snake_ga_training import train_population
+from ga.snake_simulator import SnakeGameSimulator
+
+from .harness import quiet, result, seconds_per_call
+
+# (population, games per agent, max steps per game)
+CONFIGURATIONS = ((20, 1, 200), (50, 3, 500), (100, 3, 1000))
+QUICK_CONFIGURATIONS = ((20, 1, 200),)
+
+
+def run(quick=False):
+    """
+    Run the training benchmarks.
+
+    Args:
+        quick (bool): Measure fewer configurations.
+
+    Yields:
+        dict: Benchmark results.
+    """
+    for population_size, games, max_steps in QUICK_CONFIGURATIONS if quick else CONFIGURATIONS:
+        random.seed(0)
+        np.random.seed(0)
+        with quiet():
+            ga = GeneticAlgorithm(population_size=population_size)
+        simulator = SnakeGameSimulator()
+
+        with quiet():
+            elapsed = seconds_per_call(lambda: train_population(ga, simulator, max_steps, games),
+                                       repeat=1 if quick else 2)
+        params = {'population': population_size, 'games': games, 'steps': max_steps}
+        yield result('training.generation', params, elapsed, 's', higher_is_better=False)
+        yield result('training.agent_games', params, population_size * games / elapsed, 'games/s')
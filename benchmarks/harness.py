@@ -0,0 +1,228 @@
+"""
+Benchmark harness: timing, machine information, result files and comparison.
+
+Every benchmark produces result dicts:
+
+    {
+        'name': 'simulator.step',
+        'params': {'grid': 25, 'length': 3},
+        'value': 123456.7,
+        'unit': 'steps/s',
+        'higher_is_better': True
+    }
+
+A result file holds the machine information and the list of results of a run.
+"""
+
+import contextlib
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+RESULTS_FORMAT = 'snake-benchmarks'
+RESULTS_VERSION = 1
+
+# Seconds each measurement runs for (the best of `repeat` measurements is kept)
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_REPEAT = 3
+# Relative change beyond which a result is flagged as a regression
+DEFAULT_THRESHOLD = 0.10
+
+
+def result(name, params, value, unit, higher_is_better=True):
+    """Build a benchmark result."""
+    return {
+        'name': name,
+        'params': params,
+        'value': value,
+        'unit': unit,
+        'higher_is_better': higher_is_better
+    }
+
+
+def result_key(entry):
+    """Key identifying a result across runs: name and parameters."""
+    params = ','.join(f'{key}={value}' for key, value in sorted(entry['params'].items()))
+    return f"{entry['name']}[{params}]" if params else entry['name']
+
+
+def calls_per_second(func, min_time=DEFAULT_MIN_TIME, repeat=DEFAULT_REPEAT):
+    """
+    Measure how many times per second a function can be called.
+
+    The number of calls per measurement grows until a measurement lasts at
+    least ``min_time``; the fastest of ``repeat`` measurements is kept.
+
+    Args:
+        func (callable): Function called without arguments.
+        min_time (float): Minimum duration of a measurement, in seconds.
+        repeat (int): Number of measurements.
+
+    Returns:
+        float: Calls per second.
+    """
+    number = 1
+    while True:
+        elapsed = _time_calls(func, number)
+        if elapsed >= min_time:
+            break
+        number = number * 10 if elapsed < min_time / 10 else int(number * min_time / max(elapsed, 1e-9)) + 1
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, _time_calls(func, number))
+    return number / best
+
+
+def seconds_per_call(func, repeat=DEFAULT_REPEAT, setup=None):
+    """
+    Measure the duration of a slow operation (the fastest of ``repeat`` runs).
+
+    Args:
+        func (callable): Function called without arguments.
+        repeat (int): Number of runs.
+        setup (callable, optional): Called before every run, outside the timing.
+
+    Returns:
+        float: Seconds per call.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        best = min(best, _time_calls(func, 1))
+    return best
+
+
+def _time_calls(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the progress output of the code being measured."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def machine_info():
+    """
+    Describe the machine and software the benchmarks run on.
+
+    Returns:
+        dict: Host, platform, CPU, Python and NumPy information.
+    """
+    return {
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': sys.version.split()[0],
+        'python_implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'git_commit': _git_commit()
+    }
+
+
+def save_results(results, path, info=None):
+    """
+    Save the results of a run as JSON.
+
+    Args:
+        results (list): Benchmark results.
+        path (str): Destination file.
+        info (dict, optional): Machine information. Collected if not given.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = {
+        'format': RESULTS_FORMAT,
+        'version': RESULTS_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': info or machine_info(),
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load_results(path):
+    """
+    Load a result file saved by save_results.
+
+    Args:
+        path (str): Result file.
+
+    Returns:
+        dict: Result file contents.
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data.get('format') != RESULTS_FORMAT:
+        raise ValueError(f"{path} is not a benchmark result file")
+    return data
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results against a baseline.
+
+    Args:
+        current (list): Results of the current run.
+        baseline (list): Results of the baseline run.
+        threshold (float): Relative slowdown flagged as a regression.
+
+    Returns:
+        list: One dict per result present in both runs, with the baseline and
+        current values, the relative change (positive is faster) and a status:
+        'regression', 'improvement' or 'ok'.
+    """
+    baseline_by_key = {result_key(entry): entry for entry in baseline}
+    comparison = []
+    for entry in current:
+        key = result_key(entry)
+        base = baseline_by_key.get(key)
+        if base is None or not base['value'] or not entry['value']:
+            continue
+        # Relative change in speed, whatever the unit
+        if entry.get('higher_is_better', True):
+            change = entry['value'] / base['value'] - 1
+        else:
+            change = base['value'] / entry['value'] - 1
+        status = 'regression' if change < -threshold else 'improvement' if change > threshold else 'ok'
+        comparison.append({
+            'key': key,
+            'unit': entry['unit'],
+            'baseline': base['value'],
+            'current': entry['value'],
+            'change': change,
+            'status': status
+        })
+    return comparison
+
+
+def format_value(value):
+    """Format a measured value for display."""
+    if value >= 1000:
+        return f'{value:,.0f}'
+    if value >= 1:
+        return f'{value:.2f}'
+    return f'{value:.4g}'
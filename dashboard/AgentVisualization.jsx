@@ -1,4 +1,5 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
+import { connectSnakeMach, createGameFrameDecoder } from '../game/snake_frames';
 
 /**
  * Componente para visualização de detalhes do agente
@@ -16,6 +17,26 @@ const AgentVisualization = ({ agent }) => {
     survivalTime: '00:03:45'
   };
 
+  // Estado ao vivo da partida do agente, recebido do SnakeMach
+  const [liveState, setLiveState] = useState(null);
+
+  useEffect(() => {
+    if (typeof window.io !== 'function') return undefined;
+
+    // Assina apenas o canal do agente exibido, no servidor do SnakeMach
+    const socket = connectSnakeMach(window.io);
+    const decode = createGameFrameDecoder((channel) => socket.emit('request_keyframe', { channel }));
+    socket.on('connect', () => socket.emit('subscribe', { channel: agentData.id }));
+    socket.on('game_update', (frame) => {
+      const update = decode(frame);
+      if (update && update.agentId === agentData.id) {
+        setLiveState({ status: update.status, score: update.state.score, energy: update.state.energy,
+                       size: update.state.snake.length });
+      }
+    });
+    return () => socket.close();
+  }, [agentData.id]);
+
   return (
     <div className="agent-visualization">
       <h3>Detalhes do Agente</h3>
@@ -41,8 +62,13 @@ const AgentVisualization = ({ agent }) => {
         
         <div className="agent-simulation">
           <h4>Simulação em Tempo Real</h4>
+          {liveState && (
+            <div className="live-stats" data-testid="agent-live-stats">
+              {liveState.status} · Pontos: {liveState.score} · Energia: {liveState.energy} · Tamanho: {liveState.size}
+            </div>
+          )}
           <iframe
-            src="/game/snake_game.html?agent=true"
+            src={`/game/snake_game.html?agent=true&channel=${encodeURIComponent(agentData.id)}`}
             title="Simulação do Agente"
             className="agent-iframe"
             style={{ width: '100%', height: '400px', border: '1px solid #ccc', borderRadius: '4px' }}
@@ -149,19 +149,34 @@ const TrainingDashboard = () => {
   };
 
   useEffect(() => {
-    let pollingInterval;
-    if (trainingStarted && !trainingPaused) {
-      pollingInterval = setInterval(() => {
-        fetch('/api/train/status')
-          .then(response => response.json())
-          .then(data => {
-            const epoch = data.data && data.data.current && data.data.current.generation ? data.data.current.generation : 0;
-            setCurrentEpoch(epoch);
-            setTrainingData(data);
-          })
-          .catch(error => console.error('Error fetching training status:', error));
-      }, 1000); // poll every second
-    }
+    if (!trainingStarted || trainingPaused) return undefined;
+
+    const applyStatus = (data) => {
+      const epoch = data.data && data.data.current && data.data.current.generation ? data.data.current.generation : 0;
+      setCurrentEpoch(epoch);
+      setTrainingData(data);
+    };
+    const fetchStatus = () => fetch('/api/train/status')
+      .then(response => response.json())
+      .then(applyStatus)
+      .catch(error => console.error('Error fetching training status:', error));
+
+    // Estado inicial completo; depois, apenas os eventos de cada nova geração
+    fetchStatus();
+    const unsubscribe = window.subscribeGenerations
+      ? window.subscribeGenerations(null, (event) => {
+          setCurrentEpoch(event.record.generation);
+          setTrainingData(previous => ({
+            ...(previous || {}),
+            active: true,
+            data: window.mergeGenerationEvent(previous ? previous.data : null, event)
+          }));
+        })
+      : null;
+    if (unsubscribe) return unsubscribe;
+
+    // Sem Socket.IO: consulta periódica
+    const pollingInterval = setInterval(fetchStatus, 1000); // poll every second
     return () => clearInterval(pollingInterval);
   }, [trainingStarted, trainingPaused]);
 
@@ -351,7 +366,7 @@ const TrainingDashboard = () => {
             {trainingData && trainingData.data && trainingData.data.current && (
               <>
                 <div className="progress-item" style={{ marginBottom: '10px' }}>
-                  <strong>Melhor Fitness:</strong> {trainingData.data.current.best_fitness || 'N/A'}
+                  <strong>Melhor Fitness:</strong> {trainingData.data.current.best_fitness ?? 'N/A'}
                 </div>
                 <div className="progress-item" style={{ marginBottom: '10px' }}>
                   <strong>Fitness Médio:</strong> {trainingData.data.current.avg_fitness || 'N/A'}
@@ -14,6 +14,7 @@
  * @param {number} [params.crossover_rate=0.7] - Crossover rate
  * @param {number} [params.elitism=0.1] - Elitism rate
  * @param {number} [params.games_per_agent=3] - Number of games per agent
+ * @param {number} [params.workers=1] - Worker budget: processes evaluating the agents in parallel
  * @returns {Promise<Object>} Response from the server
  */
 async function startTraining(params = {}) {
@@ -58,6 +59,74 @@ async function stopTraining() {
     }
 }
 
+/**
+ * List the training jobs (queued, running and recently ended)
+ * @returns {Promise<Object>} Jobs and worker pool metrics
+ */
+async function fetchTrainingJobs() {
+    try {
+        const response = await fetch('/api/train/jobs');
+        
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        return await response.json();
+    } catch (error) {
+        console.error('Error fetching training jobs:', error);
+        return { jobs: [], metrics: null };
+    }
+}
+
+/**
+ * Cancel a training job: queued jobs are dropped, running jobs stop at the end of the current generation
+ * @param {string} jobId - ID of the job to cancel
+ * @returns {Promise<Object>} Response from the server
+ */
+async function cancelTrainingJob(jobId) {
+    try {
+        const response = await fetch(`/api/train/jobs/${jobId}`, {
+            method: 'DELETE'
+        });
+        
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        return await response.json();
+    } catch (error) {
+        console.error(`Error cancelling training job ${jobId}:`, error);
+        throw error;
+    }
+}
+
+/**
+ * Profile the next generations of a training job (cProfile and collapsed stacks saved in the session)
+ * @param {number} [generations=1] - Number of generations to profile
+ * @param {string} [jobId] - ID of the job. Defaults to the running job
+ * @returns {Promise<Object>} Response from the server
+ */
+async function profileTraining(generations = 1, jobId = undefined) {
+    try {
+        const response = await fetch('/api/train/profile', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ generations, job_id: jobId })
+        });
+        
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        return await response.json();
+    } catch (error) {
+        console.error('Error requesting a training profile:', error);
+        throw error;
+    }
+}
+
 /**
  * Check the status of the current training session
  * @returns {Promise<Object>} Training status and data
@@ -151,11 +220,27 @@ async function fetchBestAgent(sessionId) {
 /**
  * Fetch generation data for a specific training session
  * @param {string} sessionId - ID of the session
+ * @param {Object} [options] - Range of generations to fetch
+ * @param {number} [options.from] - First generation (inclusive)
+ * @param {number} [options.to] - Last generation (inclusive)
+ * @param {number} [options.since] - Only generations after this one
+ * @param {number} [options.limit] - Maximum number of records
+ * @param {string[]} [options.fields] - Fields to return
+ * @param {number} [options.points] - Downsample to this many points
  * @returns {Promise<Array>} Generation data
  */
-async function fetchGenerationData(sessionId) {
+async function fetchGenerationData(sessionId, options = {}) {
     try {
-        const response = await fetch(`/api/data/generations?session_id=${sessionId}`);
+        const params = new URLSearchParams({ session_id: sessionId });
+        for (const key of ['from', 'to', 'since', 'limit', 'points']) {
+            if (options[key] !== undefined && options[key] !== null) {
+                params.set(key, options[key]);
+            }
+        }
+        if (options.fields && options.fields.length) {
+            params.set('fields', options.fields.join(','));
+        }
+        const response = await fetch(`/api/data/generations?${params}`);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -166,6 +251,34 @@ async function fetchGenerationData(sessionId) {
     }
 }
 
+/**
+ * Fetch the per-phase time breakdown of a training session's generations
+ * @param {string} sessionId - ID of the session
+ * @param {Object} [options] - Range of generations to fetch
+ * @param {number} [options.from] - First generation (inclusive)
+ * @param {number} [options.to] - Last generation (inclusive)
+ * @param {number} [options.limit] - Maximum number of records
+ * @returns {Promise<Array>} Timing records ({generation, generation_time, phases})
+ */
+async function fetchPhaseTimings(sessionId, options = {}) {
+    try {
+        const params = new URLSearchParams({ session_id: sessionId });
+        for (const key of ['from', 'to', 'limit']) {
+            if (options[key] !== undefined && options[key] !== null) {
+                params.set(key, options[key]);
+            }
+        }
+        const response = await fetch(`/api/data/timings?${params}`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return await response.json();
+    } catch (error) {
+        console.error(`Error fetching phase timings for ${sessionId}:`, error);
+        return [];
+    }
+}
+
 /**
  * Check if a training session is active
  * @param {string} sessionId - ID of the session to check
@@ -261,6 +374,82 @@ function loadMockData() {
     };
 }
 
+/**
+ * Subscribe to generation_complete events pushed by the server
+ * @param {string|null} sessionId - Session to follow, or null for every live session
+ * @param {Function} onEvent - Called with { session_id, record, best_agent } for each new generation
+ * @param {number} [since] - Last generation already seen; missed generations are replayed first
+ * @returns {Function|null} Function that cancels the subscription, or null if Socket.IO is unavailable
+ */
+function subscribeGenerations(sessionId, onEvent, since) {
+    if (typeof window.io !== 'function') {
+        return null;
+    }
+    
+    const socket = window.io();
+    const lastSeen = {};
+    if (sessionId && since !== undefined && since !== null) {
+        lastSeen[sessionId] = since;
+    }
+    
+    socket.on('connect', () => {
+        // On reconnection, resume from the last generation received
+        const resumeFrom = sessionId ? lastSeen[sessionId] : undefined;
+        socket.emit('subscribe_generations', { session_id: sessionId, since: resumeFrom });
+    });
+    socket.on('generation_complete', (event) => {
+        const generation = event.record.generation;
+        if (generation <= (lastSeen[event.session_id] ?? -1)) {
+            return; // Already received (replay and live events may overlap)
+        }
+        lastSeen[event.session_id] = generation;
+        onEvent(event);
+    });
+    
+    return () => {
+        socket.emit('unsubscribe_generations', { session_id: sessionId });
+        socket.close();
+    };
+}
+
+/**
+ * Merge a generation_complete event into dashboard data (as returned by /api/data)
+ * @param {Object|null} data - Current dashboard data
+ * @param {Object} event - generation_complete event
+ * @returns {Object} New dashboard data
+ */
+function mergeGenerationEvent(data, event) {
+    const record = event.record;
+    const charts = (data && data.session_id === event.session_id && data.charts) || {
+        generations: [], best_fitness: [], avg_fitness: [], diversity: [], max_size: []
+    };
+    const append = (series, value) => series.concat([value]);
+    const seconds = Math.floor(record.training_time || 0);
+    
+    return {
+        ...(data || {}),
+        session_id: event.session_id,
+        current: {
+            generation: record.generation,
+            best_fitness: record.best_fitness,
+            avg_fitness: record.avg_fitness,
+            max_size: record.max_size,
+            diversity: record.diversity,
+            alive_agents: record.alive_agents,
+            training_time: `${Math.floor(seconds / 3600)}h ${Math.floor(seconds / 60) % 60}m ${seconds % 60}s`
+        },
+        charts: {
+            generations: append(charts.generations, record.generation),
+            best_fitness: append(charts.best_fitness, record.best_fitness),
+            avg_fitness: append(charts.avg_fitness, record.avg_fitness),
+            diversity: append(charts.diversity, record.diversity),
+            max_size: append(charts.max_size, record.max_size)
+        },
+        best_agent: event.best_agent ? { ...((data && data.best_agent) || {}), ...event.best_agent }
+                                     : (data && data.best_agent)
+    };
+}
+
 // Expose service functions to global scope
 window.startTraining = startTraining;
 window.stopTraining = stopTraining;
@@ -269,9 +458,12 @@ window.fetchTrainingSessions = fetchTrainingSessions;
 window.fetchSessionData = fetchSessionData;
 window.fetchBestAgent = fetchBestAgent;
 window.fetchGenerationData = fetchGenerationData;
+window.fetchPhaseTimings = fetchPhaseTimings;
 window.isSessionActive = isSessionActive;
 window.connectWebSocket = connectWebSocket;
 window.loadMockData = loadMockData;
+window.subscribeGenerations = subscribeGenerations;
+window.mergeGenerationEvent = mergeGenerationEvent;
 
 // Poll for updates if training is active
 let pollingInterval = null;
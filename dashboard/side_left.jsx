@@ -149,7 +149,7 @@ const SideLeft = ({ data }) => {
                     <tbody>
                         <tr>
                             <td>Best Fitness:</td>
-                            <td>{current.best_fitness.toFixed(2)}</td>
+                            <td>{current.best_fitness != null ? current.best_fitness.toFixed(2) : 'N/A'}</td>
                         </tr>
                         <tr>
                             <td>Average Fitness:</td>
@@ -0,0 +1,35 @@
+"""
+Headless core of the Snake GA: agent, neural network, simulator, replays and
+the genetic algorithm.
+
+Importing this package never imports Flask, Socket.IO or webbrowser, so
+training workers and scripts start without the web stack. Streaming live
+games is optional: pass a sink to ``Agent.play_game`` or install one with
+``set_stream_sink`` (importing ``ga.snake_mach`` installs the SnakeMach
+server as the sink).
+"""
+
+from ..snake_agent import Agent
+from ..snake_ga import HIDDEN_SIZE, INPUT_SIZE, OUTPUT_SIZE, GeneticAlgorithm
+from ..snake_nn import NeuralNetwork
+from ..snake_replay import DIRECTION_NAMES, GameRecorder, GameReplay, GameReplayer
+from ..snake_simulator import DEFAULT_GRID_SIZE, DEFAULT_INITIAL_ENERGY, SnakeGameSimulator
+from ..snake_stream import get_stream_sink, set_stream_sink
+
+__all__ = [
+    'Agent',
+    'NeuralNetwork',
+    'SnakeGameSimulator',
+    'GeneticAlgorithm',
+    'GameRecorder',
+    'GameReplay',
+    'GameReplayer',
+    'DIRECTION_NAMES',
+    'DEFAULT_GRID_SIZE',
+    'DEFAULT_INITIAL_ENERGY',
+    'INPUT_SIZE',
+    'HIDDEN_SIZE',
+    'OUTPUT_SIZE',
+    'set_stream_sink',
+    'get_stream_sink'
+]
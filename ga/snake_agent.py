@@ -1,9 +1,8 @@
 import numpy as np
-import webbrowser
 import time
 from .snake_nn import NeuralNetwork
-from .snake_mach import snake_mach
-from .snake_ga_data import save_game_data
+from .snake_replay import GameRecorder
+from .snake_stream import get_stream_sink
 
 class Agent:
     """
@@ -22,6 +21,8 @@ class Agent:
         food_eaten (int): Quantidade de comida consumida
         moves_made (int): Número total de movimentos realizados
         survival_time (int): Tempo de sobrevivência (em passos)
+        steps_taken (int): Passos realizados na última avaliação
+        replay (GameReplay): Replay compacto da melhor partida avaliada
         input_size (int): Tamanho da camada de entrada da rede neural
         hidden_size (int): Tamanho da camada oculta da rede neural
         output_size (int): Tamanho da camada de saída da rede neural
@@ -49,6 +50,8 @@ class Agent:
         self.food_eaten = 0
         self.moves_made = 0
         self.survival_time = 0
+        self.steps_taken = 0
+        self.replay = None
 
         self.input_size = input_size
         self.hidden_size = hidden_size
@@ -121,6 +124,7 @@ class Agent:
         self.food_eaten = food_eaten
         self.moves_made = steps_taken
         self.survival_time = steps_taken
+        self.steps_taken = steps_taken
 
         food_fitness = food_eaten * 100
         efficiency_bonus = (energy_left / steps_taken) * 50 if steps_taken > 0 else 0
@@ -138,45 +142,58 @@ class Agent:
         self.food_eaten = 0
         self.moves_made = 0
         self.survival_time = 0
+        self.steps_taken = 0
         
     # Implementação dos 5 passos dos agentes conforme AGENT_STEPS.md
     
-    def start_game(self):
+    def start_game(self, open_browser=True):
         """
         Inicia uma partida para este agente (Passo 1).
         
         Abre o jogo Snake em um navegador com o ID do agente como parâmetro,
         permitindo que o jogo identifique qual agente está jogando.
         
+        Args:
+            open_browser (bool): Abre o jogo no navegador. Sem navegador, apenas
+                registra o início da partida.
+        
         Returns:
             bool: True se a partida foi iniciada com sucesso
         """
         game_url = f"game/snake_game.html?agent_id={self.id}"
         
         try:
-            webbrowser.open(game_url)
+            if open_browser:
+                # Importado apenas aqui: o núcleo do agente não depende do navegador
+                import webbrowser
+                webbrowser.open(game_url)
             print(f"Partida iniciada para o agente {self.id}")
             return True
         except Exception as e:
             print(f"Erro ao iniciar partida: {e}")
             return False
     
-    def transmit_state(self, game_state, status="EM ANDAMENTO"):
+    def transmit_state(self, game_state, status="EM ANDAMENTO", sink=None):
         """
         Transmite o estado atual do jogo para processamento em tempo real (Passo 2).
         
-        Utiliza o módulo snake_mach para transmitir informações sobre o estado
-        atual do jogo, permitindo visualização e análise em tempo real.
+        O estado é entregue a um sink de transmissão (ver snake_stream), por
+        exemplo o SnakeMach, permitindo visualização e análise em tempo real.
+        Sem sink, a partida não é transmitida.
         
         Args:
             game_state (dict): Estado atual do jogo
             status (str): Status da partida ("EM ANDAMENTO", "VITORIA", "DERROTA")
+            sink (optional): Sink da transmissão. Padrão é o sink instalado.
             
         Returns:
             bool: True se a transmissão foi bem-sucedida
         """
+        sink = sink or get_stream_sink()
+        if sink is None:
+            return False
         try:
-            snake_mach.update_state(
+            sink.update_state(
                 agent_id=self.id,
                 game_state=game_state,
                 status=status
@@ -206,7 +223,7 @@ class Agent:
             "score": game_data.get("score", 0),
             "steps": game_data.get("steps", 0),
             "energy_left": game_data.get("energy", 0),
-            "movement_patterns": self._analyze_movement(game_data.get("snake_positions", [])),
+            "movement_patterns": self._analyze_game_movement(game_data),
             "collisions": game_data.get("collisions", 0)
         }
         
@@ -219,6 +236,26 @@ class Agent:
         
         return metrics
     
+    def _analyze_game_movement(self, game_data):
+        """
+        Analisa padrões de movimento de uma partida.
+        
+        Usa o replay compacto da partida quando disponível e, caso contrário,
+        a lista de posições registradas em "snake_positions".
+        
+        Args:
+            game_data (dict): Dados coletados durante a partida
+            
+        Returns:
+            dict: Dicionário com contagem de movimentos em cada direção.
+        """
+        replay = game_data.get("replay")
+        if replay is not None:
+            if replay.steps < 1:
+                return {"pattern": "insufficient_data"}
+            return replay.movement_counts()
+        return self._analyze_movement(game_data.get("snake_positions", []))
+    
     def _analyze_movement(self, positions):
         """
         Analisa padrões de movimento com base nas posições registradas.
@@ -264,6 +301,8 @@ class Agent:
         Returns:
             bool: True se os dados foram armazenados com sucesso
         """
+        # Importado apenas aqui: a persistência não faz parte do núcleo do agente
+        from .snake_ga_data import save_game_data
         try:
             save_game_data(self.id, metrics)
             print(f"Dados da partida do agente {self.id} salvos com sucesso")
@@ -272,7 +311,7 @@ class Agent:
             print(f"Erro ao salvar dados: {e}")
             return False
     
-    def end_game(self, result):
+    def end_game(self, result, sink=None):
         """
         Finaliza a partida e registra o resultado final (Passo 5).
         
@@ -281,6 +320,7 @@ class Agent:
         
         Args:
             result (dict): Resultado final da partida
+            sink (optional): Sink da transmissão. Padrão é o sink instalado.
             
         Returns:
             dict: Resumo da partida finalizada incluindo ID, geração,
@@ -298,12 +338,14 @@ class Agent:
         }
         
         # Libera recursos
-        snake_mach.reset()
+        sink = sink or get_stream_sink()
+        if sink is not None:
+            sink.reset(self.id)
         print(f"Partida finalizada para o agente {self.id}")
         
         return summary
     
-    def play_game(self, simulator, max_steps=1000):
+    def play_game(self, simulator, max_steps=1000, sink=None, open_browser=False):
         """
         Executa o fluxo completo de uma partida para este agente.
         
@@ -317,25 +359,29 @@ class Agent:
         Args:
             simulator: Simulador do jogo que implementa a lógica do Snake
             max_steps (int): Número máximo de passos. Padrão é 1000.
+            sink (optional): Sink que recebe os estados da partida. Padrão é o
+                sink instalado (ver snake_stream); sem sink, a partida não é transmitida.
+            open_browser (bool): Abre o jogo no navegador ao iniciar. Padrão é False.
             
         Returns:
             dict: Resumo da partida incluindo resultado, pontuação e fitness.
         """
         # Inicia a partida (Passo 1)
-        self.start_game()
+        self.start_game(open_browser)
         
         # Prepara para registrar dados da partida
         game_data = {
             "score": 0,
             "steps": 0,
             "energy": 100,
-            "snake_positions": [],
+            "replay": None,
             "collisions": 0,
             "status": "EM ANDAMENTO"
         }
         
-        # Reseta o simulador e o agente
-        simulator.reset()
+        # Reseta o simulador (com semente registrada para o replay) e o agente
+        recorder = GameRecorder(simulator)
+        recorder.start()
         self.reset()
         
         # Loop principal da partida
@@ -344,24 +390,27 @@ class Agent:
             state = simulator.get_state()
             
             # Transmite estado atual (Passo 2)
-            self.transmit_state(state)
+            self.transmit_state(state, sink=sink)
             
             # Agente toma decisão
             action = self.decide_action(state)
             
-            # Aplica ação no simulador
+            # Registra a direção e aplica a ação no simulador
+            recorder.record()
             game_over = simulator.step()
             
             # Atualiza dados da partida
             game_data["score"] = state.get("score", 0)
             game_data["steps"] = step + 1
             game_data["energy"] = state.get("energy", 0)
-            game_data["snake_positions"].append(state.get("snake", [])[0])
             
             # Verifica fim de jogo
             if game_over:
                 game_data["status"] = "DERROTA"
                 break
+        
+        # Replay compacto da partida (semente + direções)
+        game_data["replay"] = recorder.finish({"agent_id": self.id, "score": game_data["score"]})
                 
         # Processa dados da partida (Passo 3)
         metrics = self.process_data(game_data)
@@ -374,4 +423,4 @@ class Agent:
             "status": game_data["status"],
             "score": game_data["score"],
             "steps": game_data["steps"]
-        })
+        }, sink)
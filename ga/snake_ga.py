@@ -2,13 +2,12 @@ import os
 import time
 import json
 import numpy as np
-import webbrowser
 import random
 from .snake_agent import Agent
 from .snake_nn import NeuralNetwork
-from .snake_mach import snake_mach
-from .snake_ga_data import save_game_data
-from .snake_ga_training import SnakeGameSimulator
+from .snake_simulator import SnakeGameSimulator
+from .snake_replay import GameRecorder
+from .snake_stream import get_stream_sink
 
 # Hiperparâmetros da rede
 INPUT_SIZE = 24
@@ -34,8 +33,24 @@ class GeneticAlgorithm:
             for _ in range(self.population_size)
         ]
 
-    def evolve(self):
-        """Evolui a população atual para a próxima geração."""
+    def calculate_diversity(self):
+        """Calcula a diversidade genética: desvio padrão médio de cada gene na população."""
+        if not self.population:
+            return 0.0
+        genomes = np.array([agent.genome for agent in self.population])
+        return float(np.mean(np.std(genomes, axis=0)))
+
+    def evolve(self, timers=None, diversity=None):
+        """
+        Evolui a população atual para a próxima geração.
+
+        Args:
+            timers (PhaseTimers, opcional): Recebe o tempo gasto em cada etapa
+                (evolve.diversity, evolve.selection, evolve.crossover,
+                evolve.mutation e evolve.agents).
+            diversity (float, opcional): Diversidade da população atual, se já
+                calculada (não é calculada de novo).
+        """
         self.population.sort(key=lambda agent: agent.fitness, reverse=True)
 
         # Atualiza o melhor agente global
@@ -43,7 +58,11 @@ class GeneticAlgorithm:
             self.best_fitness = self.population[0].fitness
             self.best_agent = self.population[0]
 
-        diversity = self.calculate_diversity()
+        start = time.perf_counter()
+        if diversity is None:
+            diversity = self.calculate_diversity()
+        diversity_time = time.perf_counter() - start
+        selection_time = crossover_time = mutation_time = agents_time = 0.0
         new_population = []
 
         # Elitismo: mantém os melhores agentes
@@ -54,23 +73,40 @@ class GeneticAlgorithm:
 
         # Geração de novos agentes
         while len(new_population) < self.population_size:
+            start = time.perf_counter()
             parent1 = self.select_parent()
             parent2 = self.select_parent()
 
+            selected = time.perf_counter()
             if random.random() < self.crossover_rate:
                 child_genome = self.crossover(parent1.genome, parent2.genome)
             else:
                 child_genome = parent1.genome.copy()
 
+            crossed = time.perf_counter()
             child_genome = self.mutate(child_genome)
 
+            mutated = time.perf_counter()
             new_population.append(
                 Agent(genome=child_genome, input_size=INPUT_SIZE, hidden_size=HIDDEN_SIZE, output_size=OUTPUT_SIZE)
             )
 
+            selection_time += selected - start
+            crossover_time += crossed - selected
+            mutation_time += mutated - crossed
+            agents_time += time.perf_counter() - mutated
+
         self.population = new_population
         self.generation += 1
 
+        if timers is not None:
+            children = self.population_size - elitism_count
+            timers.add('evolve.diversity', diversity_time)
+            timers.add('evolve.selection', selection_time, children)
+            timers.add('evolve.crossover', crossover_time, children)
+            timers.add('evolve.mutation', mutation_time, children)
+            timers.add('evolve.agents', agents_time, children)
+
         return {
             'population': self.population,
             'generation': self.generation,
@@ -94,6 +130,7 @@ class GeneticAlgorithm:
         for i in range(len(genome)):
             if random.random() < self.mutation_rate:
                 genome[i] += random.gauss(0, 0.2)
+        return genome
                
 
 class SnakeGA:
@@ -161,6 +198,8 @@ class SnakeGA:
         # Abre o jogo no navegador (em ambiente de desenvolvimento)
         # Em produção, poderia ser substituído por outra forma de iniciar o jogo
         try:
+            # Importado apenas aqui: o algoritmo genético não depende do navegador
+            import webbrowser
             webbrowser.open(game_url)
             print(f"Partida iniciada para o agente {agent_id}")
             return True
@@ -172,6 +211,9 @@ class SnakeGA:
         """
         Transmite o estado atual do jogo para processamento em tempo real.
         
+        O estado é entregue ao sink de transmissão instalado (ver snake_stream);
+        sem sink, a partida não é transmitida.
+        
         Args:
             agent_id (str): ID do agente jogando
             game_state (dict): Estado atual do jogo
@@ -181,9 +223,12 @@ class SnakeGA:
             bool: True se a transmissão foi bem-sucedida
         """
         # Passo 2: Processo de transmissão da partida
+        sink = get_stream_sink()
+        if sink is None:
+            return False
         try:
-            # Utiliza o snake_mach para transmitir dados em tempo real
-            snake_mach.update_state(
+            # Utiliza o sink (por exemplo, o snake_mach) para transmitir dados em tempo real
+            sink.update_state(
                 agent_id=agent_id,
                 game_state=game_state,
                 status=status
@@ -211,7 +256,7 @@ class SnakeGA:
             "score": game_data.get("score", 0),
             "steps": game_data.get("steps", 0),
             "energy_left": game_data.get("energy", 0),
-            "movement_patterns": self._analyze_movement(game_data.get("snake_positions", [])),
+            "movement_patterns": self._analyze_game_movement(game_data),
             "collisions": game_data.get("collisions", 0)
         }
         
@@ -226,6 +271,15 @@ class SnakeGA:
         
         return metrics
     
+    def _analyze_game_movement(self, game_data):
+        """Analisa padrões de movimento a partir do replay (ou das posições) da partida."""
+        replay = game_data.get("replay")
+        if replay is not None:
+            if replay.steps < 1:
+                return {"pattern": "insufficient_data"}
+            return replay.movement_counts()
+        return self._analyze_movement(game_data.get("snake_positions", []))
+    
     def _analyze_movement(self, positions):
         """Analisa padrões de movimento com base nas posições."""
         # Implementação simplificada para análise de movimento
@@ -266,6 +320,7 @@ class SnakeGA:
             bool: True se os dados foram armazenados com sucesso
         """
         # Passo 4: Armazenamento de dados
+        from .snake_ga_data import save_game_data
         try:
             # Utiliza a função save_game_data do módulo snake_ga_data
             save_game_data(agent_id, metrics)
@@ -301,7 +356,9 @@ class SnakeGA:
         }
         
         # Libera recursos (para a próxima execução)
-        snake_mach.reset()
+        sink = get_stream_sink()
+        if sink is not None:
+            sink.reset(agent_id)
         print(f"Partida finalizada para o agente {agent_id}")
         
         return summary
@@ -325,14 +382,15 @@ class SnakeGA:
             "score": 0,
             "steps": 0,
             "energy": 100,
-            "snake_positions": [],
+            "replay": None,
             "collisions": 0,
             "status": "EM ANDAMENTO"
         }
         
         # Loop principal da partida 
         simulator = SnakeGameSimulator(grid_size=25, initial_energy=100)
-        simulator.reset()
+        recorder = GameRecorder(simulator)
+        recorder.start()
         agent = self._find_agent_by_id(agent_id)
         
         for step in range(max_steps):
@@ -345,19 +403,22 @@ class SnakeGA:
             # Agente toma decisão
             action = agent.decide_action(state)
             
-            # Aplica ação no simulador
+            # Registra a direção e aplica a ação no simulador
+            recorder.record()
             game_over = simulator.step()
             
             # Atualiza dados da partida
             game_data["score"] = state.get("score", 0)
             game_data["steps"] = step + 1
             game_data["energy"] = state.get("energy", 0)
-            game_data["snake_positions"].append(state.get("snake", [])[0])
             
             # Verifica fim de jogo
             if game_over:
                 game_data["status"] = "DERROTA"
                 break
+        
+        # Replay compacto da partida (semente + direções)
+        game_data["replay"] = recorder.finish({"agent_id": agent_id, "score": game_data["score"]})
                 
         # Processa dados da partida
         metrics = self.process_game_data(agent_id, game_data)
@@ -0,0 +1,123 @@
+"""
+Snake Game Genetic Algorithm Chart Downsampling
+
+This module reduces long per-generation series to a fixed number of points
+for the dashboard charts, so payload size and render time depend on the
+screen resolution instead of the length of the run. It implements
+Largest-Triangle-Three-Buckets (LTTB), which keeps the visual shape of a
+series (peaks, drops and plateaus) much better than taking every n-th point.
+"""
+
+import numpy as np
+
+# Chart series exported to the dashboard and the generation record field they come from
+CHART_SERIES = {
+    'generations': 'generation',
+    'best_fitness': 'best_fitness',
+    'avg_fitness': 'avg_fitness',
+    'diversity': 'diversity',
+    'max_size': 'max_size'
+}
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Select the points of a series to keep with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are
+    split into ``threshold - 2`` buckets and, in each bucket, the point
+    forming the largest triangle with the previously selected point and the
+    average of the next bucket is kept.
+
+    Args:
+        x (array-like): X values, in increasing order.
+        y (array-like): Y values.
+        threshold (int): Number of points to keep.
+
+    Returns:
+        numpy.ndarray: Sorted indices of the points to keep.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n) if threshold >= n else np.array([0, n - 1][:max(threshold, 0)], dtype=np.int64)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    # Bucket boundaries over the points between the first and the last one
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average point of the next bucket (the last point for the final bucket)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        if next_end <= next_start:
+            next_end = next_start + 1
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Triangle areas between the selected point, each candidate and the average
+        ax, ay = x[selected], y[selected]
+        areas = np.abs((ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay))
+        selected = start + int(np.argmax(areas)) if end > start else start
+        indices[i + 1] = selected
+
+    return indices
+
+
+def downsample_records(records, points, y_key='best_fitness'):
+    """
+    Downsample generation records for charting.
+
+    The indices are chosen by LTTB on ``y_key`` and applied to whole records,
+    so every chart series keeps sharing the same generations.
+
+    Args:
+        records (list): Generation records, in generation order.
+        points (int): Maximum number of records to return.
+        y_key (str): Field driving the point selection.
+
+    Returns:
+        list: Selected records.
+    """
+    if not points or len(records) <= points:
+        return list(records)
+    x = [record['generation'] for record in records]
+    y = [record.get(y_key) or 0 for record in records]
+    return [records[i] for i in lttb_indices(x, y, points)]
+
+
+def charts_from_records(records):
+    """
+    Build the dashboard chart series from generation records.
+
+    Args:
+        records (list): Generation records.
+
+    Returns:
+        dict: Chart series keyed by dashboard series name.
+    """
+    return {name: [record[field] for record in records] for name, field in CHART_SERIES.items()}
+
+
+def downsample_charts(charts, points, y_key='best_fitness'):
+    """
+    Downsample dashboard chart series that share the ``generations`` axis.
+
+    Args:
+        charts (dict): Chart series keyed by dashboard series name.
+        points (int): Maximum number of points per series.
+        y_key (str): Series driving the point selection.
+
+    Returns:
+        dict: Downsampled chart series.
+    """
+    generations = charts.get('generations', [])
+    if not points or len(generations) <= points:
+        return charts
+    indices = lttb_indices(generations, charts[y_key], points)
+    return {name: [values[i] for i in indices] for name, values in charts.items()}
@@ -6,51 +6,1261 @@ training process. It tracks metrics like fitness, diversity, and snake size over
 generations and provides functions to save this data for visualization in the dashboard.
 """
 
+import io
 import json
 import threading
+import itertools
 import os
 import csv
+import shutil
+import sqlite3
+import struct
 import time
+import zipfile
+from collections import OrderedDict, deque
 from datetime import datetime
 
+import numpy as np
+
+from .snake_replay import GameReplay
+from .snake_ga_charts import charts_from_records, downsample_charts, downsample_records
+
 # Global variable to store the latest training data
 _latest_training_data = None
 # Lock for thread-safe access to the latest training data
 _data_lock = threading.Lock()
+# Functions called with every generation recorded by any TrainingData of this process
+_generation_listeners = []
+
+# Number of appended records between two fsync calls on the generation logs
+DEFAULT_FSYNC_INTERVAL = 10
+# Number of recent generations kept in memory by TrainingData
+DEFAULT_HISTORY_LIMIT = 1000
+# Maximum number of points per chart series kept for the dashboard
+DEFAULT_CHART_POINTS = 1000
+# Maximum number of pending operations in the background persistence writer
+DEFAULT_WRITE_QUEUE_SIZE = 256
+# Layout of the generation log index: (generation, byte offset in the .jsonl file)
+GENERATION_INDEX_FORMAT = '<qq'
+GENERATION_INDEX_DTYPE = np.dtype([('generation', '<i8'), ('offset', '<i8')])
+# Rows preallocated by a weight archive when the number of generations is unknown
+DEFAULT_WEIGHT_ARCHIVE_CAPACITY = 256
+# Maximum number of downsampled chart series kept in the chart cache
+CHART_CACHE_SIZE = 64
+# Maximum number of serialised dashboard snapshots kept in memory
+SNAPSHOT_CACHE_SIZE = 16
+# Bytes of decompressed arrays of archived sessions kept in memory
+ARCHIVED_ARRAY_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def _atomic_write_json(path, data, indent=2):
+    """
+    Write a JSON file atomically.
+
+    The data is written to a temporary file in the same directory and then
+    renamed over the target, so readers never see a partially written file.
+
+    Args:
+        path (str): Destination file.
+        data: JSON-serialisable data.
+        indent (int, optional): Indentation passed to json.dump.
+    """
+    _atomic_write_text(path, json.dumps(data, indent=indent))
+
+
+def _atomic_write_text(path, text):
+    """
+    Write a text file atomically via a temporary file and a rename.
+
+    Args:
+        path (str): Destination file.
+        text (str): File contents.
+    """
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class PersistenceWriter:
+    """
+    Background thread that performs disk writes off the training thread.
+
+    Operations are queued in a bounded queue and executed in order. Snapshot
+    writes are coalesced per path: if a file is queued again before it was
+    written, only the newest contents are written. Files are written
+    atomically via a temporary file and a rename.
+    """
+
+    def __init__(self, max_queue=DEFAULT_WRITE_QUEUE_SIZE, name='persistence-writer', timers=None):
+        """
+        Start the writer thread.
+
+        Args:
+            max_queue (int): Maximum number of pending operations. Callers
+                queueing new operations block while the queue is full.
+            name (str): Name of the writer thread.
+            timers (PhaseTimers, optional): Receives the latency of every
+                operation as the ``disk`` phase.
+        """
+        self.max_queue = max_queue
+        self.timers = timers
+        self._pending = OrderedDict()
+        self._sequence = 0
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Metrics
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def write_json(self, path, data, indent=2):
+        """
+        Queue an atomic JSON file write, replacing any pending write of the same file.
+
+        Args:
+            path (str): Destination file.
+            data: JSON-serialisable data.
+            indent (int, optional): Indentation passed to json.dump.
+        """
+        self._enqueue(('file', path), _atomic_write_json, (path, data, indent))
+
+    def write_text(self, path, text):
+        """
+        Queue an atomic text file write, replacing any pending write of the same file.
+
+        Args:
+            path (str): Destination file.
+            text (str): File contents.
+        """
+        self._enqueue(('file', path), _atomic_write_text, (path, text))
+
+    def call(self, func, *args):
+        """
+        Queue an arbitrary write operation. Calls are never coalesced.
+
+        Args:
+            func (callable): Function to run on the writer thread.
+            *args: Arguments passed to the function.
+        """
+        with self._cond:
+            self._sequence += 1
+            key = ('call', self._sequence)
+        self._enqueue(key, func, args)
+
+    def _enqueue(self, key, func, args):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Persistence writer is closed")
+            if key in self._pending:
+                self._pending[key] = (func, args)
+                self.coalesced += 1
+                return
+            while len(self._pending) >= self.max_queue:
+                self._cond.wait()
+            self._pending[key] = (func, args)
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                _, (func, args) = self._pending.popitem(last=False)
+                self._busy = True
+                self._cond.notify_all()
+
+            start = time.perf_counter()
+            try:
+                func(*args)
+            except Exception as e:
+                self.errors += 1
+                print(f"Error in persistence writer: {e}")
+            latency = time.perf_counter() - start
+
+            with self._cond:
+                self._busy = False
+                self.writes += 1
+                self.total_latency += latency
+                self.last_latency = latency
+                self.max_latency = max(self.max_latency, latency)
+                self._cond.notify_all()
+            if self.timers is not None:
+                self.timers.add('disk', latency)
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued operation has been executed.
+
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds.
+
+        Returns:
+            bool: True if the queue was drained, False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self):
+        """Drain the queue and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def metrics(self):
+        """
+        Get the writer's queue and latency metrics.
+
+        Returns:
+            dict: Queue depth, write counts and write latencies in seconds.
+        """
+        with self._cond:
+            return {
+                'queue_depth': len(self._pending),
+                'writes': self.writes,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'write_latency_avg': self.total_latency / self.writes if self.writes else 0.0,
+                'write_latency_max': self.max_latency,
+                'write_latency_last': self.last_latency
+            }
+
+
+def _scan_generation_log(jsonl_path):
+    """Build (generation, offset) index entries by scanning a JSON Lines log."""
+    entries = []
+    offset = 0
+    with open(jsonl_path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                generation = json.loads(line).get('generation', -1)
+            except json.JSONDecodeError:
+                break
+            entries.append((generation, offset))
+            offset += len(line)
+    return np.array(entries, dtype=GENERATION_INDEX_DTYPE).reshape(-1)
+
+
+def _write_generation_index(index_path, entries):
+    """Atomically write index entries to a ``.idx`` file."""
+    tmp_path = f'{index_path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(entries.astype(GENERATION_INDEX_DTYPE).tobytes())
+    os.replace(tmp_path, index_path)
+
+
+class GenerationLog:
+    """
+    Append-only log of per-generation records.
+
+    Every record is written exactly once, as one JSON Lines entry and
+    (optionally) one CSV row, so saving a generation costs the same at
+    generation 10 as at generation 10000. Data is flushed to the OS after
+    every append and fsynced every ``fsync_interval`` records.
+
+    Alongside the JSON Lines file, ``<name>.idx`` holds one fixed-size
+    (generation, byte offset) entry per record, so ranges of generations can
+    be read without scanning the whole log (see read_generation_range).
+    """
+
+    def __init__(self, session_dir, name='generation_data', write_csv=True,
+                 fsync_interval=DEFAULT_FSYNC_INTERVAL):
+        """
+        Open (or create) the log files for appending.
+
+        Args:
+            session_dir (str): Session directory holding the log files.
+            name (str): Base name of the log files.
+            write_csv (bool): Also write a CSV copy of each record.
+            fsync_interval (int): Records between fsync calls. 0 disables
+                periodic fsync (the log is still synced on close).
+        """
+        self.jsonl_path = os.path.join(session_dir, f'{name}.jsonl')
+        self.index_path = os.path.join(session_dir, f'{name}.idx')
+        self.csv_path = os.path.join(session_dir, f'{name}.csv') if write_csv else None
+        self.fsync_interval = fsync_interval
+        self._unsynced = 0
+        self._lock = threading.Lock()
+
+        self._jsonl_file = open(self.jsonl_path, 'ab')
+        if self._jsonl_file.tell() and not os.path.exists(self.index_path):
+            _write_generation_index(self.index_path, _scan_generation_log(self.jsonl_path))
+        self._index_file = open(self.index_path, 'ab')
+        self._csv_file = None
+        self._csv_writer = None
+        if self.csv_path:
+            self._csv_file = open(self.csv_path, 'a', newline='')
+
+    def append(self, record):
+        """
+        Append one record to the log.
+
+        Args:
+            record (dict): Generation record.
+        """
+        with self._lock:
+            offset = self._jsonl_file.tell()
+            self._jsonl_file.write((json.dumps(record) + '\n').encode('utf-8'))
+            self._jsonl_file.flush()
+            self._index_file.write(struct.pack(GENERATION_INDEX_FORMAT, record.get('generation', -1), offset))
+            self._index_file.flush()
+
+            if self._csv_file is not None:
+                if self._csv_writer is None:
+                    self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=list(record.keys()),
+                                                      extrasaction='ignore')
+                    if self._csv_file.tell() == 0:
+                        self._csv_writer.writeheader()
+                self._csv_writer.writerow(record)
+                self._csv_file.flush()
+
+            self._unsynced += 1
+            if self.fsync_interval and self._unsynced >= self.fsync_interval:
+                self._sync()
+
+    def flush(self):
+        """Force all appended records to stable storage."""
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        """Sync and close the log files."""
+        with self._lock:
+            if self._jsonl_file.closed:
+                return
+            self._sync()
+            self._jsonl_file.close()
+            self._index_file.close()
+            if self._csv_file is not None:
+                self._csv_file.close()
+
+    def _sync(self):
+        if self._jsonl_file.closed or not self._unsynced:
+            return
+        for f in (self._jsonl_file, self._index_file, self._csv_file):
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+        self._unsynced = 0
+
+
+class SessionStore:
+    """
+    Read access to the files of a session, wherever they are stored.
+    
+    A session lives either in its ``session_<id>/`` directory or, once
+    archived, in a single ``session_<id>.zip`` container. Members are read on
+    demand: text members are streamed from the archive, uncompressed
+    ``.npy`` members are memory-mapped straight out of the zip file and
+    compressed ones are decompressed once and cached.
+    """
+    
+    def __init__(self, session_dir):
+        """
+        Open a session's files.
+        
+        Args:
+            session_dir (str): Session directory (``<data_dir>/session_<id>``).
+        """
+        self.session_dir = session_dir
+        self.archive_path = session_dir.rstrip(os.sep) + '.zip'
+        self._zip = None
+        if not os.path.isdir(session_dir) and os.path.exists(self.archive_path):
+            self._zip = zipfile.ZipFile(self.archive_path)
+            self._members = set(self._zip.namelist())
+    
+    @property
+    def archived(self):
+        """True if the session is read from its compressed archive."""
+        return self._zip is not None
+    
+    def found(self):
+        """Return True if the session exists, as a directory or as an archive."""
+        return self.archived or os.path.isdir(self.session_dir)
+    
+    def exists(self, name):
+        """
+        Check if the session has a file.
+        
+        Args:
+            name (str): File name relative to the session directory.
+        """
+        if self._zip is not None:
+            return name in self._members
+        return os.path.exists(os.path.join(self.session_dir, name))
+    
+    def open(self, name, binary=False):
+        """
+        Open a session file for reading.
+        
+        Args:
+            name (str): File name relative to the session directory.
+            binary (bool): Open in binary mode instead of text mode.
+            
+        Returns:
+            file: Readable file object.
+        """
+        if self._zip is not None:
+            member = self._zip.open(name)
+            return member if binary else io.TextIOWrapper(member, encoding='utf-8')
+        return open(os.path.join(self.session_dir, name), 'rb' if binary else 'r')
+    
+    def read_json(self, name):
+        """
+        Read a JSON session file.
+        
+        Args:
+            name (str): File name relative to the session directory.
+            
+        Returns:
+            Parsed JSON data.
+        """
+        with self.open(name) as f:
+            return json.load(f)
+    
+    def load_npy(self, name):
+        """
+        Load a ``.npy`` session file read-only.
+        
+        Files and stored archive members are memory-mapped; compressed
+        archive members are decompressed into memory (and cached).
+        
+        Args:
+            name (str): File name relative to the session directory.
+            
+        Returns:
+            numpy.ndarray: Read-only array.
+        """
+        if self._zip is None:
+            return np.load(os.path.join(self.session_dir, name), mmap_mode='r')
+        
+        info = self._zip.getinfo(name)
+        if info.compress_type != zipfile.ZIP_STORED:
+            key = (os.path.abspath(self.archive_path), os.path.getmtime(self.archive_path), name)
+            return _archived_array_cache.get_or_compute(key, lambda: self._read_compressed_npy(name))
+        
+        # Uncompressed members are mapped in place: skip the local file header
+        with open(self.archive_path, 'rb') as f:
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_length, extra_length = struct.unpack('<HH', header[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+        return np.memmap(self.archive_path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                         order='F' if fortran_order else 'C')
+    
+    def _read_compressed_npy(self, name):
+        with self._zip.open(name) as f:
+            array = np.lib.format.read_array(io.BytesIO(f.read()))
+        # Cached arrays are shared between readers
+        array.flags.writeable = False
+        return array
+    
+    def close(self):
+        """Close the underlying archive, if any."""
+        if self._zip is not None:
+            self._zip.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_generation_log(session_dir, name='generation_data'):
+    """
+    Read all records of a generation log.
+
+    Works for session directories and archived sessions. Falls back to the
+    legacy ``<name>.json`` file written by older versions. A truncated last
+    line (e.g. after a crash mid-write) is ignored.
+
+    Args:
+        session_dir (str): Session directory holding the log files.
+        name (str): Base name of the log files.
+
+    Returns:
+        list: Records in the order they were appended.
+    """
+    with SessionStore(session_dir) as store:
+        if store.exists(f'{name}.jsonl'):
+            records = []
+            with store.open(f'{name}.jsonl') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+            return records
+
+        if store.exists(f'{name}.json'):
+            return store.read_json(f'{name}.json')
+
+    return []
+
+
+def read_generation_index(session_dir, name='generation_data'):
+    """
+    Read the (generation, offset) index of a generation log.
+    
+    Logs written before the index existed are scanned once and, unless the
+    session is archived, the rebuilt index is saved next to the log.
+    
+    Args:
+        session_dir (str): Session directory holding the log files.
+        name (str): Base name of the log files.
+        
+    Returns:
+        numpy.ndarray: Index entries (GENERATION_INDEX_DTYPE), or None if
+        the session has no JSON Lines log.
+    """
+    with SessionStore(session_dir) as store:
+        if store.exists(f'{name}.idx'):
+            with store.open(f'{name}.idx', binary=True) as f:
+                data = f.read()
+            # Ignore a partially written last entry of a live log
+            data = data[:len(data) - len(data) % GENERATION_INDEX_DTYPE.itemsize]
+            return np.frombuffer(data, dtype=GENERATION_INDEX_DTYPE)
+        if store.archived or not store.exists(f'{name}.jsonl'):
+            return None
+    
+    jsonl_path = os.path.join(session_dir, f'{name}.jsonl')
+    entries = _scan_generation_log(jsonl_path)
+    _write_generation_index(os.path.join(session_dir, f'{name}.idx'), entries)
+    return entries
+
+
+def read_generation_range(session_dir, start=None, stop=None, limit=None, fields=None,
+                          name='generation_data'):
+    """
+    Read the records of a range of generations.
+    
+    The log index locates the first matching record, so only the requested
+    window is read from disk.
+    
+    Args:
+        session_dir (str): Session directory holding the log files.
+        start (int, optional): First generation (inclusive).
+        stop (int, optional): Last generation (inclusive).
+        limit (int, optional): Maximum number of records.
+        fields (list, optional): Fields to return. ``generation`` is always included.
+        name (str): Base name of the log files.
+        
+    Returns:
+        list: Matching records, in log order.
+    """
+    index = read_generation_index(session_dir, name)
+    if index is None:
+        # Legacy sessions without a JSON Lines log
+        records = [r for r in read_generation_log(session_dir, name)
+                   if (start is None or r['generation'] >= start) and (stop is None or r['generation'] <= stop)]
+        selected = records[:limit] if limit is not None else records
+    else:
+        mask = np.ones(len(index), dtype=bool)
+        if start is not None:
+            mask &= index['generation'] >= start
+        if stop is not None:
+            mask &= index['generation'] <= stop
+        rows = np.flatnonzero(mask)
+        if limit is not None:
+            rows = rows[:limit]
+        
+        selected = []
+        if len(rows):
+            # Matching rows are read in one forward pass from the first one
+            wanted = set(rows.tolist())
+            last = int(rows[-1])
+            with SessionStore(session_dir) as store, store.open(f'{name}.jsonl', binary=True) as f:
+                f.seek(int(index['offset'][rows[0]]))
+                for row in range(int(rows[0]), last + 1):
+                    line = f.readline()
+                    if row in wanted:
+                        selected.append(json.loads(line))
+    
+    if fields:
+        keep = set(fields) | {'generation'}
+        selected = [{key: value for key, value in record.items() if key in keep} for record in selected]
+    return selected
+
+
+def archive_session(session_id, data_dir='../data', remove=True):
+    """
+    Pack a finished session into a single compressed archive.
+    
+    Every member is compressed with LZMA except the small weight index,
+    which is stored so it can still be memory-mapped. The weight matrix is
+    most of a session's bytes and compresses well (the best agent often
+    survives several generations unchanged): a 60-generation session went
+    from 224 KB of weights to 59 KB. In exchange, reading an archived
+    session's weights decompresses the whole matrix once (see
+    SessionStore.load_npy). A ``manifest.json`` member describes the
+    archive. The loaders in this module read archived sessions
+    transparently.
+    
+    Args:
+        session_id (str): ID of the session to archive.
+        data_dir (str): Directory containing data files.
+        remove (bool): Delete the session directory once archived.
+        
+    Returns:
+        str: Path to the archive.
+    """
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    archive_path = session_dir + '.zip'
+    if not os.path.isdir(session_dir):
+        if os.path.exists(archive_path):
+            return archive_path
+        raise FileNotFoundError(f"Session {session_id} not found")
+    if is_training_active(session_id, data_dir):
+        raise RuntimeError(f"Session {session_id} is still active")
+    
+    # The weight archive is preallocated; only its used rows are archived
+    weight_archive = WeightArchive(session_dir)
+    trimmed = {}
+    if weight_archive.index is not None:
+        trimmed[WeightArchive.WEIGHTS_FILE] = weight_archive.weights[:weight_archive.count]
+        trimmed[WeightArchive.INDEX_FILE] = weight_archive.index[:weight_archive.count]
+    
+    members = []
+    tmp_path = archive_path + '.tmp'
+    with zipfile.ZipFile(tmp_path, 'w') as archive:
+        for root, _, files in os.walk(session_dir):
+            for file_name in sorted(files):
+                if file_name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, file_name)
+                name = os.path.relpath(path, session_dir).replace(os.sep, '/')
+                compress_type = zipfile.ZIP_STORED if name == WeightArchive.INDEX_FILE else zipfile.ZIP_LZMA
+                if name in trimmed:
+                    info = zipfile.ZipInfo(name, time.localtime(os.path.getmtime(path))[:6])
+                    info.compress_type = compress_type
+                    with archive.open(info, 'w', force_zip64=True) as f:
+                        np.lib.format.write_array(f, np.ascontiguousarray(trimmed[name]))
+                else:
+                    archive.write(path, name, compress_type=compress_type)
+                info = archive.getinfo(name)
+                members.append({
+                    'name': name,
+                    'size': info.file_size,
+                    'compressed_size': info.compress_size,
+                    'compression': 'stored' if compress_type == zipfile.ZIP_STORED else 'lzma'
+                })
+        
+        manifest = {
+            'session_id': session_id,
+            'archived_at': time.time(),
+            'format_version': 1,
+            'session': get_session_catalog(data_dir).get(session_id),
+            'members': members
+        }
+        archive.writestr('manifest.json', json.dumps(manifest, indent=2), compress_type=zipfile.ZIP_LZMA)
+    
+    os.replace(tmp_path, archive_path)
+    if remove:
+        shutil.rmtree(session_dir)
+    return archive_path
+
+
+class WeightArchive:
+    """
+    Memory-mapped archive of the best agent's weights for every generation.
+    
+    Weights are stored as rows of a float64 ``.npy`` matrix and described by a
+    small structured ``.npy`` index (generation, fitness, food eaten, steps
+    taken). Both files are memory-mapped, so any generation's genome can be
+    read by random access without parsing the whole history.
+    
+    Growing a full archive copies it, so writers preallocate the expected
+    number of generations (TrainingData also appends on its writer thread).
+    """
+    
+    WEIGHTS_FILE = 'best_weights.npy'
+    INDEX_FILE = 'best_weights_index.npy'
+    INDEX_DTYPE = np.dtype([
+        ('generation', '<i8'),
+        ('fitness', '<f8'),
+        ('food_eaten', '<f8'),
+        ('steps_taken', '<f8')
+    ])
+    
+    def __init__(self, session_dir, mode='r', initial_capacity=DEFAULT_WEIGHT_ARCHIVE_CAPACITY):
+        """
+        Open a weight archive.
+        
+        Args:
+            session_dir (str): Session directory holding the archive files.
+            mode (str): 'r' to read an existing archive, 'w' to append to it.
+            initial_capacity (int): Rows preallocated when the archive is created.
+        """
+        self.weights_path = os.path.join(session_dir, self.WEIGHTS_FILE)
+        self.index_path = os.path.join(session_dir, self.INDEX_FILE)
+        self.mode = mode
+        self.initial_capacity = initial_capacity
+        self.weights = None
+        self.index = None
+        self.count = 0
+        self._rows_by_generation = None
+        
+        if mode == 'w':
+            if os.path.exists(self.index_path):
+                self.weights = np.load(self.weights_path, mmap_mode='r+')
+                self.index = np.load(self.index_path, mmap_mode='r+')
+        else:
+            with SessionStore(session_dir) as store:
+                if store.exists(self.INDEX_FILE):
+                    self.weights = store.load_npy(self.WEIGHTS_FILE)
+                    self.index = store.load_npy(self.INDEX_FILE)
+        
+        if self.index is not None:
+            unused = np.flatnonzero(self.index['generation'] < 0)
+            self.count = int(unused[0]) if len(unused) else len(self.index)
+    
+    @classmethod
+    def exists(cls, session_dir):
+        """Return True if the session (directory or archive) contains a weight archive."""
+        with SessionStore(session_dir) as store:
+            return store.exists(cls.INDEX_FILE)
+    
+    def append(self, generation, weights, fitness, food_eaten, steps_taken):
+        """
+        Append the best agent of a generation.
+        
+        Args:
+            generation (int): Generation number.
+            weights (numpy.ndarray): Flat weight vector.
+            fitness (float): Fitness of the agent.
+            food_eaten (float): Food eaten by the agent.
+            steps_taken (float): Steps taken by the agent.
+            
+        Returns:
+            int: Row of the archive holding the weights.
+        """
+        if self.mode != 'w':
+            raise IOError("Weight archive opened read-only")
+        
+        weights = np.asarray(weights, dtype=np.float64).ravel()
+        if self.index is None:
+            self._allocate(self.initial_capacity, len(weights))
+        elif self.count == len(self.index):
+            self._allocate(2 * len(self.index), self.weights.shape[1])
+        
+        row = self.count
+        self.weights[row] = weights
+        self.index[row] = (generation, fitness, food_eaten, steps_taken)
+        self.count += 1
+        if self._rows_by_generation is not None:
+            self._rows_by_generation[int(generation)] = row
+        return row
+    
+    def _allocate(self, capacity, n_weights):
+        """Create the archive files, or grow them to a new capacity."""
+        weights = np.lib.format.open_memmap(self.weights_path + '.tmp', mode='w+',
+                                            dtype=np.float64, shape=(capacity, n_weights))
+        index = np.lib.format.open_memmap(self.index_path + '.tmp', mode='w+',
+                                          dtype=self.INDEX_DTYPE, shape=(capacity,))
+        index['generation'] = -1
+        if self.index is not None:
+            weights[:self.count] = self.weights[:self.count]
+            index[:self.count] = self.index[:self.count]
+        weights.flush()
+        index.flush()
+        
+        self.weights = weights
+        self.index = index
+        os.replace(self.weights_path + '.tmp', self.weights_path)
+        os.replace(self.index_path + '.tmp', self.index_path)
+    
+    def flush(self):
+        """Write pending memory-mapped changes to disk."""
+        if self.index is not None and self.mode == 'w':
+            self.weights.flush()
+            self.index.flush()
+    
+    def row_for_generation(self, generation):
+        """
+        Look up the archive row of a generation.
+        
+        Args:
+            generation (int): Generation number.
+            
+        Returns:
+            int: Row index, or None if the generation is not archived.
+        """
+        if self._rows_by_generation is None:
+            generations = self.index['generation'][:self.count] if self.count else []
+            self._rows_by_generation = {int(g): row for row, g in enumerate(generations)}
+        return self._rows_by_generation.get(int(generation))
+    
+    def get_row(self, row):
+        """
+        Read one archived agent.
+        
+        Args:
+            row (int): Row index. Negative values count from the end.
+            
+        Returns:
+            dict: Best agent record with its weights as a list.
+        """
+        if row < 0:
+            row += self.count
+        if not 0 <= row < self.count:
+            raise IndexError(f"Row {row} out of range for archive of {self.count} agents")
+        entry = self.index[row]
+        return {
+            'generation': int(entry['generation']),
+            'fitness': float(entry['fitness']),
+            'food_eaten': float(entry['food_eaten']),
+            'steps_taken': float(entry['steps_taken']),
+            'weights': self.weights[row].tolist()
+        }
+    
+    def get(self, generation):
+        """
+        Read the best agent of a generation.
+        
+        Args:
+            generation (int): Generation number.
+            
+        Returns:
+            dict: Best agent record, or None if the generation is not archived.
+        """
+        row = self.row_for_generation(generation)
+        return self.get_row(row) if row is not None else None
+    
+    def close(self):
+        """Flush pending writes and reopen the archive read-only."""
+        self.flush()
+        self.mode = 'r'
+        if self.index is not None:
+            self.weights = np.load(self.weights_path, mmap_mode='r')
+            self.index = np.load(self.index_path, mmap_mode='r')
+
+
+class ChartHistory:
+    """
+    Fixed-size, downsampled history of the dashboard chart series.
+    
+    Keeps at most ``max_points`` points spread over the whole run: when the
+    buffer is full every other point is dropped and the sampling stride
+    doubles, so memory stays flat however many generations are recorded.
+    """
+    
+    SERIES = ('generation', 'best_fitness', 'avg_fitness', 'diversity', 'max_size')
+    
+    def __init__(self, max_points=DEFAULT_CHART_POINTS):
+        """
+        Initialize an empty chart history.
+        
+        Args:
+            max_points (int): Maximum number of points per series.
+        """
+        self.max_points = max(2, max_points)
+        self.stride = 1
+        self.count = 0
+        self.series = {name: [] for name in self.SERIES}
+        self.latest = None
+    
+    def add(self, gen_data):
+        """
+        Add a generation record to the history.
+        
+        Args:
+            gen_data (dict): Generation record.
+        """
+        if self.count % self.stride == 0:
+            for name in self.SERIES:
+                self.series[name].append(gen_data[name])
+            if len(self.series['generation']) > self.max_points:
+                for values in self.series.values():
+                    del values[1::2]
+                self.stride *= 2
+        self.count += 1
+        self.latest = gen_data
+    
+    def get_series(self, name):
+        """
+        Get the downsampled values of a series, always ending with the latest record.
+        
+        Args:
+            name (str): Series name.
+            
+        Returns:
+            list: Downsampled values.
+        """
+        values = list(self.series[name])
+        if self.latest is not None and (self.count - 1) % self.stride != 0:
+            values.append(self.latest[name])
+        return values
+
+
+class SessionCatalog:
+    """
+    SQLite-backed catalog of training sessions.
+    
+    Holds one row per session (id, config, status, best fitness, generation
+    count, ...) with indexes for the common lookups. The database runs in WAL
+    mode and every write is a short immediate transaction, so several
+    training processes can update it concurrently without losing entries.
+    """
+    
+    DB_FILE = 'sessions.db'
+    SCHEMA_VERSION = 1
+    COLUMNS = ('session_id', 'status', 'config', 'start_time', 'started_at', 'updated_at',
+               'duration', 'generations', 'best_fitness', 'max_snake_size')
+    ORDER_COLUMNS = ('started_at', 'updated_at', 'best_fitness', 'generations')
+    
+    def __init__(self, data_dir='../data', timeout=30.0):
+        """
+        Open (and create if needed) the session catalog.
+        
+        Args:
+            data_dir (str): Directory containing data files.
+            timeout (float): Seconds to wait for a lock held by another writer.
+        """
+        self.data_dir = data_dir
+        self.db_path = os.path.join(data_dir, self.DB_FILE)
+        self.timeout = timeout
+        self._local = threading.local()
+        os.makedirs(data_dir, exist_ok=True)
+        self._migrate()
+    
+    def _connect(self):
+        """Return the calling thread's connection to the catalog."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+    
+    def _write(self, sql, params=()):
+        """Run a write statement in its own immediate transaction."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conn.execute(sql, params)
+            conn.execute('COMMIT')
+            return cursor
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def _migrate(self):
+        """Create the schema and import the legacy sessions.json on first use."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute('PRAGMA user_version').fetchone()[0] < self.SCHEMA_VERSION:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        session_id TEXT PRIMARY KEY,
+                        status TEXT NOT NULL,
+                        config TEXT,
+                        start_time TEXT,
+                        started_at REAL,
+                        updated_at REAL,
+                        duration TEXT,
+                        generations INTEGER NOT NULL DEFAULT 0,
+                        best_fitness REAL NOT NULL DEFAULT 0,
+                        max_snake_size INTEGER NOT NULL DEFAULT 3
+                    )
+                """)
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_status '
+                             'ON sessions (status, started_at)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_started_at '
+                             'ON sessions (started_at)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_best_fitness '
+                             'ON sessions (best_fitness)')
+                self._import_legacy(conn)
+                conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def _import_legacy(self, conn):
+        """Copy the entries of a legacy sessions.json into the catalog."""
+        legacy_file = os.path.join(self.data_dir, 'sessions.json')
+        if not os.path.exists(legacy_file):
+            return
+        try:
+            with open(legacy_file, 'r') as f:
+                sessions = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return
+        
+        for session in sessions:
+            try:
+                started_at = datetime.strptime(session['start_time'], '%Y-%m-%d %H:%M:%S').timestamp()
+            except (KeyError, ValueError):
+                started_at = None
+            conn.execute(
+                'INSERT OR IGNORE INTO sessions (session_id, status, start_time, started_at, updated_at, '
+                'duration, generations, best_fitness, max_snake_size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (session.get('session_id'), 'completed', session.get('start_time'), started_at,
+                 started_at, session.get('duration'), session.get('generations', 0),
+                 session.get('best_fitness', 0), session.get('max_snake_size', 3))
+            )
+    
+    def register(self, session_id, start_time, config=None):
+        """
+        Add a new active session.
+        
+        Args:
+            session_id (str): ID of the session.
+            start_time (float): Start timestamp of the session.
+            config (dict, optional): Training configuration.
+        """
+        self._write(
+            'INSERT OR REPLACE INTO sessions (session_id, status, config, start_time, started_at, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (session_id, 'active', json.dumps(config) if config is not None else None,
+             datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S'), start_time, time.time())
+        )
+    
+    def update_progress(self, session_id, generations, best_fitness, max_snake_size):
+        """
+        Update the progress counters of a session.
+        
+        Args:
+            session_id (str): ID of the session.
+            generations (int): Last recorded generation.
+            best_fitness (float): Best fitness so far.
+            max_snake_size (int): Max snake size so far.
+        """
+        self._write(
+            'UPDATE sessions SET generations = ?, best_fitness = ?, max_snake_size = ?, updated_at = ? '
+            'WHERE session_id = ?',
+            (generations, best_fitness, max_snake_size, time.time(), session_id)
+        )
+    
+    def finish(self, session_id, summary, status='completed'):
+        """
+        Mark a session as finished and store its final summary.
+        
+        Args:
+            session_id (str): ID of the session.
+            summary (dict): Session summary (duration, generations, best_fitness, max_snake_size).
+                A best_fitness of None (no generation recorded) keeps the stored value.
+            status (str): Final status of the session.
+        """
+        self._write(
+            'UPDATE sessions SET status = ?, duration = ?, generations = ?, best_fitness = COALESCE(?, best_fitness), '
+            'max_snake_size = ?, updated_at = ? WHERE session_id = ?',
+            (status, summary.get('duration'), summary.get('generations', 0), summary.get('best_fitness'),
+             summary.get('max_snake_size', 3), time.time(), session_id)
+        )
+    
+    def end(self, session_id, status):
+        """
+        Mark a session that is still active as ended without a summary (e.g.
+        its training process crashed or was terminated).
+        
+        Args:
+            session_id (str): ID of the session.
+            status (str): Final status of the session ('failed' or 'stopped').
+            
+        Returns:
+            bool: True if the session was active.
+        """
+        cursor = self._write(
+            'UPDATE sessions SET status = ?, updated_at = ? WHERE session_id = ? AND status = ?',
+            (status, time.time(), session_id, 'active')
+        )
+        return cursor.rowcount > 0
+    
+    def _row_to_dict(self, row):
+        session = dict(row)
+        session['config'] = json.loads(session['config']) if session['config'] else None
+        return session
+    
+    def get(self, session_id):
+        """
+        Get one session.
+        
+        Args:
+            session_id (str): ID of the session.
+            
+        Returns:
+            dict: Session entry, or None if not found.
+        """
+        row = self._connect().execute(
+            f'SELECT {", ".join(self.COLUMNS)} FROM sessions WHERE session_id = ?', (session_id,)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+    
+    def _where(self, status=None, min_fitness=None):
+        clauses, params = [], []
+        if status:
+            clauses.append('status = ?')
+            params.append(status)
+        if min_fitness is not None:
+            clauses.append('best_fitness >= ?')
+            params.append(min_fitness)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+    
+    def list(self, limit=None, offset=0, status=None, min_fitness=None, order_by='started_at', descending=False):
+        """
+        List sessions, optionally filtered and paginated.
+        
+        Args:
+            limit (int, optional): Maximum number of sessions to return.
+            offset (int): Number of sessions to skip.
+            status (str, optional): Only return sessions with this status.
+            min_fitness (float, optional): Only return sessions with at least this best fitness.
+            order_by (str): Column to sort by (one of ORDER_COLUMNS).
+            descending (bool): Sort in descending order.
+            
+        Returns:
+            list: Session entries.
+        """
+        if order_by not in self.ORDER_COLUMNS:
+            raise ValueError(f"Cannot order sessions by '{order_by}'")
+        where, params = self._where(status, min_fitness)
+        sql = (f'SELECT {", ".join(self.COLUMNS)} FROM sessions{where} '
+               f'ORDER BY {order_by} {"DESC" if descending else "ASC"}, session_id '
+               'LIMIT ? OFFSET ?')
+        params += [limit if limit is not None else -1, offset]
+        return [self._row_to_dict(row) for row in self._connect().execute(sql, params)]
+    
+    def count(self, status=None, min_fitness=None):
+        """
+        Count sessions matching the given filters.
+        
+        Returns:
+            int: Number of matching sessions.
+        """
+        where, params = self._where(status, min_fitness)
+        return self._connect().execute(f'SELECT COUNT(*) FROM sessions{where}', params).fetchone()[0]
+    
+    def version(self):
+        """
+        Get a stamp that changes whenever a session is added or updated.
+        
+        Returns:
+            tuple: Number of sessions, latest update time and total generations.
+        """
+        row = self._connect().execute(
+            'SELECT COUNT(*), MAX(updated_at), TOTAL(generations) FROM sessions').fetchone()
+        return tuple(row)
+    
+    def is_active(self, session_id):
+        """
+        Check if a session is active.
+        
+        Returns:
+            bool: True if active, False if finished, None if the session is unknown.
+        """
+        row = self._connect().execute(
+            'SELECT status FROM sessions WHERE session_id = ?', (session_id,)
+        ).fetchone()
+        return row['status'] == 'active' if row else None
+
 
 class TrainingData:
     """
     Class for collecting and managing training data.
+    
+    Only the most recent ``history_limit`` generations are kept in memory;
+    the complete history lives in the on-disk generation logs and the
+    dashboard charts use a downsampled summary of the whole run.
     """
     
-    def __init__(self, data_dir='../data'):
+    def __init__(self, data_dir='../data', fsync_interval=DEFAULT_FSYNC_INTERVAL,
+                 history_limit=DEFAULT_HISTORY_LIMIT, chart_points=DEFAULT_CHART_POINTS, config=None,
+                 write_queue_size=DEFAULT_WRITE_QUEUE_SIZE, timers=None):
         """
         Initialize the training data manager.
         
         Args:
             data_dir (str): Directory to save data files.
+            config (dict, optional): Training configuration stored in the session catalog.
+            write_queue_size (int): Maximum pending operations of the background writer.
+            fsync_interval (int): Generations between fsync calls on the logs.
+            history_limit (int): Recent generations kept in memory.
+            chart_points (int): Maximum points per dashboard chart series.
+            timers (PhaseTimers, optional): Receives the background writer's disk time.
         """
         self.data_dir = data_dir
-        self.session_id = datetime.now().strftime('%Y%m%d_%H%M%S')
-        self.session_dir = os.path.join(data_dir, f'session_{self.session_id}')
-        
-        # Create data directory if it doesn't exist
-        os.makedirs(self.session_dir, exist_ok=True)
+        self.session_id, self.session_dir = self._create_session_dir(data_dir)
         
         # Initialize data structures
-        self.generation_data = []
-        self.best_agents = []
+        self.generation_data = deque(maxlen=history_limit)
+        self.best_agents = deque(maxlen=history_limit)
+        self.phase_timings = deque(maxlen=history_limit)
+        self.chart_history = ChartHistory(chart_points)
+        # Best fitness of the run; None until a generation is recorded (fitness may be negative)
+        self.best_fitness = None
+        self.max_size = 3
+        self.best_match_fitness = float('-inf')
         self.start_time = time.time()
         
+        # Dashboard data, rebuilt only when a generation is recorded
+        self.dashboard_version = 0
+        self._dashboard_data = None
+        
+        # Disk writes run on a background thread so a slow disk never stalls training
+        self.writer = PersistenceWriter(write_queue_size, timers=timers)
+        
+        # Append-only logs, one record per generation
+        self.generation_log = GenerationLog(self.session_dir, 'generation_data',
+                                            fsync_interval=fsync_interval)
+        self.best_agents_log = GenerationLog(self.session_dir, 'best_agents', write_csv=False,
+                                             fsync_interval=fsync_interval)
+        self.phase_timings_log = GenerationLog(self.session_dir, 'phase_timings', write_csv=False,
+                                               fsync_interval=fsync_interval)
+        # Opened by the first memory report (memory profiling is optional)
+        self.memory_log = None
+        self.fsync_interval = fsync_interval
+        # Preallocated for the configured run, so the archive never grows while training
+        generations = (config or {}).get('generations')
+        self.weight_archive = WeightArchive(self.session_dir, mode='w',
+                                            initial_capacity=generations or DEFAULT_WEIGHT_ARCHIVE_CAPACITY)
+        # Weights are appended on the writer thread: rows are reserved here, in order
+        self._next_weight_row = self.weight_archive.count
+        self._latest_best_weights = None
+        
+        # Functions notified of every recorded generation (see add_listener)
+        self.listeners = []
+        
         # Set this instance as the latest training data
         global _latest_training_data
         with _data_lock:
             _latest_training_data = self
             
         # Save status file to indicate active training
+        self._write_status(active=True)
+        
+        # Register the session in the catalog
+        self.catalog = get_session_catalog(data_dir)
+        self.writer.call(self.catalog.register, self.session_id, self.start_time, config)
+    
+    def _write_status(self, active):
+        """Queue an atomic update of the session status file."""
         status_file = os.path.join(self.session_dir, 'status.json')
-        with open(status_file, 'w') as f:
-            json.dump({'active': True, 'last_update': time.time()}, f)
+        self.writer.write_json(status_file, {'active': active, 'last_update': time.time()}, indent=None)
     
     def record_generation(self, generation, population, best_fitness, diversity):
         """
@@ -78,7 +1288,7 @@ class TrainingData:
         avg_size = sum(agent.food_eaten + 3 for agent in population) / len(population)
         
         # Count alive agents
-        alive_agents = sum(1 for agent in population if agent.alive)
+        alive_agents = sum(1 for agent in population if getattr(agent, 'alive', True))
         
         # Calculate training time
         training_time = time.time() - self.start_time
@@ -95,64 +1305,161 @@ class TrainingData:
             'training_time': training_time
         }
         
-        # Add to generation data list
+        # Add to the in-memory window, the on-disk log and the chart summary
         self.generation_data.append(gen_data)
+        self.writer.call(self.generation_log.append, gen_data)
+        self.chart_history.add(gen_data)
+        self.best_fitness = best_fitness if self.best_fitness is None else max(self.best_fitness, best_fitness)
+        self.max_size = max(self.max_size, max_size)
         
-        # Save best agent of this generation
-        self.best_agents.append({
+        # Save best agent of this generation; its weights go to the binary archive
+        weights = np.array(best_agent.neural_network.get_weights_flat(), dtype=np.float64)
+        row = self._next_weight_row
+        self._next_weight_row += 1
+        self.writer.call(self.weight_archive.append, generation, weights,
+                         best_agent.fitness, best_agent.food_eaten, best_agent.steps_taken)
+        self._latest_best_weights = weights
+        best_agent_data = {
             'generation': generation,
             'fitness': best_agent.fitness,
             'food_eaten': best_agent.food_eaten,
             'steps_taken': best_agent.steps_taken,
-            'weights': best_agent.neural_network.get_weights_flat().tolist()
-        })
+            'weights_row': row
+        }
+        self.best_agents.append(best_agent_data)
+        self.writer.call(self.best_agents_log.append, best_agent_data)
         
         # Save data periodically
         if generation % 10 == 0:
             self.save_training_data()
             
-        # Update dashboard data
-        self.export_for_dashboard()
+        # Rebuild the dashboard snapshot for the new generation
+        self._refresh_dashboard()
+        
+        # Push the new generation to subscribers
+        self._notify_listeners({
+            'session_id': self.session_id,
+            'record': gen_data,
+            'best_agent': best_agent_data
+        })
     
-    def save_training_data(self):
+    def record_phase_timings(self, generation, timings, generation_time):
         """
-        Save all training data to files.
+        Record the per-phase time breakdown of a generation.
+        
+        Args:
+            generation (int): Generation number.
+            timings (dict): ``{phase: {'seconds', 'calls'}}`` as returned by PhaseTimers.collect.
+            generation_time (float): Wall time of the generation in seconds.
+            
+        Returns:
+            dict: The recorded entry.
+        """
+        entry = {
+            'generation': generation,
+            'generation_time': generation_time,
+            'phases': timings
+        }
+        self.phase_timings.append(entry)
+        self.writer.call(self.phase_timings_log.append, entry)
+        return entry
+    
+    def record_memory_report(self, report):
         """
-        # Save generation data as JSON
-        gen_data_file = os.path.join(self.session_dir, 'generation_data.json')
-        with open(gen_data_file, 'w') as f:
-            json.dump(self.generation_data, f, indent=2)
+        Record the memory report of a generation (see snake_ga_memory).
         
-        # Save generation data as CSV
-        gen_csv_file = os.path.join(self.session_dir, 'generation_data.csv')
-        with open(gen_csv_file, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=self.generation_data[0].keys() if self.generation_data else [])
-            writer.writeheader()
-            writer.writerows(self.generation_data)
+        Args:
+            report (dict): Memory report with a ``generation`` field.
+        """
+        if self.memory_log is None:
+            self.memory_log = GenerationLog(self.session_dir, 'memory_report', write_csv=False,
+                                            fsync_interval=self.fsync_interval)
+        self.writer.call(self.memory_log.append, report)
+    
+    @staticmethod
+    def _create_session_dir(data_dir):
+        """
+        Create the directory of a new session.
+        
+        Session IDs are timestamps; sessions started in the same second (e.g.
+        by several training workers) get a numeric suffix.
+        
+        Returns:
+            tuple: (session_id, session_dir)
+        """
+        os.makedirs(data_dir, exist_ok=True)
+        base_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        for attempt in itertools.count(1):
+            session_id = base_id if attempt == 1 else f'{base_id}_{attempt}'
+            session_dir = os.path.join(data_dir, f'session_{session_id}')
+            try:
+                os.mkdir(session_dir)
+                return session_id, session_dir
+            except FileExistsError:
+                continue
+    
+    def add_listener(self, listener):
+        """
+        Register a function called with every recorded generation.
         
-        # Save best agents
-        best_agents_file = os.path.join(self.session_dir, 'best_agents.json')
-        with open(best_agents_file, 'w') as f:
-            json.dump(self.best_agents, f, indent=2)
+        The listener receives a dict with ``session_id``, ``record`` (the
+        generation record) and ``best_agent`` (summary of the best agent,
+        without weights). It runs on the training thread and must be quick.
+        
+        Args:
+            listener (callable): Function taking the generation event.
+        """
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        """
+        Unregister a listener added with add_listener.
+        
+        Args:
+            listener (callable): Registered function.
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    def _notify_listeners(self, event):
+        for listener in self.listeners + _generation_listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Error in generation listener: {e}")
+    
+    def save_training_data(self):
+        """
+        Save a checkpoint of the training data.
+        
+        Generation records are already appended to the logs as they are
+        recorded, so this only syncs the logs and refreshes the snapshot files.
+        """
+        # Make sure every appended record reaches the disk
+        self.writer.call(self.generation_log.flush)
+        self.writer.call(self.best_agents_log.flush)
+        self.writer.call(self.phase_timings_log.flush)
+        if self.memory_log is not None:
+            self.writer.call(self.memory_log.flush)
+        self.writer.call(self.weight_archive.flush)
         
         # Save latest best agent separately
         if self.best_agents:
-            latest_best = self.best_agents[-1]
             latest_best_file = os.path.join(self.session_dir, 'latest_best_agent.json')
-            with open(latest_best_file, 'w') as f:
-                json.dump(latest_best, f, indent=2)
+            self.writer.write_json(latest_best_file, self.get_best_agent())
                 
-        # Update status file
-        status_file = os.path.join(self.session_dir, 'status.json')
-        with open(status_file, 'w') as f:
-            json.dump({'active': True, 'last_update': time.time()}, f)
+        # Update status file and catalog progress
+        self._write_status(active=True)
+        if self.generation_data:
+            self.writer.call(self.catalog.update_progress, self.session_id,
+                             self.generation_data[-1]['generation'], self.best_fitness, self.max_size)
     
     def save_training_session(self):
         """
         Save a summary of the training session.
         
         Returns:
-            str: Path to the session summary file.
+            str: Path to the session catalog.
         """
         # Calculate session duration
         duration = time.time() - self.start_time
@@ -163,11 +1470,9 @@ class TrainingData:
         # Get final generation
         final_gen = self.generation_data[-1]['generation'] if self.generation_data else 0
         
-        # Get best fitness achieved
-        best_fitness = max(gen['best_fitness'] for gen in self.generation_data) if self.generation_data else 0
-        
-        # Get max snake size achieved
-        max_size = max(gen['max_size'] for gen in self.generation_data) if self.generation_data else 3
+        # Best fitness and max snake size are tracked over the whole run (None: no generation)
+        best_fitness = self.best_fitness
+        max_size = self.max_size
         
         # Create session summary
         session_summary = {
@@ -179,50 +1484,160 @@ class TrainingData:
             'max_snake_size': max_size
         }
         
-        # Save session summary
-        summary_file = os.path.join(self.data_dir, 'sessions.json')
+        try:
+            # Wait for pending writes, then close the generation logs
+            self.flush()
+            self._close_logs()
+            
+            # Save session summary in the catalog and mark the session as complete
+            self.catalog.finish(self.session_id, session_summary)
+            self._write_status(active=False)
+            self.flush()
+        finally:
+            # Stop the writer thread even if saving failed
+            self.writer.close()
+        
+        return self.catalog.db_path
+    
+    def _close_logs(self):
+        """Close the generation logs and the weight archive."""
+        self.generation_log.close()
+        self.best_agents_log.close()
+        self.phase_timings_log.close()
+        if self.memory_log is not None:
+            self.memory_log.close()
+        self.weight_archive.close()
+    
+    def close(self):
+        """
+        Write pending data, close the logs and stop the background writer.
+        
+        Used when a session ends without save_training_session (e.g. training
+        raised). Safe to call more than once.
+        """
+        try:
+            self.flush()
+            self._close_logs()
+        finally:
+            self.writer.close()
+    
+    def flush(self, timeout=None):
+        """
+        Wait until all queued disk writes have completed (e.g. before shutdown).
+        
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds.
+            
+        Returns:
+            bool: True if all writes completed, False on timeout.
+        """
+        return self.writer.flush(timeout)
+    
+    def persistence_metrics(self):
+        """
+        Get the background writer's queue depth and write latency metrics.
         
-        # Load existing sessions if file exists
-        sessions = []
-        if os.path.exists(summary_file):
-            try:
-                with open(summary_file, 'r') as f:
-                    sessions = json.load(f)
-            except json.JSONDecodeError:
-                sessions = []
+        Returns:
+            dict: Persistence metrics.
+        """
+        return self.writer.metrics()
+    
+    def save_best_match(self, replay, fitness, generation):
+        """
+        Store a recorded game as the session's best match if it beats the current one.
         
-        # Add current session
-        sessions.append(session_summary)
+        The game is saved in the compact replay format (seed and packed
+        directions) as ``matches/best_match.replay``.
         
-        # Save updated sessions
-        with open(summary_file, 'w') as f:
-            json.dump(sessions, f, indent=2)
+        Args:
+            replay (GameReplay): Recorded game of the best agent.
+            fitness (float): Fitness of the agent that played the game.
+            generation (int): Generation of the agent.
             
-        # Update status file to indicate training is complete
-        status_file = os.path.join(self.session_dir, 'status.json')
-        with open(status_file, 'w') as f:
-            json.dump({'active': False, 'last_update': time.time()}, f)
+        Returns:
+            bool: True if the match was saved.
+        """
+        if replay is None or fitness <= self.best_match_fitness:
+            return False
+        self.best_match_fitness = fitness
+        
+        replay_data = replay.to_dict()
+        replay_data['metadata'] = dict(replay_data['metadata'], generation=generation, fitness=fitness)
+        matches_dir = os.path.join(self.session_dir, 'matches')
+        os.makedirs(matches_dir, exist_ok=True)
+        self.writer.write_json(os.path.join(matches_dir, 'best_match.replay'), replay_data, indent=None)
+        return True
+    
+    def get_best_agent(self, generation=None):
+        """
+        Get a best agent record together with its weights.
         
-        return summary_file
+        Args:
+            generation (int, optional): Generation to fetch. Defaults to the latest.
+            
+        Returns:
+            dict: Best agent record, or None if it is not available.
+        """
+        if not self.best_agents:
+            return None
+        if generation is None:
+            # The latest weights may still be queued for the archive
+            latest = self.best_agents[-1]
+            return {
+                'generation': int(latest['generation']),
+                'fitness': float(latest['fitness']),
+                'food_eaten': float(latest['food_eaten']),
+                'steps_taken': float(latest['steps_taken']),
+                'weights': self._latest_best_weights.tolist()
+            }
+        self.flush()
+        return self.weight_archive.get(generation)
     
     def export_for_dashboard(self):
         """
         Export data in a format suitable for the dashboard.
         
+        The data is cached and only rebuilt when a new generation is
+        recorded, so repeated calls neither recompute nor write anything.
+        
+        Returns:
+            dict: Data for dashboard visualization.
+        """
+        if self._dashboard_data is None:
+            self._refresh_dashboard()
+        return self._dashboard_data
+    
+    def _refresh_dashboard(self):
+        """Rebuild the dashboard data and dashboard_data.json, read by get_session_snapshot."""
+        dashboard_data = self._build_dashboard_data()
+        dashboard_data['version'] = self.dashboard_version + 1
+        dashboard_json = json.dumps(dashboard_data)
+        
+        # Save dashboard data
+        dashboard_file = os.path.join(self.session_dir, 'dashboard_data.json')
+        self.writer.write_text(dashboard_file, dashboard_json)
+        
+        self.dashboard_version += 1
+        self._dashboard_data = dashboard_data
+    
+    def _build_dashboard_data(self):
+        """
+        Build the dashboard data from the current training state.
+        
         Returns:
             dict: Data for dashboard visualization.
         """
-        # Extract data for charts
-        generations = [gen['generation'] for gen in self.generation_data]
-        best_fitness = [gen['best_fitness'] for gen in self.generation_data]
-        avg_fitness = [gen['avg_fitness'] for gen in self.generation_data]
-        diversity = [gen['diversity'] for gen in self.generation_data]
-        max_size = [gen['max_size'] for gen in self.generation_data]
+        # Extract data for charts from the downsampled history
+        generations = self.chart_history.get_series('generation')
+        best_fitness = self.chart_history.get_series('best_fitness')
+        avg_fitness = self.chart_history.get_series('avg_fitness')
+        diversity = self.chart_history.get_series('diversity')
+        max_size = self.chart_history.get_series('max_size')
         
         # Get latest generation data
         latest_gen = self.generation_data[-1] if self.generation_data else {
             'generation': 0,
-            'best_fitness': 0,
+            'best_fitness': None,
             'avg_fitness': 0,
             'max_size': 3,
             'avg_size': 3,
@@ -255,16 +1670,79 @@ class TrainingData:
                 'diversity': diversity,
                 'max_size': max_size
             },
-            'best_agent': self.best_agents[-1] if self.best_agents else None
+            'best_agent': self.get_best_agent()
         }
         
-        # Save dashboard data
-        dashboard_file = os.path.join(self.session_dir, 'dashboard_data.json')
-        with open(dashboard_file, 'w') as f:
-            json.dump(dashboard_data, f, indent=2)
-        
         return dashboard_data
 
+def load_generation_history(session_id, data_dir='../data'):
+    """
+    Rebuild the in-memory history of a session from its generation logs.
+    
+    Args:
+        session_id (str): ID of the session to load.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        dict: ``generation_data`` and ``best_agents`` lists, as held by
+        TrainingData during training.
+    """
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    return {
+        'generation_data': read_generation_log(session_dir, 'generation_data'),
+        'best_agents': read_generation_log(session_dir, 'best_agents')
+    }
+
+def load_best_agent(session_id, generation=None, data_dir='../data'):
+    """
+    Load the best agent of one generation of a session.
+    
+    Uses the memory-mapped weight archive, so only the requested genome is
+    read. Sessions recorded before the archive existed fall back to the
+    ``best_agents`` log.
+    
+    Args:
+        session_id (str): ID of the session.
+        generation (int, optional): Generation to load. Defaults to the latest.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        dict: Best agent record with weights, or None if not found.
+    """
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    
+    if WeightArchive.exists(session_dir):
+        archive = WeightArchive(session_dir)
+        if archive.count == 0:
+            return None
+        if generation is None:
+            return archive.get_row(-1)
+        return archive.get(generation)
+    
+    best_agents = read_generation_log(session_dir, 'best_agents')
+    if generation is None:
+        return best_agents[-1] if best_agents else None
+    for agent in best_agents:
+        if agent['generation'] == generation:
+            return agent
+    return None
+
+def load_best_match(session_id, data_dir='../data'):
+    """
+    Load the best recorded match of a session.
+    
+    Args:
+        session_id (str): ID of the session.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        GameReplay: The recorded match, or None if the session has none.
+    """
+    with SessionStore(os.path.join(data_dir, f'session_{session_id}')) as store:
+        if store.exists('matches/best_match.replay'):
+            return GameReplay.from_dict(store.read_json('matches/best_match.replay'))
+    return None
+
 def save_game_data(game_data):
     """
     Save game data to a file.
@@ -272,44 +1750,320 @@ def save_game_data(game_data):
     with open('game_data.json', 'w') as f:
         json.dump(game_data, f, indent=2)
 
-def load_training_session(session_id, data_dir='../data'):
+def load_training_session(session_id, data_dir='../data', best_agent_generation=None):
     """
     Load a training session.
     
     Args:
         session_id (str): ID of the session to load.
         data_dir (str): Directory containing data files.
+        best_agent_generation (int, optional): Replace the session's latest
+            best agent with the best agent of this generation.
         
     Returns:
         dict: Dashboard data for the session.
     """
     session_dir = os.path.join(data_dir, f'session_{session_id}')
-    dashboard_file = os.path.join(session_dir, 'dashboard_data.json')
     
-    if os.path.exists(dashboard_file):
-        with open(dashboard_file, 'r') as f:
-            return json.load(f)
+    with SessionStore(session_dir) as store:
+        data = store.read_json('dashboard_data.json') if store.exists('dashboard_data.json') else None
+    
+    if data is not None:
+        if best_agent_generation is not None:
+            data['best_agent'] = load_best_agent(session_id, best_agent_generation, data_dir)
+        return data
+    
+    return None
+
+
+class LRUCache:
+    """
+    Small thread-safe least-recently-used cache with hit/miss counters.
+    
+    The cache is bounded by a number of entries and, optionally, by the total
+    size of the cached values as measured by ``sizeof``.
+    """
+    
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=len):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_entries (int, optional): Maximum number of cached entries.
+            max_bytes (int, optional): Maximum total size of the cached values.
+            sizeof (callable): Size of a cached value, used with max_bytes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """
+        Return the cached value of a key, counting a hit or a miss.
+        
+        Args:
+            key: Hashable cache key.
+            default: Value returned on a miss.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
     
+    def put(self, key, value):
+        """
+        Cache a value, evicting the least recently used entries if needed.
+        
+        Values larger than max_bytes are not cached.
+        
+        Args:
+            key: Hashable cache key.
+            value: Value to cache.
+        """
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while ((self.max_entries is not None and len(self._entries) > self.max_entries) or
+                   (self.max_bytes is not None and self.size > self.max_bytes)):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+    
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value of a key, computing and caching it on a miss.
+        
+        Args:
+            key: Hashable cache key.
+            compute (callable): Function returning the value on a miss.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+    
+    def stats(self):
+        """
+        Get the cache counters.
+        
+        Returns:
+            dict: Entries, size, hits, misses, evictions and hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Downsampled chart series, keyed by (session, data version, resolution)
+_chart_cache = LRUCache(CHART_CACHE_SIZE)
+# Serialised dashboard data of live sessions, keyed by file path, size and mtime
+_snapshot_cache = LRUCache(SNAPSHOT_CACHE_SIZE)
+# Decompressed .npy members of archived sessions, keyed by archive path, mtime and member
+_archived_array_cache = LRUCache(max_bytes=ARCHIVED_ARRAY_CACHE_BYTES, sizeof=lambda array: array.nbytes)
+
+def _generation_log_version(session_dir):
+    """Version of a session's generation log: its size and mtime, or the archive's."""
+    for path in (os.path.join(session_dir, 'generation_data.jsonl'), session_dir.rstrip(os.sep) + '.zip'):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            return (stat.st_size, stat.st_mtime_ns)
     return None
 
 
-def list_training_sessions(data_dir='../data'):
+def get_generation_series(session_id, points=None, data_dir='../data'):
     """
-    List all training sessions.
+    Get the generation records of a session, downsampled for charting.
+    
+    Records are read from the full on-disk generation log and reduced with
+    LTTB. Results are cached per (session, log version, resolution).
     
     Args:
+        session_id (str): ID of the session.
+        points (int, optional): Maximum number of records. None returns all of them.
         data_dir (str): Directory containing data files.
         
     Returns:
-        list: List of session summaries.
+        list: Generation records.
+    """
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    key = ('records', session_dir, _generation_log_version(session_dir), points)
+    return _chart_cache.get_or_compute(
+        key, lambda: downsample_records(read_generation_log(session_dir), points))
+
+
+def get_generation_range(session_id, start=None, stop=None, limit=None, fields=None, data_dir='../data'):
     """
-    summary_file = os.path.join(data_dir, 'sessions.json')
+    Get the generation records of a session within a range of generations.
     
-    if os.path.exists(summary_file):
-        with open(summary_file, 'r') as f:
-            return json.load(f)
+    Args:
+        session_id (str): ID of the session.
+        start (int, optional): First generation (inclusive).
+        stop (int, optional): Last generation (inclusive).
+        limit (int, optional): Maximum number of records.
+        fields (list, optional): Fields to return.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        list: Generation records.
+    """
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    return read_generation_range(session_dir, start, stop, limit, fields)
+
+
+def get_phase_timings(session_id, start=None, stop=None, limit=None, data_dir='../data'):
+    """
+    Get the per-phase time breakdown of a session's generations.
     
-    return []
+    Args:
+        session_id (str): ID of the session.
+        start (int, optional): First generation (inclusive).
+        stop (int, optional): Last generation (inclusive).
+        limit (int, optional): Maximum number of records.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        list: Timing records (generation, generation_time and phases).
+    """
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    return read_generation_range(session_dir, start, stop, limit, name='phase_timings')
+
+
+def get_memory_reports(session_id, start=None, stop=None, limit=None, data_dir='../data'):
+    """
+    Get the per-generation memory reports of a session trained with memory profiling.
+    
+    Args:
+        session_id (str): ID of the session.
+        start (int, optional): First generation (inclusive).
+        stop (int, optional): Last generation (inclusive).
+        limit (int, optional): Maximum number of records.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        list: Memory reports (empty if the session was not profiled).
+    """
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    return read_generation_range(session_dir, start, stop, limit, name='memory_report')
+
+
+def get_dashboard_data(session_id=None, points=None, data_dir='../data'):
+    """
+    Get dashboard data with chart series downsampled to a number of points.
+    
+    Args:
+        session_id (str, optional): ID of the session. None uses the latest training data.
+        points (int, optional): Maximum number of points per chart series.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        dict: Dashboard data, or None if not available.
+    """
+    if session_id is None:
+        with _data_lock:
+            training_data = _latest_training_data
+        if training_data is None:
+            return None
+        data = dict(training_data.export_for_dashboard())
+        if points:
+            key = ('live', training_data.session_dir, data.get('version'), points)
+            data['charts'] = _chart_cache.get_or_compute(
+                key, lambda: downsample_charts(data['charts'], points))
+        return data
+    
+    data = load_training_session(session_id, data_dir)
+    if data is not None and points:
+        data['charts'] = charts_from_records(get_generation_series(session_id, points, data_dir))
+    return data
+
+
+def get_chart_cache_stats():
+    """
+    Get the hit/miss counters of the chart cache.
+    
+    Returns:
+        dict: Cache statistics.
+    """
+    return _chart_cache.stats()
+
+
+# Session catalogs opened by this process, keyed by data directory
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def get_session_catalog(data_dir='../data'):
+    """
+    Get the session catalog of a data directory, reusing an open one.
+    
+    Args:
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        SessionCatalog: The session catalog.
+    """
+    with _catalogs_lock:
+        catalog = _catalogs.get(data_dir)
+        if catalog is None:
+            catalog = _catalogs[data_dir] = SessionCatalog(data_dir)
+        return catalog
+
+
+def list_training_sessions(data_dir='../data', limit=None, offset=0, status=None, min_fitness=None,
+                           descending=False):
+    """
+    List training sessions.
+    
+    Args:
+        data_dir (str): Directory containing data files.
+        limit (int, optional): Maximum number of sessions to return.
+        offset (int): Number of sessions to skip.
+        status (str, optional): Only return sessions with this status
+            ('active', 'completed', 'stopped' or 'failed').
+        min_fitness (float, optional): Only return sessions with at least this best fitness.
+        descending (bool): Return the newest sessions first.
+        
+    Returns:
+        list: List of session summaries.
+    """
+    return get_session_catalog(data_dir).list(limit=limit, offset=offset, status=status,
+                                              min_fitness=min_fitness, descending=descending)
+
+
+def count_training_sessions(data_dir='../data', status=None, min_fitness=None):
+    """
+    Count training sessions matching the given filters.
+    
+    Args:
+        data_dir (str): Directory containing data files.
+        status (str, optional): Only count sessions with this status.
+        min_fitness (float, optional): Only count sessions with at least this best fitness.
+        
+    Returns:
+        int: Number of sessions.
+    """
+    return get_session_catalog(data_dir).count(status=status, min_fitness=min_fitness)
 
 
 def get_latest_data():
@@ -328,6 +2082,138 @@ def get_latest_data():
         return _latest_training_data.export_for_dashboard()
 
 
+def add_generation_listener(listener):
+    """
+    Register a function called with the generations recorded by every
+    TrainingData of this process (see TrainingData.add_listener).
+    
+    Args:
+        listener (callable): Function taking the generation event.
+    """
+    _generation_listeners.append(listener)
+
+def remove_generation_listener(listener):
+    """
+    Unregister a listener added with add_generation_listener.
+    
+    Args:
+        listener (callable): Registered function.
+    """
+    if listener in _generation_listeners:
+        _generation_listeners.remove(listener)
+
+def get_session_version(session_id, data_dir='../data'):
+    """
+    Get a stamp that changes whenever the stored data of a session changes.
+    
+    Built from the size and modification time of the session's dashboard
+    data and generation log, or of its archive.
+    
+    Args:
+        session_id (str): ID of the session.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        tuple: Version of the session, or None if the session does not exist.
+    """
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    if os.path.isdir(session_dir):
+        paths = [os.path.join(session_dir, name) for name in ('dashboard_data.json', 'generation_data.jsonl')]
+    elif os.path.exists(session_dir + '.zip'):
+        paths = [session_dir + '.zip']
+    else:
+        return None
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            version.extend((stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            version.extend((None, None))
+    return tuple(version)
+
+def get_generation_log_version(session_id, data_dir='../data'):
+    """
+    Get a cheap version stamp of a session's generation log (size and mtime).
+    
+    Args:
+        session_id (str): ID of the session.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        tuple: Version of the log, or None if the session has no log.
+    """
+    return _generation_log_version(os.path.join(data_dir, f'session_{session_id}'))
+
+def get_generation_events(session_id, since=None, data_dir='../data'):
+    """
+    Rebuild the generation events of a session from its logs.
+    
+    Used to replay the generations a subscriber missed, and to follow
+    sessions trained by another process.
+    
+    Args:
+        session_id (str): ID of the session.
+        since (int, optional): Only generations after this one.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        list: Events with the same layout as the listener events.
+    """
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    start = None if since is None else since + 1
+    records = read_generation_range(session_dir, start)
+    best_agents = {agent['generation']: agent
+                   for agent in read_generation_range(session_dir, start, name='best_agents')}
+    return [{
+        'session_id': session_id,
+        'record': record,
+        'best_agent': best_agents.get(record['generation'])
+    } for record in records]
+
+def get_persistence_metrics():
+    """
+    Get the persistence writer metrics of the latest training session.
+    
+    Returns:
+        dict: Persistence metrics, or None if no training data is available.
+    """
+    with _data_lock:
+        if _latest_training_data is None:
+            return None
+        training_data = _latest_training_data
+    return training_data.persistence_metrics()
+
+
+def get_session_snapshot(session_id, data_dir='../data'):
+    """
+    Get the serialised dashboard data of a session, as last written by its training process.
+    
+    Training runs in worker processes, so servers read the session's
+    ``dashboard_data.json``, which is replaced atomically once per
+    generation. The file is only read again when it changes.
+    
+    Args:
+        session_id (str): ID of the session.
+        data_dir (str): Directory containing data files.
+        
+    Returns:
+        tuple: (version, JSON text), or None if the session has no dashboard data.
+    """
+    path = os.path.join(data_dir, f'session_{session_id}', 'dashboard_data.json')
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    
+    def read():
+        with open(path, 'r') as f:
+            text = f.read()
+        return json.loads(text).get('version'), text
+    
+    return _snapshot_cache.get_or_compute((os.path.abspath(path), stat.st_size, stat.st_mtime_ns), read)
+
+
 def is_training_active(session_id=None, data_dir='../data'):
     """
     Check if a training session is active.
@@ -346,6 +2232,11 @@ def is_training_active(session_id=None, data_dir='../data'):
                 return False
             session_id = _latest_training_data.session_id
     
+    active = get_session_catalog(data_dir).is_active(session_id)
+    if active is not None:
+        return active
+    
+    # Sessions missing from the catalog fall back to their status file
     session_dir = os.path.join(data_dir, f'session_{session_id}')
     status_file = os.path.join(session_dir, 'status.json')
     
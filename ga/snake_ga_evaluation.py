@@ -0,0 +1,125 @@
+"""
+Snake Game Genetic Algorithm Parallel Evaluation
+
+This module evaluates the agents of a population on a pool of processes.
+Agents are sent to the pool, play their games there and only their fitness
+results (and the replay of their best game) come back.
+
+The pool is sized for the job's worker budget, but the number of agents
+evaluated at the same time can be lowered at any generation (its share), so
+a scheduler can divide the CPUs of the host between concurrent jobs without
+restarting their pools.
+
+Phase timings measured in the pool processes are sent back with the results,
+so they add up the time of every process (and may exceed the wall time).
+"""
+
+import multiprocessing
+import sys
+import threading
+
+from .snake_ga_timing import PhaseTimers
+from .snake_simulator import SnakeGameSimulator
+
+# Agent attributes computed by an evaluation
+RESULT_FIELDS = ('fitness', 'food_eaten', 'moves_made', 'survival_time', 'steps_taken', 'replay')
+
+# Simulators of an evaluation process, one per simulator settings
+_simulators = {}
+
+
+def _init_process(redirect_stdout):
+    # Keep the parent's protocol stream clean: its stdout may carry IPC messages
+    if redirect_stdout:
+        sys.stdout = sys.stderr
+
+
+def _evaluate_agent(agent, settings, max_steps, games, timed=False):
+    """Play the games of an agent in a pool process and return its results and phase timings."""
+    from .snake_ga_training import train_agent
+
+    simulator = _simulators.get(settings)
+    if simulator is None:
+        grid_size, initial_energy, energy_per_step, energy_per_food = settings
+        simulator = _simulators[settings] = SnakeGameSimulator(
+            grid_size=grid_size,
+            initial_energy=initial_energy,
+            energy_per_step=energy_per_step,
+            energy_per_food=energy_per_food
+        )
+    timers = simulator.timers = PhaseTimers() if timed else None
+    train_agent(agent, simulator, max_steps, games, timers)
+    return tuple(getattr(agent, field) for field in RESULT_FIELDS), timers.collect() if timed else None
+
+
+class EvaluationPool:
+    """
+    Pool of processes evaluating agents in parallel.
+    """
+
+    def __init__(self, processes):
+        """
+        Start the pool.
+
+        Args:
+            processes (int): Number of processes (the job's worker budget).
+        """
+        self.processes = max(1, int(processes))
+        # Agents of the running evaluation not evaluated yet (waiting for a process or being evaluated)
+        self.queue_depth = 0
+        self._depth_lock = threading.Lock()
+        context = multiprocessing.get_context('spawn')
+        self.pool = context.Pool(self.processes, initializer=_init_process,
+                                 initargs=(sys.stdout is not sys.__stdout__,))
+
+    def evaluate(self, agents, simulator, max_steps, games, workers=None, timers=None):
+        """
+        Evaluate agents, updating their fitness results in place.
+
+        Args:
+            agents (list): Agents to evaluate.
+            simulator (SnakeGameSimulator): Simulator whose settings the games use.
+            max_steps (int): Maximum steps per game.
+            games (int): Number of games per agent.
+            workers (int, optional): Maximum agents evaluated at the same time
+                (the job's current share). Defaults to the size of the pool.
+            timers (PhaseTimers, optional): Receives the phase timings of the pool processes.
+
+        Returns:
+            list: The agents.
+        """
+        workers = min(self.processes, max(1, int(workers or self.processes)))
+        settings = (simulator.grid_size, simulator.initial_energy,
+                    simulator.energy_per_step, simulator.energy_per_food)
+        slots = threading.Semaphore(workers)
+
+        def release(_):
+            slots.release()
+            with self._depth_lock:
+                self.queue_depth -= 1
+
+        with self._depth_lock:
+            self.queue_depth += len(agents)
+        pending = []
+        for agent in agents:
+            slots.acquire()
+            pending.append(self.pool.apply_async(_evaluate_agent,
+                                                 (agent, settings, max_steps, games, timers is not None),
+                                                 callback=release, error_callback=release))
+        for agent, result in zip(agents, pending):
+            values, timings = result.get()
+            for field, value in zip(RESULT_FIELDS, values):
+                setattr(agent, field, value)
+            if timings:
+                timers.merge(timings)
+        return agents
+
+    def close(self):
+        """Stop the pool processes."""
+        self.pool.close()
+        self.pool.join()
+
+    def terminate(self):
+        """Kill the pool processes without waiting for running evaluations."""
+        self.pool.terminate()
+        self.pool.join()
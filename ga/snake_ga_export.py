@@ -0,0 +1,250 @@
+"""
+Snake Game Genetic Algorithm Session Export
+
+This module streams the data of a training session in formats suited for
+analysis tools (pandas, numpy). Exports are produced by generators that read
+the on-disk logs a chunk at a time. Text exports use constant memory; the
+npz export gathers its columns in one pass over the log as packed arrays
+(8 bytes per value) and copies the weights a block of rows at a time.
+
+Formats:
+    jsonl: one generation record per line (the raw generation log).
+    csv:   one generation record per row.
+    npz:   one array per numeric generation field, plus the best agent
+           weights and their index when the session has a weight archive.
+"""
+
+import csv
+import io
+import json
+import math
+import os
+import zipfile
+import zlib
+from array import array
+
+import numpy as np
+
+from .snake_ga_data import SessionStore, WeightArchive, read_generation_log
+
+EXPORT_FORMATS = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'npz': 'application/octet-stream'
+}
+
+# Size of the chunks read from disk and yielded to the client
+CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkBuffer:
+    """Write-only, non-seekable file object collecting bytes for a generator."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Return and clear the collected bytes."""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _iter_log_lines(store, name='generation_data'):
+    """Yield the raw lines of a session's JSON Lines log, skipping a truncated last line."""
+    with store.open(f'{name}.jsonl', binary=True) as f:
+        for line in f:
+            if line.endswith(b'\n'):
+                yield line
+
+
+def _iter_records(session_dir, name='generation_data'):
+    """Yield the generation records of a session one at a time."""
+    with SessionStore(session_dir) as store:
+        if store.exists(f'{name}.jsonl'):
+            for line in _iter_log_lines(store, name):
+                yield json.loads(line)
+            return
+    # Legacy sessions only have the full JSON document
+    yield from read_generation_log(session_dir, name)
+
+
+def iter_jsonl(session_dir):
+    """
+    Stream the generation records of a session as JSON Lines.
+
+    Args:
+        session_dir (str): Session directory.
+
+    Yields:
+        bytes: Chunks of the export.
+    """
+    with SessionStore(session_dir) as store:
+        if store.exists('generation_data.jsonl'):
+            with store.open('generation_data.jsonl', binary=True) as f:
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+
+    for record in _iter_records(session_dir):
+        yield (json.dumps(record) + '\n').encode('utf-8')
+
+
+def iter_csv(session_dir):
+    """
+    Stream the generation records of a session as CSV.
+
+    Args:
+        session_dir (str): Session directory.
+
+    Yields:
+        bytes: Chunks of the export.
+    """
+    buffer = io.StringIO()
+    writer = None
+    for record in _iter_records(session_dir):
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(record.keys()), extrasaction='ignore')
+            writer.writeheader()
+        writer.writerow(record)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _npy_header(shape, dtype):
+    """Build the header of a .npy file for an array of the given shape and dtype."""
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(header, {
+        'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        'fortran_order': False,
+        'shape': shape
+    })
+    return header.getvalue()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _read_columns(session_dir):
+    """
+    Read the numeric generation fields of a session in a single pass over its log.
+
+    The fields are those with a numeric value in the first record. A missing
+    or null value becomes NaN (-1 for the generation number, as in the log
+    index), so every column has one value per record read.
+
+    Args:
+        session_dir (str): Session directory.
+
+    Returns:
+        dict: Field name to array of values.
+    """
+    columns = None
+    for record in _iter_records(session_dir):
+        if columns is None:
+            columns = {key: array('q' if key == 'generation' else 'd')
+                       for key, value in record.items() if _is_number(value)}
+        for field, column in columns.items():
+            value = record.get(field)
+            if field == 'generation':
+                column.append(int(value) if _is_number(value) else -1)
+            else:
+                column.append(value if _is_number(value) else math.nan)
+    return {field: np.frombuffer(column, dtype=np.int64 if field == 'generation' else np.float64)
+            for field, column in (columns or {}).items()}
+
+
+def _iter_npy_member(archive, buffer, name, values):
+    """Write an array as a .npy member a block of rows at a time, yielding the output."""
+    with archive.open(name, 'w', force_zip64=True) as member:
+        member.write(_npy_header(values.shape, values.dtype))
+        rows = max(1, CHUNK_SIZE // max(1, values[:1].nbytes))
+        for start in range(0, len(values), rows):
+            member.write(np.ascontiguousarray(values[start:start + rows]).tobytes())
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def iter_npz(session_dir):
+    """
+    Stream a session as a ``.npz`` archive of numpy arrays.
+
+    Each numeric generation field becomes an array with one value per
+    generation record (NaN where a record lacks the field). Best agent
+    weights are copied from the memory-mapped weight archive a block of rows
+    at a time.
+
+    Args:
+        session_dir (str): Session directory.
+
+    Yields:
+        bytes: Chunks of the export.
+    """
+    columns = _read_columns(session_dir)
+
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for field, values in columns.items():
+            yield from _iter_npy_member(archive, buffer, f'{field}.npy', values)
+
+        weight_archive = WeightArchive(session_dir)
+        if weight_archive.index is not None:
+            used = weight_archive.count
+            yield from _iter_npy_member(archive, buffer, 'best_weights_index.npy', weight_archive.index[:used])
+            yield from _iter_npy_member(archive, buffer, 'best_weights.npy', weight_archive.weights[:used])
+    yield buffer.drain()
+
+
+def gzip_chunks(chunks, level=6):
+    """
+    Gzip-compress a stream of byte chunks.
+
+    Args:
+        chunks (iterable): Byte chunks.
+        level (int): Compression level.
+
+    Yields:
+        bytes: Gzip stream chunks.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_session_export(session_id, export_format, data_dir='../data'):
+    """
+    Stream the export of a training session.
+
+    Args:
+        session_id (str): ID of the session.
+        export_format (str): One of EXPORT_FORMATS.
+        data_dir (str): Directory containing data files.
+
+    Returns:
+        generator: Byte chunks of the export.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    session_dir = os.path.join(data_dir, f'session_{session_id}')
+    with SessionStore(session_dir) as store:
+        if not store.found():
+            raise FileNotFoundError(f"Session {session_id} not found")
+    exporters = {'jsonl': iter_jsonl, 'csv': iter_csv, 'npz': iter_npz}
+    return exporters[export_format](session_dir)
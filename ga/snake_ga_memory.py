@@ -0,0 +1,185 @@
+"""
+Snake Game Genetic Algorithm Memory Accounting
+
+This module tracks the memory allocated by a training session with
+``tracemalloc``. A snapshot is taken at every generation boundary and its
+allocations are attributed to the module that made them: the innermost
+frame of each allocation that belongs to the ``ga`` package (e.g.
+``snake_ga_data``, ``snake_agent``, ``snake_nn``, ``snake_simulator``),
+else ``numpy`` or ``other``. NumPy arrays created by the network are thus
+counted in ``snake_nn``, not in NumPy.
+
+Each report holds the memory traced per module, its growth since the
+previous generation and the source lines that grew the most. A warning is
+printed when a generation grows by more than a threshold.
+
+tracemalloc slows allocations down noticeably, so the mode is off by
+default. Only the training process is traced: games played by an
+evaluation pool allocate in the pool processes.
+"""
+
+import os
+import tracemalloc
+
+# Frames stored per allocation, enough to reach the ga module behind NumPy calls
+DEFAULT_TRACE_FRAMES = 16
+# Growth in a single generation that triggers a warning
+DEFAULT_GROWTH_THRESHOLD = 50 * 1024 * 1024
+# Source lines with the largest growth listed in each report
+TOP_LINES = 10
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    # The tracker's own bookkeeping
+    tracemalloc.Filter(False, __file__, all_frames=True),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>')
+)
+
+
+def _module_of(filename):
+    """Group of a source file: the ga module name, numpy or other."""
+    if os.path.dirname(os.path.abspath(filename)) == _PACKAGE_DIR:
+        return os.path.splitext(os.path.basename(filename))[0]
+    if f'{os.sep}numpy{os.sep}' in filename:
+        return 'numpy'
+    return None
+
+
+def _attribute(traceback):
+    """Module of an allocation: its innermost ga frame, else numpy or other."""
+    module = 'other'
+    # Tracebacks are ordered from the oldest frame: walk them from the innermost one
+    for frame in reversed(traceback):
+        group = _module_of(frame.filename)
+        if group is not None and group != 'numpy':
+            return group
+        if group == 'numpy':
+            module = 'numpy'
+    return module
+
+
+def _display_path(filename):
+    root = os.path.dirname(_PACKAGE_DIR)
+    return os.path.relpath(filename, root) if filename.startswith(root) else filename
+
+
+class MemoryTracker:
+    """
+    Takes tracemalloc snapshots at generation boundaries and reports the
+    growth per module.
+    """
+
+    def __init__(self, threshold=DEFAULT_GROWTH_THRESHOLD, frames=DEFAULT_TRACE_FRAMES):
+        """
+        Start tracing allocations (if tracemalloc is not already tracing).
+
+        Args:
+            threshold (int): Growth in bytes over one generation that triggers a warning.
+            frames (int): Frames stored per allocation.
+        """
+        self.threshold = threshold
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start(frames)
+        self._modules = {}
+        self._lines = {}
+        self._traced = 0
+        self._attribution = {}
+
+    def mark(self):
+        """Take the reference snapshot the first generation is compared to."""
+        self._snapshot_counts()
+
+    def _snapshot_counts(self):
+        """
+        Take a snapshot and count its bytes and blocks per module and its bytes per line.
+
+        Returns:
+            tuple: The counts of the previous snapshot (per module, per line).
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        modules = {}
+        # Tracebacks repeat across snapshots: reuse their module, keeping only the live ones
+        attribution = {}
+        for stat in snapshot.statistics('traceback'):
+            module = self._attribution.get(stat.traceback) or _attribute(stat.traceback)
+            attribution[stat.traceback] = module
+            entry = modules.setdefault(module, [0, 0])
+            entry[0] += stat.size
+            entry[1] += stat.count
+        lines = {(stat.traceback[0].filename, stat.traceback[0].lineno): stat.size
+                 for stat in snapshot.statistics('lineno')}
+
+        previous_modules, previous_lines = self._modules, self._lines
+        self._modules, self._lines, self._attribution = modules, lines, attribution
+        self._traced = sum(size for size, _ in modules.values())
+        return previous_modules, previous_lines
+
+    def snapshot(self, generation):
+        """
+        Take the snapshot of a generation boundary and build its report.
+
+        Args:
+            generation (int): Completed generation.
+
+        Returns:
+            dict: Memory report of the generation.
+        """
+        previous_traced = self._traced
+        previous_modules, previous_lines = self._snapshot_counts()
+        current, peak = tracemalloc.get_traced_memory()
+
+        counts = dict({module: (0, 0) for module in previous_modules}, **self._modules)
+        modules = {
+            module: {
+                'bytes': size,
+                'blocks': blocks,
+                'growth': size - previous_modules.get(module, (0, 0))[0]
+            }
+            for module, (size, blocks) in sorted(counts.items(), key=lambda item: -item[1][0])
+        }
+        line_growth = sorted(
+            ((size - previous_lines.get(line, 0), line) for line, size in self._lines.items()),
+            reverse=True)[:TOP_LINES]
+        growth = self._traced - previous_traced
+
+        report = {
+            'generation': generation,
+            'traced_bytes': self._traced,
+            'growth_bytes': growth,
+            'current_bytes': current,
+            'peak_bytes': peak,
+            'tracemalloc_bytes': tracemalloc.get_tracemalloc_memory(),
+            'modules': modules,
+            'top_growth': [{'file': _display_path(filename), 'line': lineno, 'growth': size}
+                           for size, (filename, lineno) in line_growth if size > 0],
+            'warning': growth > self.threshold
+        }
+        tracemalloc.reset_peak()
+        return report
+
+    def stop(self):
+        """Stop tracing, if this tracker started it."""
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._attribution.clear()
+
+
+def format_growth(report, modules=3):
+    """
+    Describe the growth of a report in one line.
+
+    Args:
+        report (dict): Memory report.
+        modules (int): Number of modules listed.
+
+    Returns:
+        str: Summary of the growth and the modules that grew the most.
+    """
+    growing = sorted(report['modules'].items(), key=lambda item: -item[1]['growth'])[:modules]
+    parts = ', '.join(f"{module} {entry['growth'] / 1024 / 1024:+.1f} MB" for module, entry in growing)
+    return (f"memory {report['traced_bytes'] / 1024 / 1024:.1f} MB "
+            f"({report['growth_bytes'] / 1024 / 1024:+.1f} MB: {parts})")
@@ -0,0 +1,189 @@
+"""
+Snake Game Genetic Algorithm Profiling
+
+This module profiles a number of training generations on demand. A capture
+is requested (from the command line or by a ``profile`` command sent to a
+running job) and starts with the next generation. While it runs:
+
+- ``cProfile`` records every call of the training thread, saved as a
+  ``.pstats`` file (open it with ``pstats`` or snakeviz);
+- a sampling thread records the training thread's stack every few
+  milliseconds, saved as collapsed stacks (``frame;frame;frame count`` per
+  line), the input of flamegraph.pl, speedscope and inferno.
+
+Both files are written to ``profiles/`` in the session directory. Only the
+training thread is profiled: with an evaluation pool, the games run in the
+pool processes and show up as time waiting for their results.
+
+Nothing is installed while no capture is requested; the training loop
+only checks a flag per generation.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+
+# Seconds between two stack samples
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread at a fixed interval and counts the
+    collapsed stacks.
+    """
+
+    def __init__(self, thread_id, interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        Args:
+            thread_id (int): Identifier of the sampled thread.
+            interval (float): Seconds between two samples.
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling on a background thread."""
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        labels = {}
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = (f'{code.co_name} '
+                                            f'({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+                self.samples += 1
+
+    def write_collapsed(self, path):
+        """
+        Write the collapsed stacks, one ``stack count`` line each.
+
+        Args:
+            path (str): Destination file.
+        """
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class GenerationProfiler:
+    """
+    Profiles the next N generations of a training session when requested.
+
+    The training loop calls begin_generation and end_generation around every
+    generation; both return immediately while no capture is requested.
+    """
+
+    def __init__(self, session_dir, interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        Args:
+            session_dir (str): Session directory; files go to its ``profiles`` directory.
+            interval (float): Seconds between two stack samples.
+        """
+        self.session_dir = session_dir
+        self.interval = interval
+        self.requested = 0
+        self.active = False
+        self._remaining = 0
+        self._first_generation = None
+        self._profile = None
+        self._sampler = None
+
+    def request(self, generations):
+        """
+        Profile the next generations (a capture in progress is extended).
+
+        Args:
+            generations (int): Number of generations to profile.
+        """
+        generations = max(0, int(generations))
+        if self.active:
+            self._remaining += generations
+        else:
+            self.requested = generations
+
+    def begin_generation(self, generation):
+        """Start the requested capture at the start of a generation."""
+        if not self.requested or self.active:
+            return
+        self._remaining = self.requested
+        self.requested = 0
+        self._first_generation = generation
+        self._sampler = StackSampler(threading.get_ident(), self.interval)
+        self._sampler.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        self.active = True
+
+    def end_generation(self, generation):
+        """
+        Count a profiled generation and save the capture after the last one.
+
+        Returns:
+            dict: Paths of the saved files and the captured generations, or
+            None if no capture ended.
+        """
+        if not self.active:
+            return None
+        self._remaining -= 1
+        if self._remaining > 0:
+            return None
+        return self.stop(generation)
+
+    def stop(self, generation):
+        """
+        End the capture in progress and save its files.
+
+        Args:
+            generation (int): Last profiled generation.
+
+        Returns:
+            dict: Paths of the saved files and the captured generations, or
+            None if no capture is running.
+        """
+        if not self.active:
+            return None
+        self._profile.disable()
+        self._sampler.stop()
+        self.active = False
+
+        profiles_dir = os.path.join(self.session_dir, 'profiles')
+        os.makedirs(profiles_dir, exist_ok=True)
+        name = f'generations_{self._first_generation}-{generation}'
+        pstats_path = os.path.join(profiles_dir, f'{name}.pstats')
+        collapsed_path = os.path.join(profiles_dir, f'{name}.collapsed')
+        self._profile.dump_stats(pstats_path)
+        self._sampler.write_collapsed(collapsed_path)
+
+        capture = {
+            'first_generation': self._first_generation,
+            'last_generation': generation,
+            'samples': self._sampler.samples,
+            'pstats': pstats_path,
+            'collapsed': collapsed_path
+        }
+        self._profile = None
+        self._sampler = None
+        return capture
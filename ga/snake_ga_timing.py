@@ -0,0 +1,77 @@
+"""
+Snake Game Genetic Algorithm Phase Timing
+
+This module accumulates the time spent and the number of calls in each phase
+of a training generation (get_state, calculate_vision, decide_action, step,
+evolve, record_generation, disk writes, ...). Hot loops measure with
+``time.perf_counter`` into local variables and add their totals once per
+game, so the instrumentation stays cheap enough to leave on.
+
+Phases may be nested: ``get_state`` includes ``calculate_vision`` and
+``evolve`` includes the ``evolve.*`` phases. ``disk`` is measured on the
+persistence writer thread, so writes queued late in a generation may be
+counted in the next one.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+clock = time.perf_counter
+
+
+class PhaseTimers:
+    """
+    Time and call counts per phase, collected once per generation.
+
+    ``add`` may be called from several threads (e.g. the persistence writer).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seconds = {}
+        self._calls = {}
+
+    def add(self, phase, seconds, calls=1):
+        """
+        Add time to a phase.
+
+        Args:
+            phase (str): Name of the phase.
+            seconds (float): Time spent.
+            calls (int): Number of calls the time covers.
+        """
+        with self._lock:
+            self._seconds[phase] = self._seconds.get(phase, 0.0) + seconds
+            self._calls[phase] = self._calls.get(phase, 0) + calls
+
+    @contextmanager
+    def phase(self, phase):
+        """Time a block of code as one call of a phase."""
+        start = clock()
+        try:
+            yield
+        finally:
+            self.add(phase, clock() - start)
+
+    def merge(self, timings):
+        """
+        Add timings collected elsewhere (e.g. in an evaluation process).
+
+        Args:
+            timings (dict): Timings as returned by collect.
+        """
+        for phase, entry in timings.items():
+            self.add(phase, entry['seconds'], entry['calls'])
+
+    def collect(self):
+        """
+        Return the timings accumulated since the last call and start over.
+
+        Returns:
+            dict: ``{phase: {'seconds': float, 'calls': int}}``.
+        """
+        with self._lock:
+            seconds, calls = self._seconds, self._calls
+            self._seconds, self._calls = {}, {}
+        return {phase: {'seconds': seconds[phase], 'calls': calls[phase]} for phase in seconds}
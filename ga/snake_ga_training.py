@@ -11,9 +11,19 @@ import os
 import time
 import json
 import argparse
+import threading
+import traceback
 import numpy as np
 from .snake_ga import GeneticAlgorithm, Agent, NeuralNetwork
 from .snake_ga_data import TrainingData
+from .snake_simulator import SnakeGameSimulator, DEFAULT_INITIAL_ENERGY, DEFAULT_GRID_SIZE
+from .snake_replay import GameRecorder, DIRECTION_NAMES
+from .snake_ipc import TrainingControl
+from .snake_ga_evaluation import EvaluationPool
+from .snake_ga_timing import PhaseTimers, clock
+from .snake_ga_profiling import GenerationProfiler
+from .snake_ga_memory import MemoryTracker, format_growth
+from . import snake_metrics
 
 # Constants
 DEFAULT_POPULATION_SIZE = 100
@@ -23,253 +33,13 @@ DEFAULT_CROSSOVER_RATE = 0.7
 DEFAULT_ELITISM = 0.1
 DEFAULT_GAMES_PER_AGENT = 3
 DEFAULT_MAX_STEPS = 1000
-DEFAULT_INITIAL_ENERGY = 100
-DEFAULT_GRID_SIZE = 25
+DEFAULT_WORKERS = 1
+# Growth in MB over one generation reported by the memory profiling mode
+DEFAULT_MEMORY_THRESHOLD = 50
+# Seconds between two reports of the evaluation and persistence queue depths to the parent
+QUEUE_REPORT_INTERVAL = 1.0
 
-class SnakeGameSimulator:
-    """
-    Simulator for the Snake game.
-    This class simulates the Snake game for training the genetic algorithm.
-    """
-    
-    def __init__(self, grid_size=DEFAULT_GRID_SIZE, initial_energy=DEFAULT_INITIAL_ENERGY):
-        """
-        Initialize the simulator.
-        
-        Args:
-            grid_size (int): Size of the grid.
-            initial_energy (int): Initial energy of the snake.
-        """
-        self.grid_size = grid_size
-        self.initial_energy = initial_energy
-        self.reset()
-    
-    def reset(self):
-        """Reset the game state."""
-        # Initialize snake at the center of the grid
-        self.snake = []
-        center = self.grid_size // 2
-        for i in range(3):
-            self.snake.append({'x': center - i, 'y': center})
-        
-        # Initialize direction
-        self.direction = {'x': 1, 'y': 0}  # Moving right
-        
-        # Initialize food
-        self.generate_food()
-        
-        # Initialize game state
-        self.score = 0
-        self.steps = 0
-        self.energy = self.initial_energy
-        self.game_over = False
-    
-    def generate_food(self):
-        """Generate food at a random position."""
-        while True:
-            food_x = np.random.randint(0, self.grid_size)
-            food_y = np.random.randint(0, self.grid_size)
-            
-            # Check if food is on snake
-            on_snake = False
-            for segment in self.snake:
-                if segment['x'] == food_x and segment['y'] == food_y:
-                    on_snake = True
-                    break
-            
-            if not on_snake:
-                self.food = {'x': food_x, 'y': food_y}
-                break
-    
-    def get_state(self):
-        """
-        Get the current state of the game.
-        
-        Returns:
-            dict: Game state.
-        """
-        head = self.snake[0]
-        
-        # Calculate vision in 8 directions
-        vision = self.calculate_vision()
-        
-        # Calculate food direction and distance
-        food_dx = self.food['x'] - head['x']
-        food_dy = self.food['y'] - head['y']
-        food_distance = np.sqrt(food_dx**2 + food_dy**2)
-        food_angle = np.arctan2(food_dy, food_dx)
-        
-        # Check danger in each direction
-        danger = {
-            'up': self.check_collision({'x': head['x'], 'y': head['y'] - 1}),
-            'down': self.check_collision({'x': head['x'], 'y': head['y'] + 1}),
-            'left': self.check_collision({'x': head['x'] - 1, 'y': head['y']}),
-            'right': self.check_collision({'x': head['x'] + 1, 'y': head['y']})
-        }
-        
-        # Create state dictionary
-        state = {
-            'snake': self.snake.copy(),
-            'food': self.food.copy(),
-            'direction': self.direction.copy(),
-            'energy': self.energy,
-            'score': self.score,
-            'sensors': {
-                'vision': vision,
-                'foodDistance': {
-                    'x': food_dx,
-                    'y': food_dy,
-                    'euclidean': food_distance
-                },
-                'foodAngle': food_angle,
-                'danger': danger
-            }
-        }
-        
-        return state
-    
-    def calculate_vision(self):
-        """
-        Calculate vision in 8 directions.
-        
-        Returns:
-            list: Vision data for 8 directions.
-        """
-        head = self.snake[0]
-        directions = [
-            {'x': 0, 'y': -1},  # Up
-            {'x': 1, 'y': -1},  # Up-Right
-            {'x': 1, 'y': 0},   # Right
-            {'x': 1, 'y': 1},   # Down-Right
-            {'x': 0, 'y': 1},   # Down
-            {'x': -1, 'y': 1},  # Down-Left
-            {'x': -1, 'y': 0},  # Left
-            {'x': -1, 'y': -1}  # Up-Left
-        ]
-        
-        vision = []
-        
-        for direction in directions:
-            x, y = head['x'], head['y']
-            distance = 0
-            found_food = False
-            
-            while True:
-                x += direction['x']
-                y += direction['y']
-                distance += 1
-                
-                # Check if out of bounds
-                if x < 0 or x >= self.grid_size or y < 0 or y >= self.grid_size:
-                    break
-                
-                # Check if hit snake
-                hit_snake = False
-                for segment in self.snake:
-                    if segment['x'] == x and segment['y'] == y:
-                        hit_snake = True
-                        break
-                
-                if hit_snake:
-                    break
-                
-                # Check if found food
-                if self.food['x'] == x and self.food['y'] == y:
-                    found_food = True
-            
-            vision.append({
-                'distance': distance,
-                'foundFood': found_food
-            })
-        
-        return vision
-    
-    def check_collision(self, position):
-        """
-        Check if a position collides with walls or snake body.
-        
-        Args:
-            position (dict): Position to check.
-            
-        Returns:
-            bool: True if collision, False otherwise.
-        """
-        # Check wall collision
-        if (position['x'] < 0 or position['x'] >= self.grid_size or
-                position['y'] < 0 or position['y'] >= self.grid_size):
-            return True
-        
-        # Check self collision (skip the tail as it will move)
-        for i in range(len(self.snake) - 1):
-            if position['x'] == self.snake[i]['x'] and position['y'] == self.snake[i]['y']:
-                return True
-        
-        return False
-    
-    def apply_action(self, action):
-        """
-        Apply an action to the snake.
-        
-        Args:
-            action (str): Action to apply ('up', 'down', 'left', 'right').
-        """
-        # Convert action to direction
-        if action == 'up' and self.direction['y'] != 1:
-            self.direction = {'x': 0, 'y': -1}
-        elif action == 'down' and self.direction['y'] != -1:
-            self.direction = {'x': 0, 'y': 1}
-        elif action == 'left' and self.direction['x'] != 1:
-            self.direction = {'x': -1, 'y': 0}
-        elif action == 'right' and self.direction['x'] != -1:
-            self.direction = {'x': 1, 'y': 0}
-    
-    def step(self):
-        """
-        Advance the game by one step.
-        
-        Returns:
-            bool: True if game over, False otherwise.
-        """
-        if self.game_over:
-            return True
-        
-        # Calculate new head position
-        head = self.snake[0]
-        new_head = {
-            'x': head['x'] + self.direction['x'],
-            'y': head['y'] + self.direction['y']
-        }
-        
-        # Check for collisions
-        if self.check_collision(new_head):
-            self.game_over = True
-            return True
-        
-        # Add new head
-        self.snake.insert(0, new_head)
-        
-        # Check if snake ate food
-        if new_head['x'] == self.food['x'] and new_head['y'] == self.food['y']:
-            self.score += 1
-            self.energy += 50  # Energy boost from food
-            self.generate_food()
-        else:
-            # Remove tail if no food was eaten
-            self.snake.pop()
-            
-            # Decrease energy
-            self.energy -= 1
-            if self.energy <= 0:
-                self.game_over = True
-                return True
-        
-        # Increment steps
-        self.steps += 1
-        
-        return False
-
-
-def train_agent(agent, simulator, max_steps=DEFAULT_MAX_STEPS, games=DEFAULT_GAMES_PER_AGENT):
+def train_agent(agent, simulator, max_steps=DEFAULT_MAX_STEPS, games=DEFAULT_GAMES_PER_AGENT, timers=None):
     """
     Train an agent by simulating multiple games.
     
@@ -278,33 +48,50 @@ def train_agent(agent, simulator, max_steps=DEFAULT_MAX_STEPS, games=DEFAULT_GAM
         simulator (SnakeGameSimulator): Game simulator.
         max_steps (int): Maximum steps per game.
         games (int): Number of games to simulate.
+        timers (PhaseTimers, optional): Receives the time spent in get_state,
+            decide_action and step.
         
     Returns:
-        Agent: Trained agent with updated fitness.
+        Agent: Trained agent with updated fitness. The replay of its best game
+        is stored in ``agent.replay``.
     """
     total_food = 0
     total_steps = 0
     total_energy = 0
+    recorder = GameRecorder(simulator)
+    best_replay = None
+    state_time = decide_time = step_time = 0.0
+    steps = 0
     
     for game_index in range(games):
-        # Reset simulator and agent
-        simulator.reset()
+        # Reset simulator (with a recorded seed) and agent
+        recorder.start()
         agent.reset()
         
         # Play game
         for _ in range(max_steps):
             # Get state
+            start = clock()
             state = simulator.get_state()
             
             # Get action from agent
-            action = agent.get_action(state)
+            decided = clock()
+            action = DIRECTION_NAMES[agent.decide_action(state)]
             
             # Apply action
+            stepped = clock()
             simulator.apply_action(action)
+            recorder.record()
             
             # Step simulator
             game_over = simulator.step()
             
+            end = clock()
+            state_time += decided - start
+            decide_time += stepped - decided
+            step_time += end - stepped
+            steps += 1
+            
             if game_over:
                 break
         
@@ -313,6 +100,14 @@ def train_agent(agent, simulator, max_steps=DEFAULT_MAX_STEPS, games=DEFAULT_GAM
         total_food += simulator.score
         total_steps += simulator.steps
         total_energy += simulator.energy
+        
+        # Keep the replay of the agent's best game
+        if best_replay is None or simulator.score > best_replay.metadata['score']:
+            best_replay = recorder.finish({
+                'agent_id': agent.id,
+                'score': simulator.score,
+                'steps': simulator.steps
+            })
     
     # Calculate average performance
     avg_food = total_food / games
@@ -321,11 +116,18 @@ def train_agent(agent, simulator, max_steps=DEFAULT_MAX_STEPS, games=DEFAULT_GAM
     
     # Update agent fitness
     agent.update_fitness(avg_food, avg_steps, avg_energy)
+    agent.replay = best_replay
+    
+    if timers is not None:
+        timers.add('get_state', state_time, steps)
+        timers.add('decide_action', decide_time, steps)
+        timers.add('step', step_time, steps)
     
     return agent
 
 
-def train_population(ga, simulator, max_steps=DEFAULT_MAX_STEPS, games=DEFAULT_GAMES_PER_AGENT):
+def train_population(ga, simulator, max_steps=DEFAULT_MAX_STEPS, games=DEFAULT_GAMES_PER_AGENT,
+                     pool=None, workers=None, timers=None):
     """
     Train all agents in the population.
     
@@ -334,12 +136,18 @@ def train_population(ga, simulator, max_steps=DEFAULT_MAX_STEPS, games=DEFAULT_G
         simulator (SnakeGameSimulator): Game simulator.
         max_steps (int): Maximum steps per game.
         games (int): Number of games to simulate.
+        pool (EvaluationPool, optional): Processes evaluating the agents in parallel.
+        workers (int, optional): Maximum agents evaluated at the same time on the pool.
+        timers (PhaseTimers, optional): Receives the time spent in each phase of the games.
         
     Returns:
         list: Trained population.
     """
+    if pool is not None:
+        return pool.evaluate(ga.population, simulator, max_steps, games, workers, timers)
+    
     for i, agent in enumerate(ga.population):
-        train_agent(agent, simulator, max_steps, games)
+        train_agent(agent, simulator, max_steps, games, timers)
         
         # Print progress
         if (i + 1) % 10 == 0:
@@ -348,43 +156,90 @@ def train_population(ga, simulator, max_steps=DEFAULT_MAX_STEPS, games=DEFAULT_G
     return ga.population
 
 
-def main():
-    """Main function for training the genetic algorithm."""
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(description='Train a genetic algorithm to play Snake')
-    parser.add_argument('--population', type=int, default=DEFAULT_POPULATION_SIZE,
-                        help='Population size')
-    parser.add_argument('--generations', type=int, default=DEFAULT_GENERATIONS,
-                        help='Number of generations')
-    parser.add_argument('--mutation', type=float, default=DEFAULT_MUTATION_RATE,
-                        help='Mutation rate')
-    parser.add_argument('--crossover', type=float, default=DEFAULT_CROSSOVER_RATE,
-                        help='Crossover rate')
-    parser.add_argument('--elitism', type=float, default=DEFAULT_ELITISM,
-                        help='Elitism rate')
-    parser.add_argument('--games', type=int, default=DEFAULT_GAMES_PER_AGENT,
-                        help='Games per agent')
-    parser.add_argument('--steps', type=int, default=DEFAULT_MAX_STEPS,
-                        help='Maximum steps per game')
-    parser.add_argument('--grid', type=int, default=DEFAULT_GRID_SIZE,
-                        help='Grid size')
-    parser.add_argument('--energy', type=int, default=DEFAULT_INITIAL_ENERGY,
-                        help='Initial energy')
-    parser.add_argument('--load', type=str, default=None,
-                        help='Load population from file')
-    parser.add_argument('--save', type=str, default=None,
-                        help='Save best agent to file')
+def report_queues(control, training_data, pool, stop, interval=QUEUE_REPORT_INTERVAL):
+    """
+    Send the depth of the job's evaluation and persistence queues to the parent until stopped.
     
-    args = parser.parse_args()
+    Args:
+        control (TrainingControl): Channel the ``queues`` events are sent on.
+        training_data (TrainingData): Training data whose writer queue is reported.
+        pool (EvaluationPool, optional): Evaluation pool (no evaluation queue without one).
+        stop (threading.Event): Set to stop reporting.
+        interval (float): Seconds between two reports.
+    """
+    while not stop.wait(interval):
+        control.emit('queues', evaluation=pool.queue_depth if pool is not None else 0,
+                     persistence=training_data.persistence_metrics()['queue_depth'])
+
+
+def checkpoint(training_data):
+    """
+    Save a checkpoint of the training data and wait for it to reach the disk.
+    
+    Args:
+        training_data (TrainingData): Training data manager.
+        
+    Returns:
+        str: Session directory holding the checkpoint.
+    """
+    training_data.save_training_data()
+    training_data.flush()
+    return training_data.session_dir
+
+
+# Default training configuration (same keys as the command line options)
+DEFAULT_CONFIG = {
+    'population': DEFAULT_POPULATION_SIZE,
+    'generations': DEFAULT_GENERATIONS,
+    'mutation': DEFAULT_MUTATION_RATE,
+    'crossover': DEFAULT_CROSSOVER_RATE,
+    'elitism': DEFAULT_ELITISM,
+    'games': DEFAULT_GAMES_PER_AGENT,
+    'steps': DEFAULT_MAX_STEPS,
+    'grid': DEFAULT_GRID_SIZE,
+    'energy': DEFAULT_INITIAL_ENERGY,
+    'workers': DEFAULT_WORKERS,
+    'profile': 0,
+    'memory_profile': False,
+    'memory_threshold': DEFAULT_MEMORY_THRESHOLD,
+    'load': None,
+    'save': None
+}
+
+
+def run_training(config, control=None):
+    """
+    Run a full training session.
+    
+    Args:
+        config (dict): Training configuration; missing keys take the values of DEFAULT_CONFIG.
+        control (TrainingControl, optional): Channel streaming events and applying
+            pause/resume/checkpoint/stop commands at generation boundaries.
+        
+    Returns:
+        TrainingData: Training data of the session.
+    """
+    args = argparse.Namespace(**dict(DEFAULT_CONFIG, **{k: v for k, v in config.items() if k in DEFAULT_CONFIG}))
     
     # Create data directory if it doesn't exist
     os.makedirs('../data', exist_ok=True)
     
+    # Optional tracemalloc snapshots at generation boundaries (slows training down);
+    # tracing starts here so the session's own data structures are traced
+    memory = MemoryTracker(int(args.memory_threshold * 1024 * 1024)) if args.memory_profile else None
+    
+    # Per-phase timers, collected and recorded once per generation
+    timers = PhaseTimers()
+    
     # Initialize training data manager
-    training_data = TrainingData()
+    training_data = TrainingData(config=vars(args), timers=timers)
+    if control:
+        training_data.add_listener(control.on_generation)
+        control.emit('started', session_id=training_data.session_id, pid=os.getpid(),
+                     generations=args.generations)
     
     # Initialize simulator
-    simulator = SnakeGameSimulator(args.grid, args.energy)
+    simulator = SnakeGameSimulator(args.grid, args.energy, timers=timers)
     
     # Initialize genetic algorithm
     ga = GeneticAlgorithm(
@@ -399,70 +254,149 @@ def main():
         print(f"Loading population from {args.load}")
         # TODO: Implement loading population
     
+    # Profiling capture of the next generations, requested by --profile or a 'profile' command
+    profiler = GenerationProfiler(training_data.session_dir)
+    if args.profile:
+        profiler.request(args.profile)
+    
+    def report_profile(capture):
+        if capture:
+            print(f"Saved profile of generations {capture['first_generation'] + 1}-"
+                  f"{capture['last_generation'] + 1} to {capture['pstats']}")
+            if control:
+                control.emit('profile', **capture)
+    
+    # Evaluation processes: the worker budget of the job; a scheduler may lower its share
+    pool = EvaluationPool(args.workers) if args.workers > 1 else None
+    
+    # Queue depths are read by the parent's /metrics while the job runs
+    queue_reporter_stop = threading.Event()
+    if control:
+        threading.Thread(target=report_queues, args=(control, training_data, pool, queue_reporter_stop),
+                         name='queue-reporter', daemon=True).start()
+    
     # Training loop
     print(f"Starting training with population size {args.population} for {args.generations} generations")
     print(f"Mutation rate: {args.mutation}, Crossover rate: {args.crossover}, Elitism: {args.elitism}")
     print(f"Games per agent: {args.games}, Max steps per game: {args.steps}")
     print(f"Grid size: {args.grid}, Initial energy: {args.energy}")
+    print(f"Evaluation workers: {args.workers}")
     
     start_time = time.time()
+    generation = -1
+    if memory is not None:
+        memory.mark()
     
-    for generation in range(args.generations):
-        gen_start_time = time.time()
-        
-        print(f"\nGeneration {generation + 1}/{args.generations}")
-        
-        # Train population
-        train_population(ga, simulator, args.steps, args.games)
-        
-        # Record data before evolution
-        ga.population.sort(key=lambda agent: agent.fitness, reverse=True)
-        best_agent = ga.population[0]
-        
-        print(f"Best fitness: {best_agent.fitness:.2f}")
-        print(f"Best food eaten: {best_agent.food_eaten:.2f}")
-        print(f"Best steps taken: {best_agent.steps_taken:.2f}")
-        
-        # Evolve population
-        result = ga.evolve()
+    try:
+        for generation in range(args.generations):
+            gen_start_time = time.time()
+            profiler.begin_generation(generation)
+            
+            print(f"\nGeneration {generation + 1}/{args.generations}")
+            
+            # Train population (at most `share` agents at a time on the evaluation pool)
+            workers = control.share if control and control.share else args.workers
+            with timers.phase('train_population'):
+                train_population(ga, simulator, args.steps, args.games, pool, workers, timers)
+            
+            # Record data before evolution
+            ga.population.sort(key=lambda agent: agent.fitness, reverse=True)
+            best_agent = ga.population[0]
+            
+            print(f"Best fitness: {best_agent.fitness:.2f}")
+            print(f"Best food eaten: {best_agent.food_eaten:.2f}")
+            print(f"Best steps taken: {best_agent.steps_taken:.2f}")
+            
+            # Save the best game of this generation if it beats the session's best match
+            training_data.save_best_match(best_agent.replay, best_agent.fitness, generation)
+            
+            # Record the evaluated generation before evolution replaces the population
+            with timers.phase('record_generation'):
+                diversity = ga.calculate_diversity()
+                training_data.record_generation(
+                    generation=generation,
+                    population=ga.population,
+                    best_fitness=best_agent.fitness,
+                    diversity=diversity
+                )
+            
+            # Evolve population
+            with timers.phase('evolve'):
+                result = ga.evolve(timers, diversity=diversity)
+            
+            # Save best agent periodically
+            if args.save and (generation + 1) % 10 == 0:
+                save_path = f"{args.save}_gen{generation + 1}.json"
+                ga.save_best_agent(save_path)
+                print(f"Saved best agent to {save_path}")
+            
+            # Print generation stats
+            gen_time = time.time() - gen_start_time
+            print(f"Generation time: {gen_time:.2f}s")
+            print(f"Diversity: {result['diversity']:.2f}")
+            
+            # Record the per-phase breakdown next to the generation data
+            timings = training_data.record_phase_timings(generation, timers.collect(), gen_time)
+            agent_games = len(ga.population) * args.games
+            snake_metrics.observe_generation(gen_time, timings['phases'], agent_games)
+            if control:
+                control.emit('timings', agent_games=agent_games, **timings)
+            report_profile(profiler.end_generation(generation))
+            
+            # Attribute the memory growth of the generation to modules
+            if memory is not None:
+                report = memory.snapshot(generation)
+                training_data.record_memory_report(report)
+                print(f"Memory: {format_growth(report)}")
+                if report['warning']:
+                    print(f"Warning: memory grew by {report['growth_bytes'] / 1024 / 1024:.1f} MB "
+                          f"in generation {generation + 1}")
+                    if control:
+                        growth = {module: entry['growth'] for module, entry in report['modules'].items()}
+                        control.emit('memory_warning', generation=generation, growth_bytes=report['growth_bytes'],
+                                     traced_bytes=report['traced_bytes'], modules=growth)
+            
+            # Save training data periodically
+            if (generation + 1) % 10 == 0:
+                training_data.save_training_data()
+                print("Saved training data")
+            
+            # Apply pause/resume/checkpoint/stop commands from the parent
+            if control and control.at_generation_boundary(generation, lambda: checkpoint(training_data),
+                                                          profiler.request):
+                print(f"Training stopped after generation {generation + 1}")
+                break
         
-        # Record generation data
-        training_data.record_generation(
-            generation=generation,
-            population=ga.population,
-            best_fitness=result['best_fitness'],
-            diversity=result['diversity']
-        )
+        # Save final training data
+        training_data.save_training_data()
         
-        # Save best agent periodically
-        if args.save and (generation + 1) % 10 == 0:
-            save_path = f"{args.save}_gen{generation + 1}.json"
+        # Save final best agent
+        if args.save:
+            save_path = f"{args.save}_final.json"
             ga.save_best_agent(save_path)
-            print(f"Saved best agent to {save_path}")
-        
-        # Print generation stats
-        gen_time = time.time() - gen_start_time
-        print(f"Generation time: {gen_time:.2f}s")
-        print(f"Diversity: {result['diversity']:.2f}")
-        
-        # Save training data periodically
-        if (generation + 1) % 10 == 0:
-            training_data.save_training_data()
-            print("Saved training data")
-    
-    # Save final training data
-    training_data.save_training_data()
-    
-    # Save final best agent
-    if args.save:
-        save_path = f"{args.save}_final.json"
-        ga.save_best_agent(save_path)
-        print(f"Saved final best agent to {save_path}")
+            print(f"Saved final best agent to {save_path}")
+    except BaseException:
+        # Stop the session's writer thread so a worker does not keep the session alive
+        training_data.close()
+        raise
+    finally:
+        queue_reporter_stop.set()
+        if pool is not None:
+            pool.close()
+        # Save a capture cut short by a stop or an error
+        report_profile(profiler.stop(generation))
+        if memory is not None:
+            memory.stop()
     
     # Save training session
     session_file = training_data.save_training_session()
     print(f"Saved training session to {session_file}")
     
+    if control:
+        control.emit('stopped' if control.stop_requested else 'finished',
+                     session_id=training_data.session_id, generation=generation,
+                     best_fitness=training_data.best_fitness)
+    
     # Print final stats
     total_time = time.time() - start_time
     hours, remainder = divmod(total_time, 3600)
@@ -472,6 +406,92 @@ def main():
     print(f"Best fitness: {ga.best_fitness:.2f}")
     print(f"Best food eaten: {ga.best_agent.food_eaten:.2f}")
     print(f"Best steps taken: {ga.best_agent.steps_taken:.2f}")
+    
+    return training_data
+
+
+def run_worker(control):
+    """
+    Serve training jobs over a control channel until it is closed.
+    
+    The process keeps its imports (NumPy, the GA, the simulator) between jobs,
+    so a job starts without paying for a new interpreter.
+    
+    Args:
+        control (TrainingControl): Channel the jobs arrive on and events are sent to.
+    """
+    control.emit('ready', pid=os.getpid())
+    training_data = None
+    try:
+        while True:
+            job = control.next_job()
+            if job is None:
+                break
+            # Release the previous job's session before starting the next one
+            if training_data is not None:
+                training_data.close()
+                training_data = None
+            error = None
+            try:
+                training_data = run_training(job.get('config', {}), control)
+            except Exception as e:
+                traceback.print_exc()
+                error = f'{type(e).__name__}: {e}'
+            control.emit('job_done', error=error)
+            control.job_id = None
+    finally:
+        if training_data is not None:
+            training_data.close()
+
+
+def main():
+    """Main function for training the genetic algorithm."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Train a genetic algorithm to play Snake')
+    parser.add_argument('--population', type=int, default=DEFAULT_POPULATION_SIZE,
+                        help='Population size')
+    parser.add_argument('--generations', type=int, default=DEFAULT_GENERATIONS,
+                        help='Number of generations')
+    parser.add_argument('--mutation', type=float, default=DEFAULT_MUTATION_RATE,
+                        help='Mutation rate')
+    parser.add_argument('--crossover', type=float, default=DEFAULT_CROSSOVER_RATE,
+                        help='Crossover rate')
+    parser.add_argument('--elitism', type=float, default=DEFAULT_ELITISM,
+                        help='Elitism rate')
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES_PER_AGENT,
+                        help='Games per agent')
+    parser.add_argument('--steps', type=int, default=DEFAULT_MAX_STEPS,
+                        help='Maximum steps per game')
+    parser.add_argument('--grid', type=int, default=DEFAULT_GRID_SIZE,
+                        help='Grid size')
+    parser.add_argument('--energy', type=int, default=DEFAULT_INITIAL_ENERGY,
+                        help='Initial energy')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='Processes evaluating agents in parallel')
+    parser.add_argument('--profile', type=int, default=0, metavar='N',
+                        help="Profile the first N generations (files in the session's profiles directory)")
+    parser.add_argument('--memory-profile', action='store_true',
+                        help='Report the memory growth per module at every generation (tracemalloc)')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help='Memory growth in MB over one generation that triggers a warning')
+    parser.add_argument('--load', type=str, default=None,
+                        help='Load population from file')
+    parser.add_argument('--save', type=str, default=None,
+                        help='Save best agent to file')
+    parser.add_argument('--ipc', action='store_true',
+                        help='Stream events on stdout and read commands on stdin (line-delimited JSON)')
+    parser.add_argument('--worker', action='store_true',
+                        help='Run the training jobs received on the control channel (implies --ipc)')
+    
+    args = parser.parse_args()
+    
+    # Control channel with the parent process (see snake_ipc)
+    control = TrainingControl() if args.ipc or args.worker else None
+    
+    if args.worker:
+        run_worker(control)
+    else:
+        run_training(vars(args), control)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,313 @@
+"""
+Snake Game Genetic Algorithm Training IPC
+
+This module implements the control and event channel between the web app and
+a training subprocess. Both directions speak line-delimited JSON, one message
+per line, each with a ``type`` field:
+
+    parent -> child (child's stdin):  pause, resume, checkpoint, stop, share,
+                                      profile
+    child -> parent (child's stdout): started, generation, timings, queues,
+                                      paused, resumed, checkpoint, profile,
+                                      stopped, finished, error
+
+The child's regular output (``print``) is moved to stderr so stdout carries
+only protocol messages. Commands are read on a background thread and applied
+by the training loop at generation boundaries.
+
+A worker of the training service (``--worker``) runs several jobs over the
+same channel: it announces itself with ``ready``, starts a session for every
+``job`` command, tags its events with the job ID and reports ``job_done``
+when the session ends. ``share`` sets how many agents the running job may
+evaluate at the same time (its share of the host's CPUs). ``profile``
+profiles the next ``generations`` generations; a ``profile`` event with the
+saved files follows the last one. ``queues`` reports, every second, how
+many agents wait for evaluation and how many writes wait for the disk.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+
+def _write_message(stream, lock, message):
+    """Write one JSON message as a line and flush it."""
+    line = json.dumps(message, default=float) + '\n'
+    with lock:
+        stream.write(line)
+        stream.flush()
+
+
+class TrainingControl:
+    """
+    Child side of the channel: streams events and receives commands.
+    """
+
+    def __init__(self, command_stream=None, event_stream=None):
+        """
+        Open the channel on the process's standard streams.
+
+        Args:
+            command_stream (file, optional): Stream the commands are read from (stdin).
+            event_stream (file, optional): Stream the events are written to (stdout).
+        """
+        self.commands = queue.Queue()
+        self.paused = False
+        self.stop_requested = False
+        self.closed = False
+        self.job_id = None
+        # Agents the job may evaluate at the same time, as set by the scheduler
+        self.share = None
+        self._write_lock = threading.Lock()
+
+        if event_stream is None:
+            # Keep the real stdout for the protocol; everything printed goes to stderr
+            event_stream = sys.stdout
+            sys.stdout = sys.stderr
+        self._events = event_stream
+        self._command_stream = command_stream if command_stream is not None else sys.stdin
+
+        self._reader = threading.Thread(target=self._read_commands, name='training-control', daemon=True)
+        self._reader.start()
+
+    def _read_commands(self):
+        for line in self._command_stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                self.commands.put(json.loads(line))
+            except json.JSONDecodeError:
+                self.emit('error', message=f'Invalid command: {line[:100]}')
+        # The parent closed the channel: stop after the current generation
+        self.closed = True
+        self.commands.put({'type': 'stop', 'reason': 'channel closed'})
+
+    def emit(self, event_type, **data):
+        """
+        Send an event to the parent.
+
+        Args:
+            event_type (str): Type of the event.
+            **data: Event fields.
+        """
+        if self.job_id is not None:
+            data.setdefault('job_id', self.job_id)
+        try:
+            _write_message(self._events, self._write_lock, dict(data, type=event_type))
+        except (BrokenPipeError, ValueError):
+            # The parent is gone; training goes on and its data is still saved to disk
+            pass
+
+    def on_generation(self, event):
+        """TrainingData listener streaming every recorded generation."""
+        self.emit('generation', **event)
+
+    def at_generation_boundary(self, generation, checkpoint=None, profile=None):
+        """
+        Apply the pending commands. Called by the training loop between generations.
+
+        While paused, this blocks until a resume or stop command arrives.
+
+        Args:
+            generation (int): Last completed generation.
+            checkpoint (callable, optional): Function saving a checkpoint and returning its path.
+            profile (callable, optional): Function requesting a profile of the next N generations.
+
+        Returns:
+            bool: True if training should stop.
+        """
+        while True:
+            block = self.paused and not self.stop_requested
+            try:
+                command = self.commands.get(block=block)
+            except queue.Empty:
+                return self.stop_requested
+            if command.get('job_id', self.job_id) != self.job_id:
+                # Late command for a previous job of this worker
+                continue
+
+            command_type = command.get('type')
+            if command_type == 'pause' and not self.paused:
+                self.paused = True
+                self.emit('paused', generation=generation)
+            elif command_type == 'resume' and self.paused:
+                self.paused = False
+                self.emit('resumed', generation=generation)
+            elif command_type == 'checkpoint':
+                path = checkpoint() if checkpoint else None
+                self.emit('checkpoint', generation=generation, path=path)
+            elif command_type == 'stop':
+                self.stop_requested = True
+                self.paused = False
+            elif command_type == 'share':
+                self.share = command.get('workers')
+            elif command_type == 'profile' and profile:
+                profile(command.get('generations', 1))
+            elif command_type not in ('pause', 'resume'):
+                self.emit('error', message=f'Unknown command: {command_type}')
+
+    def next_job(self):
+        """
+        Wait for the next job command. Used by worker processes between jobs;
+        other commands received while idle are dropped.
+
+        Returns:
+            dict: The job command, or None once the channel is closed.
+        """
+        while True:
+            if self.closed and self.commands.empty():
+                return None
+            command = self.commands.get()
+            if command.get('type') == 'job':
+                self.job_id = command.get('job_id')
+                self.share = command.get('share')
+                self.paused = False
+                self.stop_requested = False
+                return command
+            if self.closed:
+                return None
+
+
+class TrainingProcess:
+    """
+    Parent side of the channel: runs the training subprocess, sends commands
+    and dispatches its events.
+    """
+
+    def __init__(self, args, on_event=None, on_output=None, cwd=None):
+        """
+        Start the training subprocess.
+
+        Args:
+            args (list): Command line arguments for ``python -m ga.snake_ga_training``.
+            on_event (callable, optional): Called with every event received from the child.
+            on_output (callable, optional): Called with every line the child prints.
+                Defaults to printing it.
+            cwd (str, optional): Working directory of the child.
+        """
+        self.command = [sys.executable, '-u', '-m', 'ga.snake_ga_training', '--ipc'] + list(args)
+        self.on_event = on_event
+        self.on_output = on_output or (lambda line: print(f"[training] {line}"))
+        self.state = 'starting'
+        self.session_id = None
+        self.last_generation = None
+        self.last_event = None
+        self._write_lock = threading.Lock()
+
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=cwd,
+            env=dict(os.environ, PYTHONUNBUFFERED='1')
+        )
+        self._event_reader = threading.Thread(target=self._read_events, name='training-events', daemon=True)
+        self._output_reader = threading.Thread(target=self._read_output, name='training-output', daemon=True)
+        self._event_reader.start()
+        self._output_reader.start()
+
+    def _read_events(self):
+        for line in self.process.stdout:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                self.on_output(line.rstrip('\n'))
+                continue
+            self._handle_event(event)
+
+    def _read_output(self):
+        # Drained continuously so the child never blocks on a full stderr pipe
+        for line in self.process.stderr:
+            self.on_output(line.rstrip('\n'))
+
+    def _handle_event(self, event):
+        event_type = event.get('type')
+        self.last_event = event
+        if event_type == 'started':
+            self.session_id = event.get('session_id')
+            self.state = 'running'
+        elif event_type == 'generation':
+            self.last_generation = event.get('record')
+        elif event_type == 'paused':
+            self.state = 'paused'
+        elif event_type == 'resumed':
+            self.state = 'running'
+        elif event_type in ('stopped', 'finished'):
+            self.state = event_type
+        if self.on_event is not None:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                print(f"Error handling training event: {e}")
+
+    def send(self, command_type, **data):
+        """
+        Send a command to the child.
+
+        Args:
+            command_type (str): 'pause', 'resume', 'checkpoint' or 'stop'.
+            **data: Command fields.
+
+        Returns:
+            bool: False if the child is no longer running.
+        """
+        if self.process.poll() is not None:
+            return False
+        try:
+            _write_message(self.process.stdin, self._write_lock, dict(data, type=command_type))
+            return True
+        except (BrokenPipeError, OSError, ValueError):
+            return False
+
+    def close(self):
+        """Close the command channel: the child stops at its next generation boundary and exits."""
+        try:
+            self.process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def is_alive(self):
+        """Return True while the child process is running."""
+        return self.process.poll() is None
+
+    def wait(self, timeout=None):
+        """
+        Wait for the child to exit and for its remaining events to be dispatched.
+
+        Args:
+            timeout (float, optional): Seconds to wait.
+
+        Returns:
+            int: Return code, or None if the child is still running.
+        """
+        try:
+            returncode = self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            return None
+        self._event_reader.join(timeout)
+        self._output_reader.join(timeout)
+        if self.state not in ('stopped', 'finished'):
+            self.state = 'failed' if returncode else 'finished'
+        return returncode
+
+    def terminate(self, timeout=1.0):
+        """
+        Kill the child without waiting for a generation boundary.
+
+        Args:
+            timeout (float): Seconds to wait after SIGTERM before SIGKILL.
+        """
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.state = 'stopped'
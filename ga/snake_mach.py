@@ -1,55 +1,630 @@
 import json
+import os
 import threading
 import time
-from flask import Flask, jsonify
+from collections import deque
+from flask import Flask, Response, jsonify, request
 from flask_socketio import SocketIO, emit
+from . import snake_metrics
+from .snake_stream import set_stream_sink
 
 app = Flask(__name__)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
-class SnakeMach:
+# Taxa máxima de quadros enviados aos clientes, por agente
+DEFAULT_MAX_FPS = int(os.environ.get('SNAKE_MACH_MAX_FPS', 30))
+# Número de quadros delta entre dois quadros-chave (estado completo)
+KEYFRAME_INTERVAL = 60
+# Campos escalares enviados nos quadros delta quando mudam
+DELTA_FIELDS = ('food', 'direction', 'score', 'energy')
+# Quadros pendentes por assinante antes de descartar a fila e reenviar um quadro-chave
+SUBSCRIBER_QUEUE_SIZE = 32
+# Canal especial que recebe os quadros de todos os canais
+ALL_CHANNELS = '*'
+
+# Contadores do servidor SnakeMach, expostos no seu próprio /metrics
+FRAMES_EMITTED = snake_metrics.REGISTRY.counter(
+    'snake_frames_emitted_total', 'Game frames sent to SnakeMach subscribers.')
+FRAMES_DROPPED = snake_metrics.REGISTRY.counter(
+    'snake_frames_dropped_total', 'Game frames replaced by a newer frame before being published.')
+# Marca, na fila do publicador, o encerramento de um canal
+_CHANNEL_CLOSED = object()
+
+class FrameEncoder:
     """
-    Responsável por transmitir dados em tempo real da partida para o frontend via WebSocket.
+    Codifica os quadros de 'game_update' como quadros-chave ou deltas.
+    
+    Um quadro-chave ('keyframe') traz o estado completo. Um quadro delta
+    ('delta') traz apenas as células novas da cabeça ('head', da mais nova
+    para a mais antiga), quantas células saíram da cauda ('tail') e os campos
+    de DELTA_FIELDS que mudaram. Os sensores não são enviados nos deltas: o
+    cliente os recalcula a partir da cobra e da comida.
+    
+    Cada canal (agente ou sessão) tem seu número de sequência ('seq'). Um
+    cliente que perceber uma lacuna na sequência pede um novo quadro-chave
+    com 'request_keyframe'.
     """
-    def __init__(self):
-        self.status = "EM ANDAMENTO"  # Pode ser: "EM ANDAMENTO", "VITORIA", "DERROTA"
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self._channels = {}
+        self._lock = threading.Lock()
+    
+    def request_keyframe(self, channel_id=None):
+        """
+        Força um quadro-chave no próximo quadro de um canal (ou de todos).
+        
+        Args:
+            channel_id: Identificador do canal; None para todos os canais
+        """
+        with self._lock:
+            for key, channel in self._channels.items():
+                if channel_id is None or key == channel_id:
+                    channel['force_keyframe'] = True
+    
+    def forget(self, channel_id):
+        """Descarta o histórico de um canal encerrado."""
+        with self._lock:
+            self._channels.pop(channel_id, None)
+    
+    @staticmethod
+    def as_keyframe(frame, state):
+        """
+        Converte um quadro codificado em quadro-chave com a mesma sequência.
+        
+        Args:
+            frame (dict): Quadro retornado por encode
+            state (dict): Estado completo que originou o quadro
+            
+        Returns:
+            dict: Quadro-chave
+        """
+        if frame['type'] == 'keyframe':
+            return frame
+        keyframe = {key: frame[key] for key in ('agent_id', 'channel', 'seq', 'status')}
+        keyframe['type'] = 'keyframe'
+        keyframe['state'] = state
+        return keyframe
+    
+    def encode(self, payload):
+        """
+        Codifica um quadro relativo ao último quadro codificado do mesmo canal.
+        
+        Args:
+            payload (dict): Quadro com 'agent_id', 'status', 'state' e,
+                opcionalmente, 'channel' (por padrão, o próprio agent_id)
+            
+        Returns:
+            dict: Quadro-chave ou quadro delta
+        """
+        agent_id = payload['agent_id']
+        channel_id = payload.get('channel', agent_id)
+        state = payload['state'] or {}
+        with self._lock:
+            channel = self._channels.setdefault(channel_id, {'seq': -1, 'previous': None, 'since_keyframe': 0,
+                                                            'force_keyframe': True})
+            channel['seq'] += 1
+            frame = {'agent_id': agent_id, 'channel': channel_id, 'seq': channel['seq'],
+                     'status': payload['status']}
+            
+            delta = None
+            previous = channel['previous']
+            if not channel['force_keyframe'] and channel['since_keyframe'] < self.keyframe_interval:
+                delta = self._diff(previous, state)
+            
+            if delta is None:
+                frame['type'] = 'keyframe'
+                frame['state'] = state
+                channel['since_keyframe'] = 0
+                channel['force_keyframe'] = False
+            else:
+                frame['type'] = 'delta'
+                frame.update(delta)
+                channel['since_keyframe'] += 1
+            
+            channel['previous'] = {'snake': list(state.get('snake', [])), 'status': payload['status'],
+                                   **{field: state.get(field) for field in DELTA_FIELDS}}
+            return frame
+    
+    @staticmethod
+    def _diff(previous, state):
+        """Calcula o delta entre dois estados, ou None se for preciso um quadro-chave."""
+        old_snake = previous['snake']
+        new_snake = state.get('snake', [])
+        
+        # A nova cobra é: células novas da cabeça + a cobra anterior sem as células da cauda
+        for head in range(len(new_snake) + 1):
+            body = new_snake[head:]
+            if len(body) <= len(old_snake) and body == old_snake[:len(body)]:
+                break
+        else:
+            return None
+        if head == len(new_snake) and old_snake:
+            # Nenhuma célula em comum: jogo novo
+            return None
+        
+        delta = {'head': new_snake[:head], 'tail': len(old_snake) - (len(new_snake) - head)}
+        for field in DELTA_FIELDS:
+            if state.get(field) != previous[field]:
+                delta[field] = state.get(field)
+        return delta
+
+class FramePublisher:
+    """
+    Publica os quadros das partidas em uma thread própria, com taxa limitada.
+    
+    O loop do jogo apenas entrega o quadro mais recente de cada agente; os
+    quadros intermediários são descartados. Sem clientes conectados nada é
+    guardado nem emitido, de modo que o jogo nunca espera pela camada de socket.
+    """
+    def __init__(self, emit_func, max_fps=DEFAULT_MAX_FPS, close_func=None):
+        """
+        Inicializa o publicador.
+        
+        Args:
+            emit_func (callable): Função que emite um quadro (payload) aos clientes
+            max_fps (int): Número máximo de quadros por segundo por agente
+            close_func (callable, opcional): Função que avisa os clientes do fim de um canal
+        """
+        self.emit_func = emit_func
+        self.close_func = close_func
+        self.max_fps = max_fps
+        self.clients = 0
+        self.submitted = 0
+        self.published = 0
+        self.dropped = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+    
+    def client_connected(self):
+        with self._lock:
+            self.clients += 1
+    
+    def client_disconnected(self):
+        with self._lock:
+            self.clients = max(0, self.clients - 1)
+            if not self.clients:
+                self._pending.clear()
+    
+    def submit(self, agent_id, payload):
+        """
+        Entrega o quadro mais recente de um agente, sem bloquear.
+        
+        Args:
+            agent_id: Identificador do agente
+            payload (dict): Quadro a ser publicado
+        """
+        if not self.clients:
+            return
+        with self._lock:
+            self.submitted += 1
+            if agent_id in self._pending:
+                self.dropped += 1
+                FRAMES_DROPPED.inc()
+                # O quadro mais recente vai para o fim, depois de um encerramento pendente do canal
+                del self._pending[agent_id]
+            self._pending[agent_id] = payload
+            self._start()
+        self._wakeup.set()
+    
+    def close(self, channel_id):
+        """
+        Avisa os clientes do fim de um canal, na thread do publicador e depois
+        dos quadros pendentes do canal.
+        
+        Args:
+            channel_id: Identificador do canal encerrado
+        """
+        if not self.clients or self.close_func is None:
+            return
+        with self._lock:
+            self._pending[(_CHANNEL_CLOSED, channel_id)] = None
+            self._start()
+        self._wakeup.set()
+    
+    def _start(self):
+        """Inicia a thread do publicador (com self._lock)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='snake-mach-publisher', daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            started = time.perf_counter()
+            
+            self.publish_pending()
+            
+            # Limita a taxa de quadros: quadros recebidos nesse intervalo se acumulam (coalescem)
+            if self.max_fps:
+                remaining = 1.0 / self.max_fps - (time.perf_counter() - started)
+                if remaining > 0:
+                    time.sleep(remaining)
+    
+    def publish_pending(self):
+        """Emite os quadros e encerramentos pendentes, na ordem em que chegaram."""
+        with self._lock:
+            frames = list(self._pending.items())
+            self._pending.clear()
+        for key, payload in frames:
+            try:
+                if payload is None:
+                    self.close_func(key[1])
+                    continue
+                self.emit_func(payload)
+                self.published += 1
+            except Exception as e:
+                print(f"Erro na publicação: {e}")
+    
+    def metrics(self):
+        """
+        Retorna os contadores do publicador.
+        
+        Returns:
+            dict: Clientes conectados e quadros recebidos, publicados e descartados
+        """
+        with self._lock:
+            return {
+                'clients': self.clients,
+                'max_fps': self.max_fps,
+                'submitted': self.submitted,
+                'published': self.published,
+                'dropped': self.dropped,
+                'pending': sum(1 for payload in self._pending.values() if payload is not None)
+            }
+
+class Subscriber:
+    """
+    Assinante de um ou mais canais, com fila de envio limitada.
+    
+    Se o cliente não consome os quadros no ritmo em que são produzidos, a
+    fila enche; os quadros pendentes são então descartados e o próximo quadro
+    enviado é um quadro-chave, de modo que o cliente lento apenas pula para o
+    estado mais recente sem atrasar os demais.
+    """
+    def __init__(self, sid, max_queue=SUBSCRIBER_QUEUE_SIZE):
+        self.sid = sid
+        self.channels = set()
+        self.synced = set()  # Canais para os quais o assinante já recebeu um quadro-chave
+        self.queue = deque()
+        self.max_queue = max_queue
+        self.overflows = 0
+    
+    def offer(self, frame, state):
+        """Enfileira um quadro, trocando-o por um quadro-chave quando necessário."""
+        if len(self.queue) >= self.max_queue:
+            self.queue.clear()
+            self.synced.clear()
+            self.overflows += 1
+        if frame['channel'] not in self.synced:
+            frame = FrameEncoder.as_keyframe(frame, state)
+            self.synced.add(frame['channel'])
+        self.queue.append(('game_update', frame))
+    
+    def close(self, channel_id):
+        """Enfileira o aviso de fim de um canal; um novo jogo no canal começará por um quadro-chave."""
+        self.synced.discard(channel_id)
+        self.queue.append(('channel_closed', {'channel': channel_id}))
+
+class Channel:
+    """
+    Estado ao vivo de uma partida (um agente ou uma sessão), com trava própria.
+    """
+    def __init__(self, channel_id):
+        self.channel_id = channel_id
         self.agent_id = None
         self.state = {}
+        self.status = "EM ANDAMENTO"  # Pode ser: "EM ANDAMENTO", "VITORIA", "DERROTA"
+        self.updated_at = None
         self.lock = threading.Lock()
+    
+    def get_payload(self):
+        with self.lock:
+            return {
+                'agent_id': self.agent_id,
+                'channel': self.channel_id,
+                'status': self.status,
+                'state': self.state
+            }
 
-    def update_state(self, agent_id, game_state, status="EM ANDAMENTO"):
+class SnakeMach:
+    """
+    Responsável por transmitir dados em tempo real da partida para o frontend via WebSocket.
+    
+    Cada partida é transmitida em um canal próprio (por padrão, o id do
+    agente), o que permite acompanhar várias avaliações em paralelo. Os
+    clientes assinam canais com o evento 'subscribe'; o canal ALL_CHANNELS
+    recebe todas as partidas. Quando um canal é encerrado, seus assinantes
+    recebem 'channel_closed'.
+    
+    Só os canais com assinantes são guardados: enquanto ninguém assiste a
+    uma partida, update_state retorna sem fazer nada.
+    """
+    def __init__(self, max_fps=DEFAULT_MAX_FPS):
+        self.channels = {}
+        self.subscribers = {}
+        # Assinantes por canal e do canal ALL_CHANNELS, lidos sem trava pelo loop do jogo
+        self.watchers = {}
+        self.all_watchers = 0
+        self.latest_channel = None
+        self.lock = threading.Lock()  # Protege apenas o registro de canais e assinantes
+        self.encoder = FrameEncoder()
+        self.publisher = FramePublisher(self._dispatch, max_fps, self._dispatch_close)
+        self._outbox = threading.Condition(self.lock)
+        self._sender = None
+
+    @property
+    def agent_id(self):
+        channel = self.get_channel()
+        return channel.agent_id if channel else None
+
+    @property
+    def state(self):
+        channel = self.get_channel()
+        return channel.state if channel else {}
+
+    @property
+    def status(self):
+        channel = self.get_channel()
+        return channel.status if channel else "EM ANDAMENTO"
+
+    def get_channel(self, channel_id=None):
+        """
+        Retorna um canal pelo id, ou o canal atualizado mais recentemente.
+        
+        Args:
+            channel_id: Identificador do canal (agente ou sessão)
+            
+        Returns:
+            Channel: O canal, ou None se não existir
+        """
         with self.lock:
-            self.agent_id = agent_id
-            self.state = game_state
-            self.status = status
-        socketio.emit('game_update', self.get_payload())
+            return self.channels.get(self.latest_channel if channel_id is None else channel_id)
 
-    def get_payload(self):
-        return {
-            'agent_id': self.agent_id,
-            'status': self.status,
-            'state': self.state
-        }
+    def update_state(self, agent_id, game_state, status="EM ANDAMENTO", channel=None):
+        channel_id = agent_id if channel is None else channel
+        # Chamado a cada passo do jogo: sem assinantes do canal, nada é guardado nem publicado
+        if not (self.all_watchers or self.watchers.get(channel_id)):
+            return
+        # A trava global só é usada ao criar o canal
+        current = self.channels.get(channel_id)
+        if current is None:
+            with self.lock:
+                current = self.channels.setdefault(channel_id, Channel(channel_id))
+        self.latest_channel = channel_id
+        with current.lock:
+            current.agent_id = agent_id
+            current.state = game_state
+            current.status = status
+            current.updated_at = time.time()
+        # A emissão acontece na thread do publicador
+        self.publisher.submit(channel_id, current.get_payload())
 
-    def reset(self):
+    def get_payload(self, channel_id=None):
+        channel = self.get_channel(channel_id)
+        if channel is None:
+            return {'agent_id': None, 'channel': channel_id, 'status': "EM ANDAMENTO", 'state': {}}
+        return channel.get_payload()
+
+    def list_channels(self):
+        """
+        Lista os canais ativos.
+        
+        Returns:
+            list: Id, agente, status, última atualização e número de assinantes de cada canal
+        """
+        with self.lock:
+            channels = list(self.channels.values())
+            counts = {channel.channel_id: self.watchers.get(channel.channel_id, 0) for channel in channels}
+        return [{
+            'channel': channel.channel_id,
+            'agent_id': channel.agent_id,
+            'status': channel.status,
+            'updated_at': channel.updated_at,
+            'subscribers': counts[channel.channel_id]
+        } for channel in channels]
+
+    def subscribe(self, sid, channel_id):
+        """
+        Inscreve um cliente em um canal; o próximo quadro do canal para ele será um quadro-chave.
+        
+        Args:
+            sid (str): Id da conexão Socket.IO
+            channel_id: Canal a assinar (ALL_CHANNELS para todos)
+        """
+        with self.lock:
+            subscriber = self.subscribers.get(sid)
+            if subscriber is None:
+                subscriber = self.subscribers[sid] = Subscriber(sid)
+                self.publisher.client_connected()
+            if channel_id not in subscriber.channels:
+                subscriber.channels.add(channel_id)
+                self._add_watcher(channel_id, 1)
+            if channel_id == ALL_CHANNELS:
+                subscriber.synced.clear()
+            else:
+                subscriber.synced.discard(channel_id)
+            targets = list(self.channels) if channel_id == ALL_CHANNELS else [channel_id]
+            payloads = [self.channels[target] for target in targets if target in self.channels]
+        # Reenvia o estado atual para que o novo assinante não espere o próximo passo do jogo
+        for channel in payloads:
+            self.publisher.submit(channel.channel_id, channel.get_payload())
+
+    def unsubscribe(self, sid, channel_id=None):
+        """
+        Cancela a inscrição de um cliente em um canal (ou em todos).
+        
+        Args:
+            sid (str): Id da conexão Socket.IO
+            channel_id: Canal; None para todos os canais e remover o assinante
+        """
+        with self.lock:
+            subscriber = self.subscribers.get(sid)
+            if subscriber is None:
+                return
+            if channel_id is None:
+                del self.subscribers[sid]
+                self.publisher.client_disconnected()
+                for subscribed in subscriber.channels:
+                    self._add_watcher(subscribed, -1)
+            elif channel_id in subscriber.channels:
+                subscriber.channels.discard(channel_id)
+                self._add_watcher(channel_id, -1)
+
+    def _add_watcher(self, channel_id, delta):
+        """Atualiza a contagem de assinantes de um canal (com self.lock)."""
+        if channel_id == ALL_CHANNELS:
+            self.all_watchers += delta
+            return
+        count = self.watchers.get(channel_id, 0) + delta
+        if count > 0:
+            self.watchers[channel_id] = count
+        else:
+            self.watchers.pop(channel_id, None)
+
+    def request_keyframe(self, sid, channel_id=None):
+        """Pede um quadro-chave para um assinante (após uma lacuna na sequência)."""
+        with self.lock:
+            subscriber = self.subscribers.get(sid)
+            if subscriber is not None:
+                if channel_id is None:
+                    subscriber.synced.clear()
+                else:
+                    subscriber.synced.discard(channel_id)
+
+    def _dispatch(self, payload):
+        """Codifica um quadro (thread do publicador) e o enfileira para os assinantes do canal."""
+        frame = self.encoder.encode(payload)
+        channel_id = frame['channel']
         with self.lock:
-            self.agent_id = None
-            self.state = {}
-            self.status = "EM ANDAMENTO"
+            for subscriber in self.subscribers.values():
+                if channel_id in subscriber.channels or ALL_CHANNELS in subscriber.channels:
+                    subscriber.offer(frame, payload['state'])
+            self._start_sender()
+
+    def _dispatch_close(self, channel_id):
+        """Enfileira o fim de um canal para os seus assinantes (thread do publicador)."""
+        self.encoder.forget(channel_id)
+        with self.lock:
+            for subscriber in self.subscribers.values():
+                if channel_id in subscriber.channels or ALL_CHANNELS in subscriber.channels:
+                    subscriber.close(channel_id)
+            self._start_sender()
+
+    def _start_sender(self):
+        """Acorda (ou inicia) a thread de envio (com self.lock)."""
+        if self._sender is None:
+            self._sender = threading.Thread(target=self._send_loop, name='snake-mach-sender', daemon=True)
+            self._sender.start()
+        self._outbox.notify()
+
+    def _send_loop(self):
+        while True:
+            with self.lock:
+                while not any(sub.queue for sub in self.subscribers.values()):
+                    self._outbox.wait()
+                batches = []
+                for subscriber in self.subscribers.values():
+                    if subscriber.queue:
+                        batches.append((subscriber.sid, list(subscriber.queue)))
+                        subscriber.queue.clear()
+            for sid, events in batches:
+                for event, data in events:
+                    try:
+                        socketio.emit(event, data, to=sid)
+                        if event == 'game_update':
+                            FRAMES_EMITTED.inc()
+                    except Exception as e:
+                        print(f"Erro no envio: {e}")
 
-# Instância global da transmissão
+    def metrics(self):
+        """
+        Retorna os contadores de transmissão.
+        
+        Returns:
+            dict: Métricas do publicador, canais, assinantes e filas
+        """
+        with self.lock:
+            queued = sum(len(sub.queue) for sub in self.subscribers.values())
+            overflows = sum(sub.overflows for sub in self.subscribers.values())
+            channels = len(self.channels)
+        return dict(self.publisher.metrics(), channels=channels, subscribers=len(self.subscribers),
+                    queued=queued, overflows=overflows)
+
+    def reset(self, channel_id=None):
+        """
+        Encerra um canal (por padrão, o atualizado mais recentemente).
+        
+        Args:
+            channel_id: Identificador do canal
+        """
+        with self.lock:
+            channel_id = self.latest_channel if channel_id is None else channel_id
+            closed = self.channels.pop(channel_id, None)
+            if self.latest_channel == channel_id:
+                self.latest_channel = None
+            watched = self.all_watchers or self.watchers.get(channel_id)
+        if closed is None:
+            return
+        # O aviso aos assinantes sai pela thread do publicador, depois dos últimos quadros do canal
+        if watched:
+            self.publisher.close(channel_id)
+        else:
+            self.encoder.forget(channel_id)
+
+# Instância global da transmissão, usada como sink das partidas (ver snake_stream)
 snake_mach = SnakeMach()
+set_stream_sink(snake_mach)
+
+# Métricas lidas do publicador no momento da coleta (ver /metrics)
+snake_metrics.REGISTRY.gauge('snake_mach_clients', 'Clients subscribed to SnakeMach channels.',
+                             function=lambda: snake_mach.publisher.clients)
+
+def _pending_frames():
+    metrics = snake_mach.metrics()
+    return metrics['pending'] + metrics['queued']
+
+snake_metrics.REGISTRY.gauge('snake_mach_pending_frames', 'Frames waiting to be sent to SnakeMach subscribers.',
+                             function=_pending_frames)
+
+@app.route("/metrics")
+def get_metrics():
+    return Response(snake_metrics.REGISTRY.render(), content_type=snake_metrics.CONTENT_TYPE)
 
 @app.route("/status/<agent_id>")
 def get_status(agent_id):
-    if snake_mach.agent_id != agent_id:
+    channel = snake_mach.get_channel(agent_id)
+    if channel is None:
         return jsonify({"error": "Agente nao encontrado ou nao ativo"}), 404
-    return jsonify(snake_mach.get_payload())
+    return jsonify(channel.get_payload())
+
+@app.route("/channels")
+def get_channels():
+    return jsonify(snake_mach.list_channels())
 
 @socketio.on("connect")
 def handle_connect():
     emit("connected", {"message": "Conectado ao SnakeMach"})
-    emit("game_update", snake_mach.get_payload())
+
+@socketio.on("disconnect")
+def handle_disconnect():
+    snake_mach.unsubscribe(request.sid)
+
+@socketio.on("subscribe")
+def handle_subscribe(data=None):
+    channel_id = (data or {}).get("channel", ALL_CHANNELS)
+    snake_mach.subscribe(request.sid, channel_id)
+
+@socketio.on("unsubscribe")
+def handle_unsubscribe(data=None):
+    channel_id = (data or {}).get("channel", ALL_CHANNELS)
+    snake_mach.unsubscribe(request.sid, channel_id)
+
+@socketio.on("request_keyframe")
+def handle_request_keyframe(data=None):
+    snake_mach.request_keyframe(request.sid, (data or {}).get("channel"))
 
 # Exemplo de uso em background (para testes isolados)
 def simulate_game_updates():
@@ -0,0 +1,341 @@
+"""
+Snake Game Metrics
+
+In-process metrics exposed in the Prometheus text exposition format.
+
+Counters, gauges, histograms and summaries are updated by the training loop,
+the training service and the SnakeMach publisher; each update only takes a
+per-metric lock for a few additions. Every process renders its own
+registry: the web app's ``/metrics`` has the training figures, the SnakeMach
+server (``ga.snake_mach``, port 5000) has the frame and client counters on
+its own ``/metrics``. Values that already exist elsewhere
+(queue depths, cache counters, connected clients) are read when the metrics
+are rendered, through a ``function`` given at registration.
+
+Training jobs run in worker processes: their loop feeds the registry of the
+worker and relays the same per-generation figures to the parent as
+``timings`` events, which the parent records with observe_generation. The
+depth of their evaluation and persistence queues arrives as ``queues``
+events and is read from the training service.
+"""
+
+import bisect
+import math
+import threading
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Generation durations in seconds
+GENERATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+class _Value:
+    """Counter or gauge value."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = float(value)
+
+    def samples(self):
+        return [('', {}, self.value)]
+
+
+class _HistogramValue:
+    def __init__(self, buckets):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        with self._lock:
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.counts):
+                self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        samples = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            samples.append(('_bucket', {'le': _format_value(float(bound))}, cumulative))
+        samples.append(('_bucket', {'le': '+Inf'}, count))
+        samples.append(('_sum', {}, total))
+        samples.append(('_count', {}, count))
+        return samples
+
+
+class _SummaryValue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value, count=1):
+        with self._lock:
+            self.sum += value
+            self.count += count
+
+    def samples(self):
+        with self._lock:
+            return [('_sum', {}, self.sum), ('_count', {}, self.count)]
+
+
+class Metric:
+    """
+    Base class of the metric types.
+
+    A metric without labels is updated directly (``counter.inc()``); a
+    metric with labels is updated through the child of a set of label
+    values (``counter.labels(phase='step').inc()``).
+    """
+
+    type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        """
+        Args:
+            name (str): Metric name.
+            documentation (str): Help text.
+            labelnames (tuple): Names of the labels.
+            function (callable, optional): Called when the metrics are
+                rendered. Returns the value, or for labelled metrics a dict
+                mapping tuples of label values to values; None omits the metric.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._lock = threading.Lock()
+        self._children = {}
+
+    def _new_child(self):
+        return _Value()
+
+    def labels(self, **labels):
+        """Get the child of a set of label values, creating it on first use."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _child(self):
+        if self.labelnames:
+            raise ValueError(f"Metric {self.name} has labels; use labels()")
+        return self.labels()
+
+    def _collect(self):
+        """List the (label values, child samples) of the metric."""
+        if self.function is None:
+            if not self.labelnames:
+                # Unlabelled metrics are exposed (as zero) before their first update
+                self.labels()
+            with self._lock:
+                children = list(self._children.items())
+            return [(key, child.samples()) for key, child in children]
+        value = self.function()
+        if value is None:
+            return []
+        items = value.items() if self.labelnames else [((), value)]
+        return [(tuple(str(label) for label in key), [('', {}, float(sample))]) for key, sample in items]
+
+    def render(self):
+        """Render the metric in the text exposition format."""
+        lines = [f'# HELP {self.name} ' + self.documentation.replace('\\', '\\\\').replace('\n', '\\n'),
+                 f'# TYPE {self.name} {self.type}']
+        for key, samples in self._collect():
+            labels = dict(zip(self.labelnames, key))
+            for suffix, extra, value in samples:
+                lines.append(f'{self.name}{suffix}{_format_labels(dict(labels, **extra))} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    type = 'counter'
+
+    def inc(self, amount=1):
+        """Increase the counter."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._child().inc(amount)
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type = 'gauge'
+
+    def set(self, value):
+        self._child().set(value)
+
+    def inc(self, amount=1):
+        self._child().inc(amount)
+
+    def dec(self, amount=1):
+        self._child().dec(amount)
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=GENERATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self._child().observe(value)
+
+
+class Summary(Metric):
+    """Sum and count of observations (e.g. latencies measured in batches)."""
+
+    type = 'summary'
+
+    def _new_child(self):
+        return _SummaryValue()
+
+    def observe(self, value, count=1):
+        """
+        Add observations.
+
+        Args:
+            value (float): Total of the observations.
+            count (int): Number of observations the total covers.
+        """
+        self._child().observe(value, count)
+
+
+class MetricsRegistry:
+    """Named metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """
+        Add a metric.
+
+        Raises:
+            ValueError: If a metric with the same name is registered.
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name):
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def counter(self, name, documentation, labelnames=(), function=None):
+        return self.register(Counter(name, documentation, labelnames, function))
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        return self.register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=GENERATION_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def summary(self, name, documentation, labelnames=()):
+        return self.register(Summary(name, documentation, labelnames))
+
+    def render(self):
+        """
+        Render every metric in the text exposition format.
+
+        A metric whose function fails is left out.
+
+        Returns:
+            str: Exposition text.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        blocks = []
+        for metric in metrics:
+            try:
+                blocks.append(metric.render())
+            except Exception as e:
+                print(f"Error collecting metric {metric.name}: {e}")
+        return '\n'.join(blocks) + '\n'
+
+
+# Registry of this process
+REGISTRY = MetricsRegistry()
+
+AGENT_GAMES = REGISTRY.counter(
+    'snake_agent_games_total', 'Games played by agents during training.')
+SIMULATOR_STEPS = REGISTRY.counter(
+    'snake_simulator_steps_total', 'Simulator steps played during training.')
+GENERATION_DURATION = REGISTRY.histogram(
+    'snake_generation_duration_seconds', 'Wall time of a training generation.')
+PHASE_SECONDS = REGISTRY.counter(
+    'snake_phase_seconds_total', 'Time spent in each phase of the training generations.', ('phase',))
+PERSISTENCE_WRITE = REGISTRY.summary(
+    'snake_persistence_write_seconds', 'Latency of the background disk writes of training sessions.')
+
+
+def observe_generation(generation_time, phases, agent_games):
+    """
+    Record the figures of a completed training generation.
+
+    Args:
+        generation_time (float): Wall time of the generation in seconds.
+        phases (dict): Phase timings as returned by PhaseTimers.collect.
+        agent_games (int): Games played in the generation.
+    """
+    GENERATION_DURATION.observe(generation_time)
+    AGENT_GAMES.inc(agent_games)
+    if 'step' in phases:
+        SIMULATOR_STEPS.inc(phases['step']['calls'])
+    if 'disk' in phases:
+        PERSISTENCE_WRITE.observe(phases['disk']['seconds'], phases['disk']['calls'])
+    for phase, entry in phases.items():
+        PHASE_SECONDS.labels(phase=phase).inc(entry['seconds'])
@@ -0,0 +1,297 @@
+"""
+Snake Game Replays
+
+This module stores recorded games in a compact form. Since the simulator is
+deterministic given its seed, a game is fully described by the simulator
+settings and the direction taken on every step. Directions are packed as
+2-bit codes, four per byte, so a 1000-step game takes about 250 bytes instead
+of a list of per-step state dicts.
+"""
+
+import base64
+import json
+import os
+
+import numpy as np
+
+from .snake_simulator import SnakeGameSimulator
+
+REPLAY_FORMAT = 'snake-replay'
+REPLAY_VERSION = 1
+
+# 2-bit direction codes
+DIRECTIONS = (
+    {'x': 0, 'y': -1},  # 0: Up
+    {'x': 1, 'y': 0},   # 1: Right
+    {'x': 0, 'y': 1},   # 2: Down
+    {'x': -1, 'y': 0}   # 3: Left
+)
+DIRECTION_NAMES = ('up', 'right', 'down', 'left')
+_DIRECTION_CODES = {(d['x'], d['y']): code for code, d in enumerate(DIRECTIONS)}
+
+
+def pack_directions(codes):
+    """
+    Pack direction codes (0-3) into bytes, four codes per byte.
+
+    Args:
+        codes (bytes or list): Direction codes.
+
+    Returns:
+        bytes: Packed codes.
+    """
+    codes = np.frombuffer(bytes(codes), dtype=np.uint8)
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape(-1, 4)
+    packed = quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+    return packed.astype(np.uint8).tobytes()
+
+
+def unpack_directions(packed, count):
+    """
+    Unpack direction codes packed by pack_directions.
+
+    Args:
+        packed (bytes): Packed codes.
+        count (int): Number of codes to unpack.
+
+    Returns:
+        numpy.ndarray: Direction codes.
+    """
+    packed = np.frombuffer(packed, dtype=np.uint8)
+    codes = np.stack([(packed >> shift) & 0b11 for shift in (0, 2, 4, 6)], axis=1).ravel()
+    return codes[:count]
+
+
+class GameReplay:
+    """
+    A recorded game: simulator settings, seed and packed directions.
+    """
+
+    def __init__(self, seed, grid_size, initial_energy, energy_per_step, energy_per_food,
+                 actions=b'', steps=0, metadata=None):
+        """
+        Initialize a replay.
+
+        Args:
+            seed (int): Seed of the simulator for this game.
+            grid_size (int): Size of the grid.
+            initial_energy (int): Initial energy of the snake.
+            energy_per_step (int): Energy spent on every step without food.
+            energy_per_food (int): Energy gained when eating food.
+            actions (bytes): Packed direction codes.
+            steps (int): Number of recorded steps.
+            metadata (dict, optional): Extra information (agent, score, ...).
+        """
+        self.seed = seed
+        self.grid_size = grid_size
+        self.initial_energy = initial_energy
+        self.energy_per_step = energy_per_step
+        self.energy_per_food = energy_per_food
+        self.actions = actions
+        self.steps = steps
+        self.metadata = metadata or {}
+
+    def directions(self):
+        """
+        Get the direction codes of every recorded step.
+
+        Returns:
+            numpy.ndarray: Direction codes (0-3).
+        """
+        return unpack_directions(self.actions, self.steps)
+
+    def movement_counts(self):
+        """
+        Count the steps taken in each direction.
+
+        Returns:
+            dict: Number of steps per direction name.
+        """
+        counts = np.bincount(self.directions(), minlength=4)
+        return {name: int(counts[code]) for code, name in enumerate(DIRECTION_NAMES)}
+
+    def to_dict(self):
+        """
+        Convert the replay to a JSON-serialisable dict.
+
+        Returns:
+            dict: Replay data with base64-encoded actions.
+        """
+        return {
+            'format': REPLAY_FORMAT,
+            'version': REPLAY_VERSION,
+            'seed': self.seed,
+            'grid_size': self.grid_size,
+            'initial_energy': self.initial_energy,
+            'energy_per_step': self.energy_per_step,
+            'energy_per_food': self.energy_per_food,
+            'steps': self.steps,
+            'actions': base64.b64encode(self.actions).decode('ascii'),
+            'metadata': self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a replay from a dict created by to_dict.
+
+        Args:
+            data (dict): Replay data.
+
+        Returns:
+            GameReplay: The replay.
+        """
+        if data.get('format') != REPLAY_FORMAT:
+            raise ValueError("Not a snake replay")
+        return cls(
+            seed=data['seed'],
+            grid_size=data['grid_size'],
+            initial_energy=data['initial_energy'],
+            energy_per_step=data['energy_per_step'],
+            energy_per_food=data['energy_per_food'],
+            actions=base64.b64decode(data['actions']),
+            steps=data['steps'],
+            metadata=data.get('metadata')
+        )
+
+    def save(self, path):
+        """
+        Save the replay to a file.
+
+        Args:
+            path (str): Destination file.
+        """
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a replay from a file.
+
+        Args:
+            path (str): Replay file.
+
+        Returns:
+            GameReplay: The replay.
+        """
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+class GameRecorder:
+    """
+    Records the games played on a simulator.
+
+    Usage:
+        recorder = GameRecorder(simulator)
+        recorder.start()              # resets the simulator with a fresh seed
+        ...
+        recorder.record()             # after choosing the direction, before simulator.step()
+        ...
+        replay = recorder.finish()
+    """
+
+    def __init__(self, simulator):
+        """
+        Initialize the recorder.
+
+        Args:
+            simulator (SnakeGameSimulator): Simulator to record.
+        """
+        self.simulator = simulator
+        self.seed = None
+        self._codes = bytearray()
+
+    def start(self, seed=None):
+        """
+        Start recording a new game, resetting the simulator with a known seed.
+
+        Args:
+            seed (int, optional): Seed for the game. A random one is drawn if not given.
+        """
+        self.seed = int(seed if seed is not None else np.random.randint(2**31 - 1))
+        self.simulator.reset(seed=self.seed)
+        self._codes = bytearray()
+
+    def record(self):
+        """Record the simulator's current direction as the next step."""
+        direction = self.simulator.direction
+        self._codes.append(_DIRECTION_CODES[(direction['x'], direction['y'])])
+
+    def finish(self, metadata=None):
+        """
+        Stop recording and build the replay.
+
+        Args:
+            metadata (dict, optional): Extra information stored with the replay.
+
+        Returns:
+            GameReplay: The recorded game.
+        """
+        simulator = self.simulator
+        return GameReplay(
+            seed=self.seed,
+            grid_size=simulator.grid_size,
+            initial_energy=simulator.initial_energy,
+            energy_per_step=simulator.energy_per_step,
+            energy_per_food=simulator.energy_per_food,
+            actions=pack_directions(self._codes),
+            steps=len(self._codes),
+            metadata=metadata
+        )
+
+
+class GameReplayer:
+    """
+    Regenerates the frames of a recorded game on demand.
+    """
+
+    def __init__(self, replay):
+        """
+        Initialize the replayer.
+
+        Args:
+            replay (GameReplay): Recorded game.
+        """
+        self.replay = replay
+
+    def frame_count(self):
+        """Number of frames of the game: the initial state plus one per step."""
+        return self.replay.steps + 1
+
+    def frames(self, start=0, stop=None):
+        """
+        Replay the game and yield full game states.
+
+        Args:
+            start (int): First frame to yield.
+            stop (int, optional): Frame to stop at (exclusive).
+
+        Yields:
+            dict: Game state as returned by SnakeGameSimulator.get_state,
+            with the frame number under 'step'.
+        """
+        replay = self.replay
+        stop = self.frame_count() if stop is None else min(stop, self.frame_count())
+        simulator = SnakeGameSimulator(
+            grid_size=replay.grid_size,
+            initial_energy=replay.initial_energy,
+            energy_per_step=replay.energy_per_step,
+            energy_per_food=replay.energy_per_food,
+            seed=replay.seed
+        )
+
+        directions = replay.directions()
+        for frame in range(stop):
+            if frame >= start:
+                state = simulator.get_state()
+                state['step'] = frame
+                yield state
+            if frame < len(directions):
+                simulator.direction = dict(DIRECTIONS[directions[frame]])
+                simulator.step()
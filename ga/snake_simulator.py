@@ -0,0 +1,286 @@
+"""
+Snake Game Simulator
+
+This module implements a headless, deterministic simulator of the Snake game
+used to train and evaluate the genetic algorithm agents. Given the same seed,
+grid size, energy settings and sequence of directions, a game always plays
+out the same way, which is what makes compact game replays possible.
+"""
+
+import time
+
+import numpy as np
+
+# Constants
+DEFAULT_INITIAL_ENERGY = 100
+DEFAULT_GRID_SIZE = 25
+DEFAULT_ENERGY_PER_STEP = 1
+DEFAULT_ENERGY_PER_FOOD = 50
+
+class SnakeGameSimulator:
+    """
+    Simulator for the Snake game.
+    This class simulates the Snake game for training the genetic algorithm.
+    """
+    
+    def __init__(self, grid_size=DEFAULT_GRID_SIZE, initial_energy=DEFAULT_INITIAL_ENERGY,
+                 energy_per_step=DEFAULT_ENERGY_PER_STEP, energy_per_food=DEFAULT_ENERGY_PER_FOOD, seed=None,
+                 timers=None):
+        """
+        Initialize the simulator.
+        
+        Args:
+            grid_size (int): Size of the grid.
+            initial_energy (int): Initial energy of the snake.
+            energy_per_step (int): Energy spent on every step without food.
+            energy_per_food (int): Energy gained when eating food.
+            seed (int, optional): Seed of the simulator's random number generator.
+            timers (PhaseTimers, optional): Receives the time spent in calculate_vision.
+        """
+        self.grid_size = grid_size
+        self.initial_energy = initial_energy
+        self.energy_per_step = energy_per_step
+        self.energy_per_food = energy_per_food
+        self.seed = seed
+        self.rng = np.random.RandomState(seed)
+        self.timers = timers
+        self.reset()
+    
+    def reset(self, seed=None):
+        """
+        Reset the game state.
+        
+        Args:
+            seed (int, optional): Reseed the random number generator, making
+                the new game reproducible.
+        """
+        if seed is not None:
+            self.seed = seed
+            self.rng = np.random.RandomState(seed)
+        
+        # Initialize snake at the center of the grid
+        self.snake = []
+        center = self.grid_size // 2
+        for i in range(3):
+            self.snake.append({'x': center - i, 'y': center})
+        
+        # Initialize direction
+        self.direction = {'x': 1, 'y': 0}  # Moving right
+        
+        # Initialize food
+        self.generate_food()
+        
+        # Initialize game state
+        self.score = 0
+        self.steps = 0
+        self.energy = self.initial_energy
+        self.game_over = False
+    
+    def generate_food(self):
+        """Generate food at a random position."""
+        while True:
+            food_x = self.rng.randint(0, self.grid_size)
+            food_y = self.rng.randint(0, self.grid_size)
+            
+            # Check if food is on snake
+            on_snake = False
+            for segment in self.snake:
+                if segment['x'] == food_x and segment['y'] == food_y:
+                    on_snake = True
+                    break
+            
+            if not on_snake:
+                self.food = {'x': food_x, 'y': food_y}
+                break
+    
+    def get_state(self):
+        """
+        Get the current state of the game.
+        
+        Returns:
+            dict: Game state.
+        """
+        head = self.snake[0]
+        
+        # Calculate vision in 8 directions
+        if self.timers is None:
+            vision = self.calculate_vision()
+        else:
+            start = time.perf_counter()
+            vision = self.calculate_vision()
+            self.timers.add('calculate_vision', time.perf_counter() - start)
+        
+        # Calculate food direction and distance
+        food_dx = self.food['x'] - head['x']
+        food_dy = self.food['y'] - head['y']
+        food_distance = np.sqrt(food_dx**2 + food_dy**2)
+        food_angle = np.arctan2(food_dy, food_dx)
+        
+        # Check danger in each direction
+        danger = {
+            'up': self.check_collision({'x': head['x'], 'y': head['y'] - 1}),
+            'down': self.check_collision({'x': head['x'], 'y': head['y'] + 1}),
+            'left': self.check_collision({'x': head['x'] - 1, 'y': head['y']}),
+            'right': self.check_collision({'x': head['x'] + 1, 'y': head['y']})
+        }
+        
+        # Create state dictionary
+        state = {
+            'snake': self.snake.copy(),
+            'food': self.food.copy(),
+            'direction': self.direction.copy(),
+            'energy': self.energy,
+            'score': self.score,
+            'sensors': {
+                'vision': vision,
+                'foodDistance': {
+                    'x': food_dx,
+                    'y': food_dy,
+                    'euclidean': food_distance
+                },
+                'foodAngle': food_angle,
+                'danger': danger
+            }
+        }
+        
+        return state
+    
+    def calculate_vision(self):
+        """
+        Calculate vision in 8 directions.
+        
+        Returns:
+            list: Vision data for 8 directions.
+        """
+        head = self.snake[0]
+        directions = [
+            {'x': 0, 'y': -1},  # Up
+            {'x': 1, 'y': -1},  # Up-Right
+            {'x': 1, 'y': 0},   # Right
+            {'x': 1, 'y': 1},   # Down-Right
+            {'x': 0, 'y': 1},   # Down
+            {'x': -1, 'y': 1},  # Down-Left
+            {'x': -1, 'y': 0},  # Left
+            {'x': -1, 'y': -1}  # Up-Left
+        ]
+        
+        vision = []
+        
+        for direction in directions:
+            x, y = head['x'], head['y']
+            distance = 0
+            found_food = False
+            
+            while True:
+                x += direction['x']
+                y += direction['y']
+                distance += 1
+                
+                # Check if out of bounds
+                if x < 0 or x >= self.grid_size or y < 0 or y >= self.grid_size:
+                    break
+                
+                # Check if hit snake
+                hit_snake = False
+                for segment in self.snake:
+                    if segment['x'] == x and segment['y'] == y:
+                        hit_snake = True
+                        break
+                
+                if hit_snake:
+                    break
+                
+                # Check if found food
+                if self.food['x'] == x and self.food['y'] == y:
+                    found_food = True
+            
+            vision.append({
+                'distance': distance,
+                'foundFood': found_food
+            })
+        
+        return vision
+    
+    def check_collision(self, position):
+        """
+        Check if a position collides with walls or snake body.
+        
+        Args:
+            position (dict): Position to check.
+            
+        Returns:
+            bool: True if collision, False otherwise.
+        """
+        # Check wall collision
+        if (position['x'] < 0 or position['x'] >= self.grid_size or
+                position['y'] < 0 or position['y'] >= self.grid_size):
+            return True
+        
+        # Check self collision (skip the tail as it will move)
+        for i in range(len(self.snake) - 1):
+            if position['x'] == self.snake[i]['x'] and position['y'] == self.snake[i]['y']:
+                return True
+        
+        return False
+    
+    def apply_action(self, action):
+        """
+        Apply an action to the snake.
+        
+        Args:
+            action (str): Action to apply ('up', 'down', 'left', 'right').
+        """
+        # Convert action to direction
+        if action == 'up' and self.direction['y'] != 1:
+            self.direction = {'x': 0, 'y': -1}
+        elif action == 'down' and self.direction['y'] != -1:
+            self.direction = {'x': 0, 'y': 1}
+        elif action == 'left' and self.direction['x'] != 1:
+            self.direction = {'x': -1, 'y': 0}
+        elif action == 'right' and self.direction['x'] != -1:
+            self.direction = {'x': 1, 'y': 0}
+    
+    def step(self):
+        """
+        Advance the game by one step.
+        
+        Returns:
+            bool: True if game over, False otherwise.
+        """
+        if self.game_over:
+            return True
+        
+        # Calculate new head position
+        head = self.snake[0]
+        new_head = {
+            'x': head['x'] + self.direction['x'],
+            'y': head['y'] + self.direction['y']
+        }
+        
+        # Check for collisions
+        if self.check_collision(new_head):
+            self.game_over = True
+            return True
+        
+        # Add new head
+        self.snake.insert(0, new_head)
+        
+        # Check if snake ate food
+        if new_head['x'] == self.food['x'] and new_head['y'] == self.food['y']:
+            self.score += 1
+            self.energy += self.energy_per_food  # Energy boost from food
+            self.generate_food()
+        else:
+            # Remove tail if no food was eaten
+            self.snake.pop()
+            
+            # Decrease energy
+            self.energy -= self.energy_per_step
+            if self.energy <= 0:
+                self.game_over = True
+                return True
+        
+        # Increment steps
+        self.steps += 1
+        
+        return False
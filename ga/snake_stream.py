@@ -0,0 +1,38 @@
+"""
+Snake Game Streaming Sink
+
+Agents and the GA publish the frames of live games through a sink instead
+of importing the web stack, so the core modules (agent, network, simulator,
+GA) never import Flask, Socket.IO or webbrowser.
+
+A sink is any object with:
+
+    update_state(agent_id, game_state, status)   # a frame of a running game
+    reset(agent_id)                              # the game ended
+
+Without a sink, games are not streamed. The SnakeMach server
+(``ga.snake_mach``) installs itself as the sink when it is imported; a sink
+can also be passed to a single game (``Agent.play_game(..., sink=...)``).
+"""
+
+_sink = None
+
+
+def set_stream_sink(sink):
+    """
+    Install the sink receiving the frames of every game played without an explicit sink.
+
+    Args:
+        sink: Object with update_state and reset methods, or None to stop streaming.
+
+    Returns:
+        The previously installed sink.
+    """
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def get_stream_sink():
+    """Get the installed sink (None when games are not streamed)."""
+    return _sink
@@ -103,7 +103,7 @@ class TrainingJourney:
         )
         
         # Inicializar sistema de armazenamento de dados
-        self.data_manager = TrainingData(data_dir=self.config["data_dir"])
+        self.data_manager = TrainingData(data_dir=self.config["data_dir"], config=self.config)
         
         # Registrar configuração inicial
         self._record_config()
@@ -0,0 +1,589 @@
+"""
+Snake Game Genetic Algorithm Training Service
+
+This module runs training sessions as jobs on a pool of pre-warmed worker
+processes. Each worker is started once, imports the training modules (NumPy,
+the GA, the simulator) and then runs jobs one after another, so starting a
+job costs a message instead of a new interpreter and its imports.
+
+Several jobs run at once, one per worker. Each job has a worker budget: the
+number of processes it may use to evaluate agents. The service has a CPU
+capacity (one CPU per evaluating process) and schedules jobs as follows:
+
+- A queued job starts when a worker is idle and every running job can still
+  get at least one CPU. Jobs start in submission order.
+- The capacity is divided between the running jobs with max-min fairness:
+  every job gets an equal share, capped at its budget, and the CPUs a job
+  cannot use go to the others. Shares are recomputed whenever a job starts,
+  ends, pauses or resumes, and applied by the jobs at generation boundaries.
+
+Jobs go through the states:
+
+    queued -> running <-> paused -> finished | stopped | failed
+    queued | running | paused -> cancelled
+
+Workers are ``python -m ga.snake_ga_training --worker`` processes talking
+to the service with the line-delimited JSON messages of snake_ipc.
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .snake_ga_data import get_session_catalog
+from .snake_ipc import TrainingProcess
+
+# CPUs shared by the evaluation processes of the running jobs
+DEFAULT_CAPACITY = int(os.environ.get('SNAKE_TRAINING_CPUS', 0)) or os.cpu_count() or 1
+# Number of worker processes kept warm by default (the maximum number of concurrent jobs)
+DEFAULT_WORKERS = int(os.environ.get('SNAKE_TRAINING_WORKERS', 0)) or min(4, DEFAULT_CAPACITY)
+# Finished jobs kept for the status API
+MAX_FINISHED_JOBS = 100
+# Seconds between checks that the worker processes are alive
+WORKER_CHECK_INTERVAL = 1.0
+
+JOB_STATES = ('queued', 'running', 'paused', 'finished', 'stopped', 'failed', 'cancelled')
+FINAL_STATES = ('finished', 'stopped', 'failed', 'cancelled')
+
+
+def fair_shares(budgets, capacity):
+    """
+    Divide CPUs between jobs with max-min fairness.
+
+    Args:
+        budgets (dict): Worker budget of every job, by job ID, in priority order.
+        capacity (int): CPUs to divide.
+
+    Returns:
+        dict: Share of every job (at least 1 CPU each).
+    """
+    shares = {}
+    remaining = capacity
+    pending = sorted(budgets, key=lambda job_id: budgets[job_id])
+    # Jobs whose budget is below the fair share get their whole budget
+    while pending and budgets[pending[0]] <= remaining // len(pending):
+        job_id = pending.pop(0)
+        shares[job_id] = budgets[job_id]
+        remaining -= budgets[job_id]
+    # The others split the rest equally, the spare CPUs going to the older jobs
+    pending = [job_id for job_id in budgets if job_id in pending]
+    for i, job_id in enumerate(pending):
+        extra = 1 if i < remaining % len(pending) else 0
+        shares[job_id] = max(1, remaining // len(pending) + extra)
+    return shares
+
+
+class TrainingJob:
+    """
+    A training session queued on or run by the training service.
+    """
+
+    def __init__(self, job_id, config):
+        """
+        Initialize a job.
+
+        Args:
+            job_id (str): ID of the job.
+            config (dict): Training configuration (see snake_ga_training.DEFAULT_CONFIG).
+                ``workers`` is the job's worker budget.
+        """
+        self.id = job_id
+        self.config = dict(config)
+        self.workers = max(1, int(self.config.get('workers') or 1))
+        self.config['workers'] = self.workers
+        self.share = None
+        self.state = 'queued'
+        self.worker = None
+        self.session_id = None
+        self.last_generation = None
+        self.error = None
+        # Profiling captures saved by the job (see snake_ga_profiling)
+        self.profiles = []
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        # State to report when the job ends after a stop or cancel request
+        self.final_state = None
+        
+        # Throughput: agent-games played (population x games per agent every generation)
+        self.games_per_generation = int(self.config.get('population') or 0) * int(self.config.get('games') or 0)
+        self.agent_games = 0
+        self.agent_games_per_sec = None
+        self.busy_time = 0.0
+        self._last_progress_at = None
+        # Depth of the job's evaluation and persistence queues, as last reported by its worker
+        self.queue_depths = {'evaluation': 0, 'persistence': 0}
+
+    @property
+    def done(self):
+        return self.state in FINAL_STATES
+
+    @property
+    def avg_agent_games_per_sec(self):
+        return self.agent_games / self.busy_time if self.busy_time > 0 else None
+
+    def record_progress(self, event_type, now=None):
+        """
+        Update the throughput of the job with one of its events.
+
+        Time spent paused or starting up is not counted.
+
+        Args:
+            event_type (str): Type of the event.
+            now (float, optional): Time of the event.
+        """
+        now = now or time.time()
+        if event_type == 'generation' and self._last_progress_at is not None:
+            elapsed = now - self._last_progress_at
+            self.agent_games += self.games_per_generation
+            self.busy_time += elapsed
+            if elapsed > 0:
+                self.agent_games_per_sec = self.games_per_generation / elapsed
+        if event_type in ('started', 'resumed', 'generation'):
+            self._last_progress_at = now
+        elif event_type == 'paused':
+            self._last_progress_at = None
+
+    def to_dict(self):
+        """
+        Convert the job to a JSON-serialisable dict.
+
+        Returns:
+            dict: Job status.
+        """
+        return {
+            'job_id': self.id,
+            'state': self.state,
+            'config': self.config,
+            'worker': self.worker,
+            'workers': self.workers,
+            'share': self.share,
+            'agent_games': self.agent_games,
+            'agent_games_per_sec': self.agent_games_per_sec,
+            'avg_agent_games_per_sec': self.avg_agent_games_per_sec,
+            'session_id': self.session_id,
+            'generation': self.last_generation,
+            'profiles': self.profiles,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class _Worker:
+    """Service-side handle of a worker process."""
+
+    def __init__(self, worker_id):
+        self.id = worker_id
+        self.process = None
+        self.ready = False
+        self.job_id = None
+
+
+class TrainingService:
+    """
+    Pool of pre-warmed training worker processes and a queue of training jobs.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, capacity=DEFAULT_CAPACITY, on_event=None, cwd=None,
+                 data_dir='../data'):
+        """
+        Start the worker processes.
+
+        Args:
+            workers (int): Number of worker processes (concurrent jobs).
+            capacity (int): CPUs shared by the evaluation processes of the running jobs.
+            on_event (callable, optional): Called with every job event (started,
+                generation, paused, resumed, checkpoint, stopped, finished, error),
+                each with a ``job_id`` field.
+            cwd (str, optional): Working directory of the workers.
+            data_dir (str): Data directory of the workers, relative to their working directory.
+        """
+        self.capacity = max(1, int(capacity))
+        self.on_event = on_event
+        self.cwd = cwd
+        self.data_dir = os.path.join(cwd, data_dir) if cwd else data_dir
+        self.jobs = OrderedDict()
+        self._queue = deque()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._closed = False
+        # (session ID, status) of ended jobs whose catalog entry is still to be closed
+        self._ended_sessions = []
+
+        self._workers = [_Worker(i) for i in range(max(1, int(workers)))]
+        for worker in self._workers:
+            self._start_worker(worker)
+        self._monitor = threading.Thread(target=self._check_workers, name='training-service', daemon=True)
+        self._monitor.start()
+
+    def _start_worker(self, worker):
+        worker.ready = False
+        worker.job_id = None
+        worker.process = TrainingProcess(
+            ['--worker'],
+            on_event=lambda event: self._handle_event(worker, event),
+            on_output=lambda line: print(f"[training-worker-{worker.id}] {line}"),
+            cwd=self.cwd
+        )
+
+    def submit(self, config):
+        """
+        Queue a training job.
+
+        Args:
+            config (dict): Training configuration. ``workers`` (the job's worker
+                budget) is capped at the capacity of the service.
+
+        Returns:
+            TrainingJob: The queued job.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Training service is shut down")
+            config = dict(config, workers=min(self.capacity, max(1, int(config.get('workers') or 1))))
+            job = TrainingJob(f'{time.strftime("%Y%m%d%H%M%S")}-{next(self._ids)}', config)
+            self.jobs[job.id] = job
+            self._queue.append(job.id)
+            self._prune_jobs()
+            self._dispatch()
+        return job
+
+    def get(self, job_id):
+        """
+        Get a job by ID.
+
+        Args:
+            job_id (str): ID of the job.
+
+        Returns:
+            TrainingJob: The job, or None if unknown.
+        """
+        return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        """
+        List the jobs, oldest first.
+
+        Returns:
+            list: Job status dicts.
+        """
+        with self._lock:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def queue_position(self, job_id):
+        """
+        Get the position of a queued job (0 for the next job to start).
+
+        Args:
+            job_id (str): ID of the job.
+
+        Returns:
+            int: Position in the queue, or None if the job is not queued.
+        """
+        with self._lock:
+            try:
+                return self._queue.index(job_id)
+            except ValueError:
+                return None
+
+    def active_job(self):
+        """
+        Get the most recently submitted running job or, if none is running,
+        the next queued job.
+
+        Returns:
+            TrainingJob: The job, or None.
+        """
+        with self._lock:
+            for job in reversed(self.jobs.values()):
+                if job.state in ('running', 'paused'):
+                    return job
+            return self.jobs[self._queue[0]] if self._queue else None
+
+    def send(self, job_id, command_type, **data):
+        """
+        Send a command (pause, resume, checkpoint, stop or profile) to a running job.
+
+        Args:
+            job_id (str): ID of the job.
+            command_type (str): Type of the command.
+            **data: Command fields.
+
+        Returns:
+            bool: False if the job is not running.
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.state not in ('running', 'paused'):
+                return False
+            if command_type == 'stop' and job.final_state is None:
+                job.final_state = 'stopped'
+            process = self._workers[job.worker].process
+        return process.send(command_type, job_id=job_id, **data)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. Queued jobs are dropped; running jobs stop at the end of
+        the current generation, with their session saved.
+
+        Args:
+            job_id (str): ID of the job.
+
+        Returns:
+            bool: False if the job is unknown or has already ended.
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.done:
+                return False
+            if job.state == 'queued':
+                # Not started: no session to end
+                self._queue.remove(job_id)
+                self._finish(job, 'cancelled')
+                return True
+            job.final_state = 'cancelled'
+        return self.send(job_id, 'stop', reason='cancelled')
+
+    def terminate(self, job_id):
+        """
+        Kill the worker running a job without waiting for a generation boundary.
+        A fresh worker takes its place.
+
+        Args:
+            job_id (str): ID of the job.
+
+        Returns:
+            bool: False if the job is not running.
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.state not in ('running', 'paused'):
+                return False
+            worker = self._workers[job.worker]
+            process = worker.process
+            job.final_state = job.final_state or 'stopped'
+        process.terminate()
+        with self._lock:
+            if worker.process is process:
+                self._replace_worker(worker)
+        self._end_sessions()
+        return True
+
+    def wait(self, job_id, timeout=None):
+        """
+        Wait for a job to end.
+
+        Args:
+            job_id (str): ID of the job.
+            timeout (float, optional): Seconds to wait.
+
+        Returns:
+            bool: True if the job has ended.
+        """
+        with self._changed:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return False
+            return self._changed.wait_for(lambda: job.done, timeout)
+
+    def metrics(self):
+        """
+        Get counts of workers and jobs.
+
+        Returns:
+            dict: Workers (total, ready, busy), CPU capacity and allocated shares,
+            jobs per state, the total throughput of the running jobs and the
+            depth of their evaluation and persistence queues.
+        """
+        with self._lock:
+            states = {state: 0 for state in JOB_STATES}
+            for job in self.jobs.values():
+                states[job.state] += 1
+            active = [job for job in self.jobs.values() if job.state in ('running', 'paused')]
+            return {
+                'workers': len(self._workers),
+                'workers_ready': sum(1 for worker in self._workers if worker.ready),
+                'workers_busy': sum(1 for worker in self._workers if worker.job_id is not None),
+                'queued': len(self._queue),
+                'capacity': self.capacity,
+                'allocated': sum(job.share or 0 for job in self.jobs.values() if job.state == 'running'),
+                'agent_games_per_sec': sum(job.agent_games_per_sec or 0 for job in self.jobs.values()
+                                           if job.state == 'running'),
+                'evaluation_queue_depth': sum(job.queue_depths['evaluation'] for job in active),
+                'persistence_queue_depth': sum(job.queue_depths['persistence'] for job in active),
+                'jobs': states
+            }
+
+    def shutdown(self, timeout=None):
+        """
+        Stop the service: queued jobs are cancelled, running jobs stop at their
+        next generation boundary and the workers exit.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each worker before killing it.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            while self._queue:
+                self._finish(self.jobs[self._queue.popleft()], 'cancelled')
+            processes = [worker.process for worker in self._workers]
+        for process in processes:
+            process.close()
+        for process in processes:
+            if process.wait(timeout) is None:
+                process.terminate()
+        with self._lock:
+            for worker in self._workers:
+                self._fail_job(worker)
+        self._end_sessions()
+
+    def _dispatch(self):
+        # Called with the lock held: start queued jobs on idle workers, then rebalance the shares
+        occupied = sum(1 for job in self.jobs.values() if job.state in ('running', 'paused'))
+        started = []
+        for worker in self._workers:
+            if not self._queue or occupied >= self.capacity:
+                break
+            if not worker.ready or worker.job_id is not None:
+                continue
+            job = self.jobs[self._queue.popleft()]
+            worker.job_id = job.id
+            job.worker = worker.id
+            job.state = 'running'
+            job.started_at = time.time()
+            occupied += 1
+            started.append((worker, job))
+
+        shares = self._rebalance()
+        for worker, job in started:
+            if not worker.process.send('job', job_id=job.id, config=job.config, share=shares[job.id]):
+                # The worker died: the job goes back to the head of the queue
+                worker.job_id = None
+                job.worker = job.started_at = job.share = None
+                job.state = 'queued'
+                self._queue.appendleft(job.id)
+        if started:
+            self._changed.notify_all()
+
+    def _rebalance(self):
+        # Called with the lock held: divide the capacity between the running jobs
+        running = OrderedDict((job.id, job.workers) for job in self.jobs.values() if job.state == 'running')
+        shares = fair_shares(running, self.capacity) if running else {}
+        for job_id, share in shares.items():
+            job = self.jobs[job_id]
+            if job.share is not None and job.share != share:
+                self._workers[job.worker].process.send('share', job_id=job_id, workers=share)
+            job.share = share
+        return shares
+
+    def _finish(self, job, state, error=None):
+        # Called with the lock held
+        job.state = state
+        job.error = error
+        job.finished_at = time.time()
+        if job.session_id is not None:
+            self._ended_sessions.append((job.session_id, 'failed' if state == 'failed' else 'stopped'))
+        self._changed.notify_all()
+
+    def _end_sessions(self):
+        # Called without the lock, after _finish: a job that fails or is cut short leaves its
+        # session active in the catalog; sessions saved by the worker are already completed
+        # and left as they are. The SQLite write does not hold up the other jobs' events.
+        with self._lock:
+            ended, self._ended_sessions = self._ended_sessions, []
+        for session_id, status in ended:
+            try:
+                get_session_catalog(self.data_dir).end(session_id, status)
+            except Exception as e:
+                print(f"Error ending session {session_id}: {e}")
+
+    def _prune_jobs(self):
+        # Called with the lock held: forget the oldest ended jobs
+        ended = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in ended[:max(0, len(ended) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _fail_job(self, worker):
+        # Called with the lock held: end the job of a worker that exited
+        job = self.jobs.get(worker.job_id)
+        worker.job_id = None
+        if job is not None and not job.done:
+            if job.final_state:
+                self._finish(job, job.final_state)
+            else:
+                self._finish(job, 'failed', f'Worker exited with code {worker.process.process.returncode}')
+
+    def _replace_worker(self, worker):
+        # Called with the lock held: end the worker's job and start a fresh worker
+        self._fail_job(worker)
+        if not self._closed:
+            self._start_worker(worker)
+            self._dispatch()
+
+    def _check_workers(self):
+        while not self._closed:
+            time.sleep(WORKER_CHECK_INTERVAL)
+            with self._lock:
+                for worker in self._workers:
+                    if not worker.process.is_alive() and not self._closed:
+                        self._replace_worker(worker)
+            self._end_sessions()
+
+    def _handle_event(self, worker, event):
+        event_type = event.get('type')
+        with self._lock:
+            if event_type == 'ready':
+                worker.ready = True
+                self._dispatch()
+                return
+
+            job = self.jobs.get(event.get('job_id'))
+            if job is None or job.worker != worker.id:
+                return
+            job.record_progress(event_type)
+            if event_type == 'job_done':
+                if worker.job_id == job.id:
+                    worker.job_id = None
+                if not job.done:
+                    if event.get('error'):
+                        self._finish(job, 'failed', event['error'])
+                    else:
+                        self._finish(job, job.final_state or 'finished')
+                self._dispatch()
+            elif event_type == 'started':
+                job.session_id = event.get('session_id')
+            elif event_type == 'generation':
+                job.last_generation = event.get('record')
+            elif event_type == 'queues':
+                job.queue_depths = {queue: int(event.get(queue) or 0) for queue in job.queue_depths}
+            elif event_type == 'profile':
+                job.profiles.append({key: event.get(key) for key in
+                                     ('first_generation', 'last_generation', 'samples', 'pstats', 'collapsed')})
+            elif event_type == 'paused':
+                job.state = 'paused'
+                self._rebalance()
+            elif event_type == 'resumed':
+                job.state = 'running'
+                self._rebalance()
+            elif event_type == 'finished':
+                self._finish(job, 'finished')
+                self._dispatch()
+            elif event_type == 'stopped':
+                self._finish(job, job.final_state or 'stopped')
+                self._dispatch()
+            self._changed.notify_all()
+
+        self._end_sessions()
+        # job_done is internal to the service
+        if self.on_event is not None and event_type != 'job_done':
+            try:
+                self.on_event(event)
+            except Exception as e:
+                print(f"Error handling training event: {e}")
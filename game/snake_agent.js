@@ -29,6 +29,18 @@ let aiMode = false;
 let showSensors = false;
 let sensorData = {};
 const socket = io();
+// Watch live games streamed by SnakeMach (snake_agent.html?agent=true[&channel=<agent or session id>]).
+// SnakeMach is a separate server; its client (game/snake_frames.js) must be loaded first.
+const pageParams = new URLSearchParams(window.location.search);
+const watchMode = pageParams.get('agent') === 'true';
+const watchChannel = pageParams.get('channel') || '*';
+let liveSocket = null;
+let liveGame = null;
+if (watchMode) {
+    liveSocket = SnakeFrames.connectSnakeMach(io);
+    liveGame = SnakeFrames.createGameFrameDecoder(channel => liveSocket.emit('request_keyframe', { channel: channel }));
+    liveSocket.on('connect', () => liveSocket.emit('subscribe', { channel: watchChannel }));
+}
 // DOM elements
 let startBtn, resetBtn, toggleSensorsBtn, toggleAiBtn;
 let sensorDisplay;
@@ -612,6 +624,26 @@ function getAIAction(state) {
     return 'right'; // Default
 }
 
+// Render live frames while no local game is running
+if (watchMode) {
+    liveSocket.on('game_update', function(frame) {
+        const update = liveGame(frame);
+        if (!update || gameInterval) return;
+        
+        snake = update.state.snake;
+        food = update.state.food;
+        direction = update.state.direction || direction;
+        score = update.state.score;
+        energy = update.state.energy;
+        gameOver = update.status !== 'EM ANDAMENTO';
+        
+        // Sensors are not streamed in deltas: recompute them from the snake and food
+        updateSensors();
+        updateDisplays();
+        drawGame();
+    });
+}
+
 // Export functions for external use (e.g., by the genetic algorithm)
 window.snakeGame = {
     getSnakeState: getSnakeState,
@@ -0,0 +1,72 @@
+// Client side of the SnakeMach live game stream (ga/snake_mach.py).
+//
+// Shared by the game page (game/snake_agent.js, loaded as a plain script:
+// window.SnakeFrames) and the dashboard (dashboard/AgentVisualization.jsx,
+// imported as a module).
+(function (root, factory) {
+    if (typeof module === 'object' && module.exports) {
+        module.exports = factory(root);
+    } else {
+        root.SnakeFrames = factory(root);
+    }
+}(typeof self !== 'undefined' ? self : this, function (root) {
+    // SnakeMach runs its own Socket.IO server, separate from app.py
+    const DEFAULT_SNAKE_MACH_PORT = 5000;
+
+    // Address of the SnakeMach server: window.SNAKE_MACH_URL, or the page's host on the default port
+    function snakeMachUrl() {
+        if (root.SNAKE_MACH_URL) {
+            return root.SNAKE_MACH_URL;
+        }
+        return root.location.protocol + '//' + root.location.hostname + ':' + DEFAULT_SNAKE_MACH_PORT;
+    }
+
+    // Open a Socket.IO connection to SnakeMach (io defaults to the global socket.io client)
+    function connectSnakeMach(io) {
+        return (io || root.io)(snakeMachUrl());
+    }
+
+    // Decode SnakeMach 'game_update' frames.
+    // A keyframe carries the full state; a delta carries the new head cells
+    // (newest first), the number of cells removed from the tail and the fields
+    // that changed. Every channel has its own sequence number: on a gap the
+    // decoder drops deltas until a new keyframe arrives and calls onGap with
+    // the channel, so the caller can ask for one ('request_keyframe').
+    function createGameFrameDecoder(onGap) {
+        const channels = {};
+
+        return function decode(frame) {
+            if (frame.type === 'keyframe') {
+                const state = Object.assign({}, frame.state, { snake: frame.state.snake.slice() });
+                channels[frame.channel] = { seq: frame.seq, state: state };
+                return { agentId: frame.agent_id, channel: frame.channel, status: frame.status, state: state };
+            }
+
+            const channel = channels[frame.channel];
+            if (!channel || frame.seq !== channel.seq + 1) {
+                delete channels[frame.channel];
+                if (onGap) {
+                    onGap(frame.channel);
+                }
+                return null;
+            }
+
+            const state = channel.state;
+            state.snake = frame.head.concat(state.snake.slice(0, state.snake.length - frame.tail));
+            ['food', 'direction', 'score', 'energy'].forEach(function (field) {
+                if (field in frame) {
+                    state[field] = frame[field];
+                }
+            });
+            channel.seq = frame.seq;
+            return { agentId: frame.agent_id, channel: frame.channel, status: frame.status, state: state };
+        };
+    }
+
+    return {
+        DEFAULT_SNAKE_MACH_PORT: DEFAULT_SNAKE_MACH_PORT,
+        snakeMachUrl: snakeMachUrl,
+        connectSnakeMach: connectSnakeMach,
+        createGameFrameDecoder: createGameFrameDecoder
+    };
+}));
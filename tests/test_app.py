@@ -0,0 +1,140 @@
+"""Tests for the web server (app.py)."""
+
+import unittest
+from unittest import mock
+
+try:
+    import app
+except ImportError:  # Flask, or the journey modules app.py registers, are missing
+    app = None
+
+
+class FakeService:
+    """Training service stub listing jobs with the given sessions."""
+
+    def __init__(self, session_ids):
+        self.session_ids = session_ids
+
+    def list_jobs(self):
+        return [{'session_id': session_id} for session_id in self.session_ids]
+
+
+def _active(*session_ids):
+    return [{'session_id': session_id} for session_id in session_ids]
+
+
+@unittest.skipIf(app is None, 'app.py cannot be imported')
+class GenerationFollowerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.start_task = mock.patch.object(app.socketio, 'start_background_task').start()
+        self.sessions = mock.patch.object(app.snake_ga_data, 'list_training_sessions').start()
+        mock.patch.object(app, 'training_service', FakeService(['session_owned', None])).start()
+        mock.patch.object(app, 'generation_follower', None).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_not_started_without_sessions(self):
+        self.sessions.return_value = []
+        app.start_generation_follower()
+        self.start_task.assert_not_called()
+
+    def test_not_started_for_service_sessions(self):
+        self.sessions.return_value = _active('session_owned')
+        app.start_generation_follower()
+        self.start_task.assert_not_called()
+
+    def test_started_for_external_sessions(self):
+        self.sessions.return_value = _active('session_owned', 'session_external')
+        app.start_generation_follower()
+        app.start_generation_follower()
+        self.start_task.assert_called_once_with(app.follow_generation_logs)
+        self.assertEqual(app.external_sessions(), ['session_external'])
+
+    def test_follower_polls_external_sessions_only_and_stops(self):
+        self.sessions.side_effect = [_active('session_owned', 'session_external'), _active('session_owned')]
+        app.generation_follower = object()
+        with mock.patch.object(app.snake_ga_data, 'get_generation_log_version', return_value=None) as version, \
+                mock.patch.object(app.socketio, 'sleep'):
+            app.follow_generation_logs()
+
+        version.assert_called_once_with('session_external')
+        self.assertIsNone(app.generation_follower)
+
+    def test_service_generations_are_published_from_events(self):
+        event = {'type': 'generation', 'session_id': 'session_owned', 'record': {'generation': 3}}
+        with mock.patch.object(app.socketio, 'emit') as emit, \
+                mock.patch.dict(app.generations_sent, clear=True):
+            app.handle_training_event(event)
+            app.handle_training_event(event)
+
+        self.assertEqual([call.kwargs['to'] for call in emit.call_args_list],
+                         ['generations:session_owned', 'generations:*'])
+
+
+
+@unittest.skipIf(app is None, 'app.py cannot be imported')
+class CachedJsonResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = app.snake_ga_data.LRUCache(max_entries=8)
+        mock.patch.object(app, 'response_cache', self.cache).start()
+        self.addCleanup(mock.patch.stopall)
+        self.build = mock.Mock(return_value=({'generation': 3}, {'X-Data-Version': '7'}))
+
+    def _get(self, version, path='/api/data?b=2&a=1', headers=None):
+        with app.app.test_request_context(path, headers=headers):
+            return app.cached_json_response(version, self.build)
+
+    def test_response_has_an_etag_and_the_built_body(self):
+        response = self._get(7)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {'generation': 3})
+        self.assertEqual(response.headers['X-Data-Version'], '7')
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        self.assertIsNotNone(response.get_etag()[0])
+
+    def test_etag_depends_on_request_and_version(self):
+        etag = self._get(7).get_etag()[0]
+
+        self.assertEqual(self._get(7, path='/api/data?a=1&b=2').get_etag()[0], etag)
+        self.assertNotEqual(self._get(8).get_etag()[0], etag)
+        self.assertNotEqual(self._get(7, path='/api/data?a=1').get_etag()[0], etag)
+        self.assertNotEqual(self._get(7, path='/api/other?b=2&a=1').get_etag()[0], etag)
+
+    def test_matching_etag_gets_a_304(self):
+        etag = self._get(7).get_etag()[0]
+        self.build.reset_mock()
+
+        response = self._get(7, headers={'If-None-Match': f'"{etag}"'})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_etag()[0], etag)
+        self.assertEqual(response.get_data(), b'')
+        self.build.assert_not_called()
+
+    def test_stale_etag_gets_the_new_body(self):
+        etag = self._get(7).get_etag()[0]
+
+        response = self._get(8, headers={'If-None-Match': f'"{etag}"'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.get_etag()[0], etag)
+
+    def test_body_is_built_once(self):
+        first = self._get(7)
+        second = self._get(7)
+
+        self.build.assert_called_once()
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_not_found(self):
+        self.build.return_value = (None, None)
+
+        self.assertIsNone(self._get(7))
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
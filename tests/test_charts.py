@@ -0,0 +1,71 @@
+"""Tests for the dashboard chart downsampling."""
+
+import unittest
+
+import numpy as np
+
+from ga.snake_ga_charts import downsample_charts, downsample_records, lttb_indices
+
+
+class LttbIndicesTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.arange(1000)
+        self.y = np.cumsum(rng.normal(size=1000))
+
+    def test_keeps_endpoints(self):
+        for threshold in (3, 10, 100, 999):
+            indices = lttb_indices(self.x, self.y, threshold)
+            self.assertEqual(indices[0], 0)
+            self.assertEqual(indices[-1], len(self.x) - 1)
+
+    def test_length_and_order(self):
+        for threshold in (3, 4, 10, 257, 999):
+            indices = lttb_indices(self.x, self.y, threshold)
+            self.assertEqual(len(indices), threshold)
+            self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_keeps_spikes(self):
+        y = np.zeros(1000)
+        y[500] = 100.0
+
+        self.assertIn(500, lttb_indices(self.x, y, 20).tolist())
+
+    def test_threshold_at_least_length(self):
+        np.testing.assert_array_equal(lttb_indices(self.x[:10], self.y[:10], 10), np.arange(10))
+        np.testing.assert_array_equal(lttb_indices(self.x[:10], self.y[:10], 50), np.arange(10))
+        self.assertEqual(len(lttb_indices([], [], 5)), 0)
+
+    def test_small_thresholds(self):
+        self.assertEqual(lttb_indices(self.x, self.y, 2).tolist(), [0, 999])
+        self.assertEqual(lttb_indices(self.x, self.y, 1).tolist(), [0])
+        self.assertEqual(lttb_indices(self.x, self.y, 0).tolist(), [])
+
+
+class DownsampleTest(unittest.TestCase):
+
+    def test_records_share_generations(self):
+        records = [{'generation': g, 'best_fitness': float(g % 7), 'max_size': g} for g in range(100)]
+
+        selected = downsample_records(records, 10)
+
+        self.assertEqual(len(selected), 10)
+        self.assertEqual(selected[0], records[0])
+        self.assertEqual(selected[-1], records[-1])
+        self.assertTrue(all(record['max_size'] == record['generation'] for record in selected))
+        self.assertEqual(downsample_records(records[:5], 10), records[:5])
+
+    def test_charts_share_generations(self):
+        charts = {'generations': list(range(100)), 'best_fitness': [float(g % 7) for g in range(100)],
+                  'max_sizes': list(range(100))}
+
+        downsampled = downsample_charts(charts, 10)
+
+        self.assertEqual(downsampled['generations'], downsampled['max_sizes'])
+        self.assertEqual(len(downsampled['best_fitness']), 10)
+        self.assertIs(downsample_charts(charts, 100), charts)
+
+
+if __name__ == '__main__':
+    unittest.main()
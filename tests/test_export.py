@@ -0,0 +1,110 @@
+"""Tests for the streaming session exports."""
+
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from ga.snake_ga_data import GenerationLog, WeightArchive, archive_session
+from ga.snake_ga_export import gzip_chunks, iter_session_export
+
+SESSION_ID = '20240102_030405'
+GENERATIONS = 30
+N_WEIGHTS = 7
+
+
+def _record(generation):
+    record = {'generation': generation, 'best_fitness': generation * 2.5, 'avg_fitness': generation / 4,
+              'max_size': 3 + generation // 3, 'note': f'gen {generation}'}
+    if generation == 5:
+        # Records written by older versions can lack a field
+        del record['avg_fitness']
+    return record
+
+
+class SessionExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self._tmp.name
+        self.session_dir = os.path.join(self.data_dir, f'session_{SESSION_ID}')
+        os.makedirs(self.session_dir)
+
+        log = GenerationLog(self.session_dir)
+        archive = WeightArchive(self.session_dir, mode='w', initial_capacity=GENERATIONS)
+        self.weights = np.arange(GENERATIONS * N_WEIGHTS, dtype=np.float64).reshape(GENERATIONS, N_WEIGHTS)
+        for generation in range(GENERATIONS):
+            log.append(_record(generation))
+            archive.append(generation, self.weights[generation], generation * 2.5, generation, 10 * generation)
+        log.close()
+        archive.flush()
+        # A record cut short by a crash is not exported
+        with open(log.jsonl_path, 'ab') as f:
+            f.write(b'{"generation": 30, "best_')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _export(self, export_format):
+        return b''.join(iter_session_export(SESSION_ID, export_format, self.data_dir))
+
+    def test_jsonl(self):
+        lines = self._export('jsonl').decode('utf-8').splitlines()
+
+        self.assertEqual([json.loads(line) for line in lines[:GENERATIONS]],
+                         [_record(g) for g in range(GENERATIONS)])
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self._export('csv').decode('utf-8'))))
+
+        self.assertEqual(len(rows), GENERATIONS)
+        self.assertEqual(rows[3], {'generation': '3', 'best_fitness': '7.5', 'avg_fitness': '0.75',
+                                   'max_size': '4', 'note': 'gen 3'})
+        self.assertEqual(rows[5]['avg_fitness'], '')
+
+    def _check_npz(self, data):
+        with np.load(io.BytesIO(data)) as npz:
+            self.assertEqual(sorted(npz.files), ['avg_fitness', 'best_fitness', 'best_weights',
+                                                 'best_weights_index', 'generation', 'max_size'])
+            np.testing.assert_array_equal(npz['generation'], np.arange(GENERATIONS))
+            self.assertEqual(npz['generation'].dtype, np.int64)
+            np.testing.assert_array_equal(npz['best_fitness'], np.arange(GENERATIONS) * 2.5)
+            avg_fitness = npz['avg_fitness']
+            self.assertTrue(np.isnan(avg_fitness[5]))
+            np.testing.assert_array_equal(np.delete(avg_fitness, 5), np.delete(np.arange(GENERATIONS) / 4, 5))
+            np.testing.assert_array_equal(npz['best_weights'], self.weights)
+            np.testing.assert_array_equal(npz['best_weights_index']['generation'], np.arange(GENERATIONS))
+
+    def test_npz(self):
+        self._check_npz(self._export('npz'))
+
+    def test_npz_of_archived_session(self):
+        expected_jsonl = self._export('jsonl')
+        archive_session(SESSION_ID, self.data_dir)
+        self.assertFalse(os.path.isdir(self.session_dir))
+
+        self._check_npz(self._export('npz'))
+        self.assertEqual(self._export('jsonl'), expected_jsonl)
+
+    def test_gzip(self):
+        for export_format in ('jsonl', 'csv', 'npz'):
+            chunks = list(gzip_chunks(iter_session_export(SESSION_ID, export_format, self.data_dir)))
+            self.assertEqual(gzip.decompress(b''.join(chunks)), self._export(export_format))
+
+    def test_gzip_of_empty_stream(self):
+        self.assertEqual(gzip.decompress(b''.join(gzip_chunks([]))), b'')
+
+    def test_unknown_session_or_format(self):
+        with self.assertRaises(FileNotFoundError):
+            iter_session_export('missing', 'csv', self.data_dir)
+        with self.assertRaises(ValueError):
+            iter_session_export(SESSION_ID, 'xlsx', self.data_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
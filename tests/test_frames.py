@@ -0,0 +1,114 @@
+"""Tests for the SnakeMach game_update frames, decoded by game/snake_frames.js."""
+
+import json
+import os
+import shutil
+import subprocess
+import unittest
+
+from tests.test_replay import FIELDS, _play
+
+try:
+    from ga.snake_mach import FrameEncoder
+except ImportError:  # Flask is optional
+    FrameEncoder = None
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Decodes the frames read from stdin, dropping the frames listed in 'drop',
+# and prints the decoded states (null for dropped or rejected frames) and the gaps
+DECODE_SCRIPT = """
+const SnakeFrames = require(process.argv[1]);
+let input = '';
+process.stdin.on('data', chunk => { input += chunk; });
+process.stdin.on('end', () => {
+    const { frames, drop } = JSON.parse(input);
+    const gaps = [];
+    const decode = SnakeFrames.createGameFrameDecoder(channel => gaps.push(channel));
+    const states = frames.map((frame, i) => {
+        if (drop.includes(i)) {
+            return null;
+        }
+        const decoded = decode(frame);
+        return decoded && JSON.parse(JSON.stringify(decoded.state));
+    });
+    process.stdout.write(JSON.stringify({ states, gaps }));
+});
+"""
+
+
+def _decode(frames, drop=()):
+    result = subprocess.run(['node', '-e', DECODE_SCRIPT, os.path.join(REPO_DIR, 'game', 'snake_frames.js')],
+                            input=json.dumps({'frames': frames, 'drop': list(drop)}),
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def _states(seed=42):
+    _, frames = _play(seed)
+    return [{field: frame[field] for field in FIELDS} for frame in frames]
+
+
+@unittest.skipIf(FrameEncoder is None, 'Flask is not installed')
+@unittest.skipIf(shutil.which('node') is None, 'Node.js is not installed')
+class FrameRoundTripTest(unittest.TestCase):
+
+    def _encode(self, encoder, state):
+        return encoder.encode({'agent_id': 'agent_1', 'status': 'playing', 'state': state})
+
+    def test_deltas_rebuild_every_state(self):
+        states = _states()
+        encoder = FrameEncoder(keyframe_interval=50)
+        frames = [self._encode(encoder, state) for state in states]
+
+        self.assertEqual(frames[0]['type'], 'keyframe')
+        self.assertEqual([frame['seq'] for frame in frames], list(range(len(frames))))
+        self.assertGreater(sum(frame['type'] == 'delta' for frame in frames), len(frames) // 2)
+        self.assertTrue(all('state' not in frame for frame in frames if frame['type'] == 'delta'))
+
+        decoded = _decode(frames)
+        self.assertEqual(decoded['gaps'], [])
+        self.assertEqual(decoded['states'], states)
+
+    def test_gap_requests_a_keyframe(self):
+        states = _states()
+        encoder = FrameEncoder(keyframe_interval=1000)
+        frames = [self._encode(encoder, state) for state in states[:20]]
+
+        # Frame 10 is lost: the decoder rejects the deltas after it and reports the gap
+        decoded = _decode(frames, drop=[10])
+        self.assertEqual(decoded['states'][:10], states[:10])
+        self.assertEqual(decoded['states'][10:], [None] * 10)
+        self.assertEqual(decoded['gaps'], ['agent_1'] * 9)
+
+        # The client asks for a keyframe and decoding resumes from it
+        encoder.request_keyframe('agent_1')
+        frames += [self._encode(encoder, state) for state in states[20:30]]
+        self.assertEqual(frames[20]['type'], 'keyframe')
+        self.assertEqual(frames[21]['type'], 'delta')
+
+        decoded = _decode(frames, drop=[10])
+        self.assertEqual(decoded['states'][20:30], states[20:30])
+
+    def test_new_game_is_a_keyframe(self):
+        first, second = _states(seed=1), _states(seed=2)
+        encoder = FrameEncoder()
+        frames = [self._encode(encoder, state) for state in first + second]
+
+        self.assertEqual(frames[len(first)]['type'], 'keyframe')
+        self.assertEqual(_decode(frames)['states'], first + second)
+
+    def test_channels_have_their_own_sequence(self):
+        encoder = FrameEncoder()
+        state = _states()[0]
+        frames = [encoder.encode({'agent_id': agent_id, 'status': 'playing', 'state': state})
+                  for agent_id in ('agent_1', 'agent_2', 'agent_1')]
+
+        self.assertEqual([(frame['channel'], frame['seq']) for frame in frames],
+                         [('agent_1', 0), ('agent_2', 0), ('agent_1', 1)])
+        encoder.forget('agent_1')
+        self.assertEqual(self._encode(encoder, state)['type'], 'keyframe')
+
+
+if __name__ == '__main__':
+    unittest.main()
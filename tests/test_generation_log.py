@@ -0,0 +1,144 @@
+"""Tests for the append-only generation logs and their index."""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from ga.snake_ga_data import (GENERATION_INDEX_DTYPE, GenerationLog, read_generation_index,
+                              read_generation_log, read_generation_range)
+
+
+def _record(generation):
+    return {'generation': generation, 'best_fitness': generation * 1.5, 'max_size': 3 + generation}
+
+
+class GenerationLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.session_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, generations, **kwargs):
+        log = GenerationLog(self.session_dir, **kwargs)
+        for generation in generations:
+            log.append(_record(generation))
+        log.close()
+        return log
+
+    def test_round_trip(self):
+        self._write(range(5))
+
+        self.assertEqual(read_generation_log(self.session_dir), [_record(g) for g in range(5)])
+        with open(os.path.join(self.session_dir, 'generation_data.csv')) as f:
+            self.assertEqual(len(f.read().splitlines()), 6)
+
+    def test_index_points_at_each_record(self):
+        log = self._write(range(5))
+
+        index = read_generation_index(self.session_dir)
+        self.assertEqual(index.dtype, GENERATION_INDEX_DTYPE)
+        self.assertEqual(index['generation'].tolist(), list(range(5)))
+        with open(log.jsonl_path, 'rb') as f:
+            for offset in index['offset']:
+                f.seek(int(offset))
+                self.assertTrue(f.readline().startswith(b'{"generation": '))
+
+    def test_reopened_log_appends(self):
+        self._write(range(3))
+        self._write(range(3, 6))
+
+        self.assertEqual([r['generation'] for r in read_generation_log(self.session_dir)], list(range(6)))
+        self.assertEqual(read_generation_index(self.session_dir)['generation'].tolist(), list(range(6)))
+
+    def test_truncated_last_line_is_ignored(self):
+        log = self._write(range(4))
+        with open(log.jsonl_path, 'ab') as f:
+            f.write(b'{"generation": 4, "best_fit')
+
+        self.assertEqual([r['generation'] for r in read_generation_log(self.session_dir)], list(range(4)))
+
+    def test_truncated_index_entry_is_ignored(self):
+        log = self._write(range(4))
+        with open(log.index_path, 'ab') as f:
+            f.write(b'\x05\x00\x00')
+
+        self.assertEqual(read_generation_index(self.session_dir)['generation'].tolist(), list(range(4)))
+
+    def test_missing_index_is_rebuilt_without_the_truncated_line(self):
+        log = self._write(range(4), write_csv=False)
+        with open(log.jsonl_path, 'ab') as f:
+            f.write(b'{"generation": 4')
+        os.remove(log.index_path)
+
+        index = read_generation_index(self.session_dir)
+        self.assertEqual(index['generation'].tolist(), list(range(4)))
+        self.assertTrue(os.path.exists(log.index_path))
+        np.testing.assert_array_equal(np.fromfile(log.index_path, dtype=GENERATION_INDEX_DTYPE), index)
+
+    def test_legacy_json_log(self):
+        with open(os.path.join(self.session_dir, 'generation_data.json'), 'w') as f:
+            f.write('[{"generation": 0}, {"generation": 1}]')
+
+        self.assertEqual(read_generation_log(self.session_dir), [{'generation': 0}, {'generation': 1}])
+        self.assertIsNone(read_generation_index(self.session_dir))
+
+
+class ReadGenerationRangeTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.session_dir = self._tmp.name
+        log = GenerationLog(self.session_dir)
+        for generation in range(10):
+            log.append(_record(generation))
+        log.close()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _generations(self, **kwargs):
+        return [r['generation'] for r in read_generation_range(self.session_dir, **kwargs)]
+
+    def test_whole_log(self):
+        self.assertEqual(read_generation_range(self.session_dir), [_record(g) for g in range(10)])
+
+    def test_bounds_are_inclusive(self):
+        self.assertEqual(self._generations(start=3, stop=6), [3, 4, 5, 6])
+        self.assertEqual(self._generations(start=0, stop=0), [0])
+        self.assertEqual(self._generations(start=9, stop=9), [9])
+
+    def test_open_bounds(self):
+        self.assertEqual(self._generations(start=7), [7, 8, 9])
+        self.assertEqual(self._generations(stop=2), [0, 1, 2])
+
+    def test_limit(self):
+        self.assertEqual(self._generations(start=4, limit=3), [4, 5, 6])
+        self.assertEqual(self._generations(start=8, limit=5), [8, 9])
+        self.assertEqual(self._generations(limit=0), [])
+
+    def test_out_of_range(self):
+        self.assertEqual(self._generations(start=10), [])
+        self.assertEqual(self._generations(stop=-1), [])
+        self.assertEqual(self._generations(start=6, stop=3), [])
+
+    def test_fields(self):
+        self.assertEqual(read_generation_range(self.session_dir, start=2, stop=3, fields=['max_size']),
+                         [{'generation': 2, 'max_size': 5}, {'generation': 3, 'max_size': 6}])
+
+    def test_legacy_json_log(self):
+        os.remove(os.path.join(self.session_dir, 'generation_data.jsonl'))
+        os.remove(os.path.join(self.session_dir, 'generation_data.idx'))
+        with open(os.path.join(self.session_dir, 'generation_data.json'), 'w') as f:
+            f.write('[' + ', '.join(f'{{"generation": {g}}}' for g in range(5)) + ']')
+
+        self.assertEqual(self._generations(start=1, stop=3), [1, 2, 3])
+        self.assertEqual(self._generations(start=2, limit=2), [2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""Tests for the control channel of training processes."""
+
+import io
+import json
+import os
+import threading
+import time
+import unittest
+
+from ga.snake_ipc import TrainingControl
+
+
+class TrainingControlTest(unittest.TestCase):
+
+    def setUp(self):
+        read_fd, write_fd = os.pipe()
+        self.commands = os.fdopen(write_fd, 'w', buffering=1)
+        self.events = io.StringIO()
+        self.control = TrainingControl(os.fdopen(read_fd), event_stream=self.events)
+        self.addCleanup(self._close)
+
+    def _close(self):
+        if not self.commands.closed:
+            self.commands.close()
+        self.control._reader.join(5)
+
+    def send(self, *lines):
+        # Write the command lines and wait until the reader has queued the valid ones
+        queued = self.control.commands.qsize() + sum(1 for line in lines if not isinstance(line, str))
+        for line in lines:
+            self.commands.write(line if isinstance(line, str) else json.dumps(line))
+            self.commands.write('\n')
+        deadline = time.monotonic() + 5
+        while self.control.commands.qsize() < queued and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _emitted(self):
+        return [json.loads(line) for line in self.events.getvalue().splitlines()]
+
+    def emitted(self, event_type=None):
+        return [event for event in self._emitted() if event_type is None or event['type'] == event_type]
+
+    def test_commands_are_applied_at_the_boundary(self):
+        checkpoints = []
+        profiles = []
+        self.send({'type': 'checkpoint'}, {'type': 'profile', 'generations': 3}, {'type': 'share', 'workers': 2})
+
+        stop = self.control.at_generation_boundary(
+            4, checkpoint=lambda: checkpoints.append(1) or 'checkpoint.json', profile=profiles.append)
+
+        self.assertFalse(stop)
+        self.assertEqual(checkpoints, [1])
+        self.assertEqual(profiles, [3])
+        self.assertEqual(self.control.share, 2)
+        self.assertEqual(self.emitted(), [{'type': 'checkpoint', 'generation': 4, 'path': 'checkpoint.json'}])
+
+    def test_no_pending_commands(self):
+        self.assertFalse(self.control.at_generation_boundary(1))
+        self.assertEqual(self.emitted(), [])
+
+    def test_stop(self):
+        self.send({'type': 'stop'})
+        self.assertTrue(self.control.at_generation_boundary(2))
+        self.assertTrue(self.control.stop_requested)
+
+    def test_pause_blocks_until_resume(self):
+        self.send({'type': 'pause'})
+        result = []
+        boundary = threading.Thread(target=lambda: result.append(self.control.at_generation_boundary(5)))
+        boundary.start()
+        boundary.join(0.1)
+        self.assertTrue(boundary.is_alive())
+        self.assertTrue(self.control.paused)
+
+        self.send({'type': 'resume'})
+        boundary.join(5)
+
+        self.assertEqual(result, [False])
+        self.assertFalse(self.control.paused)
+        self.assertEqual([event['type'] for event in self.emitted()], ['paused', 'resumed'])
+
+    def test_stop_ends_a_pause(self):
+        self.send({'type': 'pause'}, {'type': 'stop'})
+        self.assertTrue(self.control.at_generation_boundary(5))
+        self.assertFalse(self.control.paused)
+
+    def test_malformed_line_is_reported_and_skipped(self):
+        self.send('{not json', {'type': 'stop'})
+
+        self.assertTrue(self.control.at_generation_boundary(1))
+        errors = self.emitted('error')
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0]['message'].startswith('Invalid command: {not json'))
+
+    def test_unknown_command_is_reported(self):
+        self.send({'type': 'rewind'})
+        self.assertFalse(self.control.at_generation_boundary(1))
+        self.assertEqual(self.emitted('error'), [{'type': 'error', 'message': 'Unknown command: rewind'}])
+
+    def test_closed_channel_stops_training(self):
+        self.commands.close()
+        self.control._reader.join(5)
+
+        self.assertTrue(self.control.closed)
+        self.assertTrue(self.control.at_generation_boundary(1))
+        self.assertIsNone(self.control.next_job())
+
+    def test_jobs_tag_their_events_and_ignore_late_commands(self):
+        self.send({'type': 'pause', 'job_id': 'old'}, {'type': 'job', 'job_id': 'new', 'share': 3})
+        job = self.control.next_job()
+        self.assertEqual(job['job_id'], 'new')
+        self.assertEqual(self.control.share, 3)
+
+        self.send({'type': 'pause', 'job_id': 'old'})
+        self.assertFalse(self.control.at_generation_boundary(1))
+        self.assertFalse(self.control.paused)
+
+        self.control.emit('generation', generation=1)
+        self.assertEqual(self.emitted(), [{'type': 'generation', 'generation': 1, 'job_id': 'new'}])
+
+    def test_events_are_json_lines(self):
+        self.control.emit('timings', generation_time=1.5, phases={'evaluate': 1.0})
+        self.control.on_generation({'generation': 2, 'best_fitness': 10})
+
+        lines = self.events.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0]), {'type': 'timings', 'generation_time': 1.5,
+                                                'phases': {'evaluate': 1.0}})
+        self.assertEqual(json.loads(lines[1]), {'type': 'generation', 'generation': 2, 'best_fitness': 10})
+
+
+if __name__ == '__main__':
+    unittest.main()
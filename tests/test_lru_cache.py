@@ -0,0 +1,85 @@
+"""Tests for the LRU cache of chart series and API responses."""
+
+import unittest
+
+from ga.snake_ga_data import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_least_recently_put_entry_is_evicted(self):
+        cache = LRUCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.put('c', 3)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_get_refreshes_an_entry(self):
+        cache = LRUCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+
+    def test_put_replaces_an_entry(self):
+        cache = LRUCache(max_entries=2, max_bytes=10)
+        cache.put('a', 'xxxx')
+        cache.put('a', 'xx')
+
+        self.assertEqual(cache.get('a'), 'xx')
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_size_bound(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put('a', 'x' * 4)
+        cache.put('b', 'x' * 4)
+        cache.put('c', 'x' * 4)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['size'], 8)
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_values_larger_than_the_cache_are_not_cached(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put('a', 'x' * 4)
+        cache.put('big', 'x' * 11)
+
+        self.assertIsNone(cache.get('big'))
+        self.assertEqual(cache.get('a'), 'x' * 4)
+        self.assertEqual(cache.stats()['evictions'], 0)
+
+    def test_get_or_compute(self):
+        cache = LRUCache(max_entries=4)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 'value'
+
+        self.assertEqual(cache.get_or_compute('key', compute), 'value')
+        self.assertEqual(cache.get_or_compute('key', compute), 'value')
+        self.assertEqual(len(calls), 1)
+
+    def test_stats(self):
+        cache = LRUCache(max_entries=4)
+        self.assertEqual(cache.stats()['hit_rate'], 0.0)
+        cache.put('a', 1)
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
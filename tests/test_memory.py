@@ -0,0 +1,62 @@
+"""Tests for the memory report of training generations."""
+
+import tracemalloc
+import unittest
+
+from ga.snake_ga import GeneticAlgorithm
+from ga.snake_ga_memory import MemoryTracker, format_growth
+
+MB = 1024 * 1024
+
+
+class MemoryTrackerTest(unittest.TestCase):
+
+    def setUp(self):
+        if tracemalloc.is_tracing():
+            self.skipTest('tracemalloc is already tracing')
+        self.tracker = MemoryTracker(threshold=4 * MB)
+        self.addCleanup(self.tracker.stop)
+        self.tracker.mark()
+
+    def test_growth_is_attributed_to_the_allocating_module(self):
+        ga = GeneticAlgorithm(population_size=50)
+        buffer = bytearray(2 * MB)
+
+        report = self.tracker.snapshot(1)
+
+        self.assertEqual(report['generation'], 1)
+        self.assertGreater(report['growth_bytes'], 2 * MB)
+        self.assertGreaterEqual(report['traced_bytes'], report['growth_bytes'])
+        # Allocations outside the ga package (this test) count as other
+        self.assertGreaterEqual(report['modules']['other']['growth'], 2 * MB)
+        ga_growth = {module: entry['growth'] for module, entry in report['modules'].items()
+                     if module not in ('other', 'numpy')}
+        self.assertTrue(ga_growth)
+        self.assertGreater(sum(ga_growth.values()), 0)
+        self.assertTrue(any(line['file'].endswith('test_memory.py') for line in report['top_growth']))
+        self.assertFalse(report['warning'])
+        self.assertIn('MB', format_growth(report))
+        del ga, buffer
+
+    def test_freed_memory_shrinks_the_next_report(self):
+        buffer = bytearray(3 * MB)
+        self.assertGreater(self.tracker.snapshot(1)['growth_bytes'], 3 * MB - 1)
+        del buffer
+
+        report = self.tracker.snapshot(2)
+
+        self.assertLess(report['growth_bytes'], -2 * MB)
+        self.assertLess(report['modules']['other']['growth'], -2 * MB)
+
+    def test_warning_above_the_threshold(self):
+        buffer = bytearray(5 * MB)
+        self.assertTrue(self.tracker.snapshot(1)['warning'])
+        del buffer
+
+    def test_stop_ends_tracing(self):
+        self.tracker.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Tests for the Prometheus text rendering of the metrics."""
+
+import unittest
+
+from ga.snake_metrics import MetricsRegistry
+
+
+class MetricsRenderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter(self):
+        games = self.registry.counter('snake_games_total', 'Games played.')
+        self.assertEqual(self.registry.render(),
+                         '# HELP snake_games_total Games played.\n'
+                         '# TYPE snake_games_total counter\n'
+                         'snake_games_total 0\n')
+
+        games.inc()
+        games.inc(2.5)
+        self.assertIn('snake_games_total 3.5\n', self.registry.render())
+        with self.assertRaises(ValueError):
+            games.inc(-1)
+
+    def test_labelled_metric(self):
+        phases = self.registry.counter('snake_phase_seconds_total', 'Phase time.', ('phase',))
+        self.assertEqual(self.registry.render(),
+                         '# HELP snake_phase_seconds_total Phase time.\n'
+                         '# TYPE snake_phase_seconds_total counter\n')
+
+        phases.labels(phase='step').inc(2)
+        phases.labels(phase='evaluate').inc(0.5)
+        phases.labels(phase='step').inc(1)
+        text = self.registry.render()
+        self.assertIn('snake_phase_seconds_total{phase="step"} 3\n', text)
+        self.assertIn('snake_phase_seconds_total{phase="evaluate"} 0.5\n', text)
+        with self.assertRaises(ValueError):
+            phases.inc()
+
+    def test_gauge(self):
+        depth = self.registry.gauge('snake_queue_depth', 'Queue depth.')
+        depth.set(5)
+        depth.inc(2)
+        depth.dec()
+        self.assertIn('snake_queue_depth 6\n', self.registry.render())
+
+    def test_function_gauges(self):
+        self.registry.gauge('snake_clients', 'Connected clients.', function=lambda: 4)
+        self.registry.gauge('snake_jobs', 'Jobs by status.', ('status',),
+                            function=lambda: {('running',): 2, ('queued',): 1})
+        self.registry.gauge('snake_missing', 'Not available.', function=lambda: None)
+
+        text = self.registry.render()
+        self.assertIn('snake_clients 4\n', text)
+        self.assertIn('snake_jobs{status="running"} 2\nsnake_jobs{status="queued"} 1\n', text)
+        self.assertIn('# TYPE snake_missing gauge\n', text)
+        self.assertTrue(text.endswith('# TYPE snake_missing gauge\n'))
+
+    def test_failing_function_is_left_out(self):
+        self.registry.gauge('snake_broken', 'Fails.', function=lambda: 1 / 0)
+        self.registry.counter('snake_games_total', 'Games played.')
+
+        text = self.registry.render()
+        self.assertNotIn('snake_broken', text)
+        self.assertIn('snake_games_total 0\n', text)
+
+    def test_histogram(self):
+        durations = self.registry.histogram('snake_generation_seconds', 'Generation time.', buckets=(1, 0.5, 5))
+        for value in (0.2, 0.5, 0.7, 3, 100):
+            durations.observe(value)
+
+        self.assertEqual(self.registry.render(),
+                         '# HELP snake_generation_seconds Generation time.\n'
+                         '# TYPE snake_generation_seconds histogram\n'
+                         'snake_generation_seconds_bucket{le="0.5"} 2\n'
+                         'snake_generation_seconds_bucket{le="1"} 3\n'
+                         'snake_generation_seconds_bucket{le="5"} 4\n'
+                         'snake_generation_seconds_bucket{le="+Inf"} 5\n'
+                         'snake_generation_seconds_sum 104.4\n'
+                         'snake_generation_seconds_count 5\n')
+
+    def test_summary(self):
+        writes = self.registry.summary('snake_write_seconds', 'Write latency.')
+        writes.observe(1.5, count=3)
+        writes.observe(0.5)
+
+        text = self.registry.render()
+        self.assertIn('snake_write_seconds_sum 2\nsnake_write_seconds_count 4\n', text)
+
+    def test_escaping(self):
+        metric = self.registry.counter('snake_escaped_total', 'Back\\slash and\nnewline.', ('path',))
+        metric.labels(path='a"b\\c\nd').inc()
+
+        text = self.registry.render()
+        self.assertIn('# HELP snake_escaped_total Back\\\\slash and\\nnewline.\n', text)
+        self.assertIn('snake_escaped_total{path="a\\"b\\\\c\\nd"} 1\n', text)
+
+    def test_duplicate_name(self):
+        self.registry.counter('snake_games_total', 'Games played.')
+        with self.assertRaises(ValueError):
+            self.registry.gauge('snake_games_total', 'Again.')
+
+        self.registry.unregister('snake_games_total')
+        self.registry.gauge('snake_games_total', 'Again.')
+        self.assertEqual(self.registry.get('snake_games_total').type, 'gauge')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Tests for the background writer of training sessions."""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from ga.snake_ga_data import PersistenceWriter
+
+
+class PersistenceWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        # Never leave the writer thread blocked on a failed test
+        self.addCleanup(self.gate.set)
+
+    def _block(self, writer):
+        # Keep the writer thread busy until the gate opens
+        def wait():
+            self.started.set()
+            self.gate.wait(5)
+
+        writer.call(wait)
+        self.assertTrue(self.started.wait(5))
+
+    def _writer(self, **kwargs):
+        writer = PersistenceWriter(**kwargs)
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_writes_of_the_same_file_are_coalesced(self):
+        writer = self._writer()
+        path = os.path.join(self._tmp.name, 'summary.json')
+        self._block(writer)
+
+        for step in range(3):
+            writer.write_json(path, {'step': step})
+        self.assertEqual(writer.metrics()['queue_depth'], 1)
+        self.gate.set()
+
+        self.assertTrue(writer.flush(5))
+        with open(path) as f:
+            self.assertEqual(json.load(f), {'step': 2})
+        metrics = writer.metrics()
+        self.assertEqual(metrics['coalesced'], 2)
+        self.assertEqual(metrics['writes'], 2)
+        self.assertEqual(metrics['queue_depth'], 0)
+
+    def test_calls_are_not_coalesced(self):
+        writer = self._writer()
+        calls = []
+        self._block(writer)
+
+        for i in range(3):
+            writer.call(calls.append, i)
+        self.gate.set()
+
+        self.assertTrue(writer.flush(5))
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertEqual(writer.metrics()['coalesced'], 0)
+
+    def test_full_queue_blocks_the_caller(self):
+        writer = self._writer(max_queue=1)
+        calls = []
+        self._block(writer)
+        writer.call(calls.append, 'queued')
+
+        blocked = threading.Thread(target=writer.call, args=(calls.append, 'blocked'))
+        blocked.start()
+        blocked.join(0.1)
+        self.assertTrue(blocked.is_alive())
+        self.assertEqual(writer.metrics()['queue_depth'], 1)
+
+        self.gate.set()
+        blocked.join(5)
+        self.assertFalse(blocked.is_alive())
+        self.assertTrue(writer.flush(5))
+        self.assertEqual(calls, ['queued', 'blocked'])
+
+    def test_flush_times_out_while_writes_are_pending(self):
+        writer = self._writer()
+        self._block(writer)
+
+        self.assertFalse(writer.flush(0.05))
+        self.gate.set()
+        self.assertTrue(writer.flush(5))
+
+    def test_close_drains_the_queue(self):
+        writer = PersistenceWriter()
+        path = os.path.join(self._tmp.name, 'notes.txt')
+        calls = []
+        self._block(writer)
+        writer.call(calls.append, 1)
+        writer.write_text(path, 'last')
+
+        self.gate.set()
+        writer.close()
+
+        self.assertEqual(calls, [1])
+        with open(path) as f:
+            self.assertEqual(f.read(), 'last')
+        with self.assertRaises(RuntimeError):
+            writer.write_text(path, 'too late')
+
+    def test_errors_are_counted_and_do_not_stop_the_writer(self):
+        writer = self._writer()
+        calls = []
+
+        def fail():
+            raise OSError('disk full')
+
+        writer.call(fail)
+        writer.call(calls.append, 'after')
+
+        self.assertTrue(writer.flush(5))
+        self.assertEqual(calls, ['after'])
+        self.assertEqual(writer.metrics()['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
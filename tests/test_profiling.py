@@ -0,0 +1,88 @@
+"""Tests for the on-demand profiling of training generations."""
+
+import os
+import pstats
+import tempfile
+import time
+import unittest
+
+from ga.snake_ga_profiling import GenerationProfiler
+
+
+def busy_generation(seconds=0.05):
+    # Stand-in for the work of a generation
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+class GenerationProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.profiler = GenerationProfiler(self._tmp.name, interval=0.001)
+
+    def _run(self, first, last):
+        captures = []
+        for generation in range(first, last + 1):
+            self.profiler.begin_generation(generation)
+            busy_generation()
+            capture = self.profiler.end_generation(generation)
+            if capture is not None:
+                captures.append(capture)
+        return captures
+
+    def test_nothing_is_captured_unless_requested(self):
+        self.assertEqual(self._run(1, 3), [])
+        self.assertFalse(self.profiler.active)
+        self.assertFalse(os.path.exists(os.path.join(self._tmp.name, 'profiles')))
+
+    def test_capture_of_the_requested_generations(self):
+        self._run(1, 2)
+        self.profiler.request(2)
+        captures = self._run(3, 6)
+
+        self.assertEqual(len(captures), 1)
+        capture = captures[0]
+        self.assertEqual((capture['first_generation'], capture['last_generation']), (3, 4))
+        self.assertFalse(self.profiler.active)
+        self.assertEqual(os.path.basename(capture['pstats']), 'generations_3-4.pstats')
+
+        stats = pstats.Stats(capture['pstats'])
+        functions = {name for _, _, name in stats.stats}
+        self.assertIn('busy_generation', functions)
+
+        self.assertGreater(capture['samples'], 0)
+        with open(capture['collapsed']) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(sum(int(line.rsplit(' ', 1)[1]) for line in lines), capture['samples'])
+        self.assertTrue(any('busy_generation (test_profiling.py' in line for line in lines))
+
+    def test_request_during_a_capture_extends_it(self):
+        self.profiler.request(1)
+        self.profiler.begin_generation(1)
+        self.profiler.request(2)
+        self.assertIsNone(self.profiler.end_generation(1))
+
+        captures = self._run(2, 5)
+
+        self.assertEqual([(capture['first_generation'], capture['last_generation']) for capture in captures],
+                         [(1, 3)])
+
+    def test_stop_saves_a_capture_cut_short(self):
+        self.profiler.request(10)
+        self._run(1, 2)
+
+        capture = self.profiler.stop(2)
+
+        self.assertEqual((capture['first_generation'], capture['last_generation']), (1, 2))
+        self.assertTrue(os.path.exists(capture['pstats']))
+        self.assertTrue(os.path.exists(capture['collapsed']))
+        self.assertIsNone(self.profiler.stop(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
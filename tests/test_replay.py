@@ -0,0 +1,108 @@
+"""Tests for the compact game replays."""
+
+import os
+import random
+import tempfile
+import unittest
+
+from ga.snake_replay import (DIRECTION_NAMES, GameRecorder, GameReplay, GameReplayer, pack_directions,
+                             unpack_directions)
+from ga.snake_simulator import SnakeGameSimulator
+
+FIELDS = ('snake', 'food', 'direction', 'energy', 'score')
+
+
+def _frame(state):
+    return {field: state[field] for field in FIELDS}
+
+
+def _play(seed, policy_seed=1, max_steps=500):
+    """Record a game, steering towards the food with random safe turns; return the replay and live frames."""
+    simulator = SnakeGameSimulator(grid_size=12, seed=seed)
+    recorder = GameRecorder(simulator)
+    recorder.start(seed)
+    policy = random.Random(policy_seed)
+
+    frames = [_frame(simulator.get_state())]
+    for _ in range(max_steps):
+        head, food = simulator.snake[0], simulator.food
+        danger = simulator.get_state()['sensors']['danger']
+        safe = [name for name in DIRECTION_NAMES if not danger[name]]
+        if food['x'] != head['x']:
+            action = 'right' if food['x'] > head['x'] else 'left'
+        else:
+            action = 'down' if food['y'] > head['y'] else 'up'
+        if safe and (action not in safe or policy.random() < 0.2):
+            action = policy.choice(safe)
+        simulator.apply_action(action)
+        recorder.record()
+        game_over = simulator.step()
+        frames.append(_frame(simulator.get_state()))
+        if game_over:
+            break
+    return recorder.finish({'score': simulator.score}), frames
+
+
+class PackDirectionsTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        for count in (0, 1, 3, 4, 5, 17):
+            codes = [(i * 7) % 4 for i in range(count)]
+            packed = pack_directions(codes)
+            self.assertEqual(len(packed), -(-count // 4))
+            self.assertEqual(unpack_directions(packed, count).tolist(), codes)
+
+
+class GameReplayTest(unittest.TestCase):
+
+    def test_replayed_frames_match_the_live_game(self):
+        replay, frames = _play(seed=42)
+
+        replayer = GameReplayer(replay)
+        self.assertEqual(replayer.frame_count(), len(frames))
+        replayed = list(replayer.frames())
+        self.assertEqual([state['step'] for state in replayed], list(range(len(frames))))
+        self.assertEqual([_frame(state) for state in replayed], frames)
+
+    def test_frame_window(self):
+        replay, frames = _play(seed=7)
+
+        window = [_frame(state) for state in GameReplayer(replay).frames(start=5, stop=10)]
+        self.assertEqual(window, frames[5:10])
+        self.assertEqual(list(GameReplayer(replay).frames(start=len(frames))), [])
+
+    def test_same_seed_same_game(self):
+        first, first_frames = _play(seed=3, policy_seed=5)
+        second, second_frames = _play(seed=3, policy_seed=5)
+
+        self.assertEqual(first.actions, second.actions)
+        self.assertEqual(first_frames, second_frames)
+        self.assertEqual([_frame(s) for s in GameReplayer(first).frames()],
+                         [_frame(s) for s in GameReplayer(second).frames()])
+
+    def test_serialisation_round_trip(self):
+        replay, frames = _play(seed=11)
+
+        restored = GameReplay.from_dict(replay.to_dict())
+        self.assertEqual((restored.seed, restored.steps, restored.actions, restored.metadata),
+                         (replay.seed, replay.steps, replay.actions, replay.metadata))
+        self.assertEqual([_frame(s) for s in GameReplayer(restored).frames()], frames)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'replay.json')
+            replay.save(path)
+            self.assertEqual(GameReplay.load(path).to_dict(), replay.to_dict())
+
+    def test_movement_counts(self):
+        replay, _ = _play(seed=42)
+
+        counts = replay.movement_counts()
+        self.assertEqual(sum(counts.values()), replay.steps)
+
+    def test_rejects_other_formats(self):
+        with self.assertRaises(ValueError):
+            GameReplay.from_dict({'format': 'something-else'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Tests for the SQLite session catalog."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from ga.snake_ga_data import SessionCatalog
+
+START_TIME = 1700000000.0
+
+
+class SessionCatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _populate(self, catalog):
+        # session_0 .. session_5: even sessions completed, odd ones still active
+        for i in range(6):
+            session_id = f'session_{i}'
+            catalog.register(session_id, START_TIME + i, {'population_size': 10 + i})
+            catalog.update_progress(session_id, i, float(i * 10), 3 + i)
+            if i % 2 == 0:
+                catalog.finish(session_id, {'duration': f'0:00:0{i}', 'generations': i,
+                                            'best_fitness': float(i * 10), 'max_snake_size': 3 + i})
+
+    def _ids(self, sessions):
+        return [session['session_id'] for session in sessions]
+
+    def test_register_and_get(self):
+        catalog = SessionCatalog(self.data_dir)
+        catalog.register('session_a', START_TIME, {'generations': 5})
+
+        session = catalog.get('session_a')
+        self.assertEqual(session['status'], 'active')
+        self.assertEqual(session['config'], {'generations': 5})
+        self.assertEqual(session['started_at'], START_TIME)
+        self.assertTrue(catalog.is_active('session_a'))
+        self.assertIsNone(catalog.get('missing'))
+        self.assertIsNone(catalog.is_active('missing'))
+
+    def test_pagination(self):
+        catalog = SessionCatalog(self.data_dir)
+        self._populate(catalog)
+
+        self.assertEqual(self._ids(catalog.list()), [f'session_{i}' for i in range(6)])
+        self.assertEqual(self._ids(catalog.list(limit=2)), ['session_0', 'session_1'])
+        self.assertEqual(self._ids(catalog.list(limit=2, offset=2)), ['session_2', 'session_3'])
+        self.assertEqual(self._ids(catalog.list(limit=4, offset=4)), ['session_4', 'session_5'])
+        self.assertEqual(catalog.list(limit=2, offset=6), [])
+        self.assertEqual(self._ids(catalog.list(limit=2, descending=True)), ['session_5', 'session_4'])
+
+    def test_filters(self):
+        catalog = SessionCatalog(self.data_dir)
+        self._populate(catalog)
+
+        self.assertEqual(self._ids(catalog.list(status='completed')), ['session_0', 'session_2', 'session_4'])
+        self.assertEqual(self._ids(catalog.list(status='active')), ['session_1', 'session_3', 'session_5'])
+        self.assertEqual(self._ids(catalog.list(min_fitness=30)), ['session_3', 'session_4', 'session_5'])
+        self.assertEqual(self._ids(catalog.list(status='completed', min_fitness=30, limit=1)), ['session_4'])
+        self.assertEqual(catalog.count(), 6)
+        self.assertEqual(catalog.count(status='active'), 3)
+        self.assertEqual(catalog.count(status='completed', min_fitness=30), 1)
+
+    def test_order_by(self):
+        catalog = SessionCatalog(self.data_dir)
+        self._populate(catalog)
+
+        self.assertEqual(self._ids(catalog.list(order_by='best_fitness', descending=True, limit=3)),
+                         ['session_5', 'session_4', 'session_3'])
+        with self.assertRaises(ValueError):
+            catalog.list(order_by='session_id; DROP TABLE sessions')
+
+    def test_end_only_changes_active_sessions(self):
+        catalog = SessionCatalog(self.data_dir)
+        self._populate(catalog)
+
+        self.assertTrue(catalog.end('session_1', 'stopped'))
+        self.assertFalse(catalog.end('session_0', 'failed'))
+        self.assertFalse(catalog.end('missing', 'failed'))
+        self.assertEqual(catalog.get('session_1')['status'], 'stopped')
+        self.assertEqual(catalog.get('session_0')['status'], 'completed')
+
+    def test_reopen_keeps_sessions(self):
+        self._populate(SessionCatalog(self.data_dir))
+
+        catalog = SessionCatalog(self.data_dir)
+        self.assertEqual(catalog.count(), 6)
+        self.assertEqual(catalog.get('session_3')['generations'], 3)
+
+    def test_legacy_sessions_json_import(self):
+        legacy = [
+            {'session_id': 'session_old', 'start_time': '2024-01-02 03:04:05', 'duration': '0:10:00',
+             'generations': 50, 'best_fitness': 123.5, 'max_snake_size': 12},
+            {'session_id': 'session_no_time', 'generations': 3}
+        ]
+        with open(os.path.join(self.data_dir, 'sessions.json'), 'w') as f:
+            json.dump(legacy, f)
+
+        catalog = SessionCatalog(self.data_dir)
+
+        self.assertEqual(catalog.count(status='completed'), 2)
+        session = catalog.get('session_old')
+        self.assertEqual(session['start_time'], '2024-01-02 03:04:05')
+        self.assertEqual((session['duration'], session['generations'], session['best_fitness'],
+                          session['max_snake_size']), ('0:10:00', 50, 123.5, 12))
+        self.assertIsNotNone(session['started_at'])
+        session = catalog.get('session_no_time')
+        self.assertIsNone(session['started_at'])
+        self.assertEqual((session['best_fitness'], session['max_snake_size']), (0, 3))
+
+    def test_legacy_import_runs_once(self):
+        path = os.path.join(self.data_dir, 'sessions.json')
+        with open(path, 'w') as f:
+            json.dump([{'session_id': 'session_old', 'start_time': '2024-01-02 03:04:05'}], f)
+        SessionCatalog(self.data_dir)
+
+        with open(path, 'w') as f:
+            json.dump([{'session_id': 'session_new', 'start_time': '2024-01-03 03:04:05'}], f)
+
+        self.assertIsNone(SessionCatalog(self.data_dir).get('session_new'))
+
+    def test_invalid_legacy_file_is_ignored(self):
+        with open(os.path.join(self.data_dir, 'sessions.json'), 'w') as f:
+            f.write('[{"session_id": ')
+
+        self.assertEqual(SessionCatalog(self.data_dir).count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests for the SnakeMach channels and subscribers."""
+
+import unittest
+from unittest import mock
+
+try:
+    from ga.snake_mach import ALL_CHANNELS, SnakeMach
+except ImportError:  # Flask is optional
+    SnakeMach = None
+
+STATE = {'snake': [{'x': 1, 'y': 1}], 'food': {'x': 3, 'y': 3}, 'score': 0, 'energy': 10}
+
+
+@unittest.skipIf(SnakeMach is None, 'Flask is not installed')
+class SnakeMachSubscriptionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.mach = SnakeMach()
+        self.submit = mock.patch.object(self.mach.publisher, 'submit').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_watcher_counts(self):
+        self.mach.subscribe('sid_1', 'agent_1')
+        self.mach.subscribe('sid_1', 'agent_1')
+        self.mach.subscribe('sid_2', 'agent_1')
+        self.mach.subscribe('sid_2', 'agent_2')
+        self.mach.subscribe('sid_3', ALL_CHANNELS)
+        self.assertEqual(self.mach.watchers, {'agent_1': 2, 'agent_2': 1})
+        self.assertEqual(self.mach.all_watchers, 1)
+
+        self.mach.unsubscribe('sid_1', 'agent_1')
+        self.mach.unsubscribe('sid_1', 'agent_1')
+        self.assertEqual(self.mach.watchers, {'agent_1': 1, 'agent_2': 1})
+
+        self.mach.unsubscribe('sid_2')
+        self.mach.unsubscribe('sid_3')
+        self.assertEqual(self.mach.watchers, {})
+        self.assertEqual(self.mach.all_watchers, 0)
+
+    def test_only_watched_channels_are_published(self):
+        self.mach.subscribe('sid_1', 'agent_1')
+
+        self.mach.update_state('agent_1', STATE)
+        self.mach.update_state('agent_2', STATE)
+        self.assertEqual([call.args[0] for call in self.submit.call_args_list], ['agent_1'])
+
+        self.mach.subscribe('sid_2', ALL_CHANNELS)
+        self.submit.reset_mock()
+        self.mach.update_state('agent_2', STATE)
+        self.assertEqual([call.args[0] for call in self.submit.call_args_list], ['agent_2'])
+
+    def test_unwatched_channels_are_not_kept(self):
+        self.mach.update_state('agent_1', STATE)
+
+        self.assertEqual(self.mach.channels, {})
+        self.assertIsNone(self.mach.get_channel('agent_1'))
+        self.submit.assert_not_called()
+
+    def test_reset_closes_through_the_publisher(self):
+        self.mach.subscribe('sid_1', 'agent_1')
+        self.mach.update_state('agent_1', STATE)
+
+        with mock.patch.object(self.mach.publisher, 'close') as close, \
+                mock.patch('ga.snake_mach.socketio') as socketio:
+            self.mach.reset('agent_1')
+            self.mach.reset('agent_2')
+        close.assert_called_once_with('agent_1')
+        socketio.emit.assert_not_called()
+        self.assertIsNone(self.mach.get_channel('agent_1'))
+
+    def test_list_channels_counts_subscribers(self):
+        self.mach.subscribe('sid_1', 'agent_1')
+        self.mach.subscribe('sid_2', 'agent_1')
+        self.mach.update_state('agent_1', STATE)
+
+        channels = self.mach.list_channels()
+        self.assertEqual([(channel['channel'], channel['subscribers']) for channel in channels], [('agent_1', 2)])
+
+
+@unittest.skipIf(SnakeMach is None, 'Flask is not installed')
+class SnakeMachDeliveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.mach = SnakeMach(max_fps=0)
+        # Frames are published on this thread and queued per subscriber: no thread is started
+        mock.patch.object(self.mach.publisher, '_start').start()
+        mock.patch.object(self.mach, '_start_sender').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _events(self, sid):
+        return [(event, data['channel']) for event, data in self.mach.subscribers[sid].queue]
+
+    def test_channel_closed_follows_the_last_frame(self):
+        self.mach.subscribe('sid_1', 'agent_1')
+        self.mach.subscribe('sid_2', 'agent_2')
+        self.mach.update_state('agent_1', STATE)
+        self.mach.reset('agent_1')
+        self.mach.update_state('agent_2', STATE)
+        self.mach.publisher.publish_pending()
+
+        self.assertEqual(self._events('sid_1'), [('game_update', 'agent_1'), ('channel_closed', 'agent_1')])
+        self.assertEqual(self._events('sid_2'), [('game_update', 'agent_2')])
+
+    def test_new_game_after_close_starts_with_a_keyframe(self):
+        self.mach.subscribe('sid_1', 'agent_1')
+        self.mach.update_state('agent_1', STATE)
+        self.mach.reset('agent_1')
+        self.mach.update_state('agent_1', STATE)
+        self.mach.publisher.publish_pending()
+
+        queue = list(self.mach.subscribers['sid_1'].queue)
+        self.assertEqual([event for event, _ in queue], ['channel_closed', 'game_update'])
+        self.assertEqual(queue[1][1]['type'], 'keyframe')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Tests for the per-phase timers of training generations."""
+
+import contextlib
+import io
+import threading
+import unittest
+from unittest import mock
+
+from ga import snake_ga_timing
+from ga.snake_ga import GeneticAlgorithm
+from ga.snake_ga_timing import PhaseTimers
+from ga.snake_ga_training import train_agent
+from ga.snake_simulator import SnakeGameSimulator
+
+
+class PhaseTimersTest(unittest.TestCase):
+
+    def test_time_and_calls_accumulate_per_phase(self):
+        timers = PhaseTimers()
+        timers.add('step', 0.5)
+        timers.add('step', 0.25, calls=3)
+        timers.add('evolve', 1.0)
+
+        self.assertEqual(timers.collect(), {'step': {'seconds': 0.75, 'calls': 4},
+                                            'evolve': {'seconds': 1.0, 'calls': 1}})
+
+    def test_collect_starts_over(self):
+        timers = PhaseTimers()
+        timers.add('step', 0.5)
+        timers.collect()
+
+        self.assertEqual(timers.collect(), {})
+        timers.add('step', 0.1)
+        self.assertEqual(timers.collect(), {'step': {'seconds': 0.1, 'calls': 1}})
+
+    def test_phase_times_a_block(self):
+        timers = PhaseTimers()
+        with mock.patch.object(snake_ga_timing, 'clock', side_effect=[10.0, 12.5, 20.0, 21.0]):
+            with timers.phase('evolve'):
+                pass
+            with self.assertRaises(ValueError):
+                with timers.phase('evolve'):
+                    raise ValueError()
+
+        self.assertEqual(timers.collect(), {'evolve': {'seconds': 3.5, 'calls': 2}})
+
+    def test_merge(self):
+        timers = PhaseTimers()
+        timers.add('step', 1.0, calls=2)
+        timers.merge({'step': {'seconds': 0.5, 'calls': 3}, 'get_state': {'seconds': 0.25, 'calls': 5}})
+
+        self.assertEqual(timers.collect(), {'step': {'seconds': 1.5, 'calls': 5},
+                                            'get_state': {'seconds': 0.25, 'calls': 5}})
+
+    def test_concurrent_adds(self):
+        timers = PhaseTimers()
+
+        def add():
+            for _ in range(1000):
+                timers.add('disk', 0.001)
+
+        threads = [threading.Thread(target=add) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        timings = timers.collect()
+        self.assertEqual(timings['disk']['calls'], 4000)
+        self.assertAlmostEqual(timings['disk']['seconds'], 4.0)
+
+
+class TrainingPhasesTest(unittest.TestCase):
+
+    def test_train_agent_times_every_step(self):
+        timers = PhaseTimers()
+        agent = GeneticAlgorithm(population_size=1).population[0]
+        simulator = SnakeGameSimulator(grid_size=10, timers=timers)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            train_agent(agent, simulator, max_steps=30, games=2, timers=timers)
+
+        timings = timers.collect()
+        steps = timings['step']['calls']
+        self.assertGreater(steps, 0)
+        self.assertLessEqual(steps, 60)
+        self.assertEqual(timings['get_state']['calls'], steps)
+        self.assertEqual(timings['decide_action']['calls'], steps)
+        # calculate_vision is measured by the simulator inside get_state
+        self.assertGreaterEqual(timings['calculate_vision']['calls'], steps)
+        for phase in ('get_state', 'decide_action', 'step'):
+            self.assertGreater(timings[phase]['seconds'], 0.0)
+
+    def test_evolve_phases(self):
+        timers = PhaseTimers()
+        ga = GeneticAlgorithm(population_size=10)
+        for i, agent in enumerate(ga.population):
+            agent.fitness = float(i)
+
+        ga.evolve(timers)
+
+        timings = timers.collect()
+        for phase in ('evolve.selection', 'evolve.crossover', 'evolve.mutation'):
+            self.assertIn(phase, timings)
+
+
+if __name__ == '__main__':
+    unittest.main()
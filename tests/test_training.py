@@ -0,0 +1,145 @@
+"""Tests for the training loop."""
+
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from ga import snake_ga_training
+from ga.snake_ga import GeneticAlgorithm
+from ga.snake_ga_data import (TrainingData, WeightArchive, get_session_catalog, load_best_agent,
+                              read_generation_log)
+
+CONFIG = {'population': 10, 'generations': 4, 'games': 1, 'steps': 60, 'grid': 10}
+
+
+class RunTrainingTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        # Sessions are written to ../data, relative to the working directory
+        work_dir = os.path.join(self._tmp.name, 'work')
+        os.makedirs(work_dir)
+        self._cwd = os.getcwd()
+        os.chdir(work_dir)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _train(self):
+        evaluated = []
+        train_population = snake_ga_training.train_population
+
+        def record_evaluated(ga, *args, **kwargs):
+            population = train_population(ga, *args, **kwargs)
+            evaluated.append([(agent.fitness, agent.food_eaten, agent.steps_taken) for agent in population])
+            return population
+
+        with mock.patch.object(snake_ga_training, 'train_population', record_evaluated), \
+                contextlib.redirect_stdout(io.StringIO()):
+            training_data = snake_ga_training.run_training(CONFIG)
+        return training_data, evaluated
+
+    def test_records_the_evaluated_generation(self):
+        training_data, evaluated = self._train()
+        session_dir = training_data.session_dir
+
+        records = read_generation_log(session_dir)
+        best_agents = read_generation_log(session_dir, 'best_agents')
+        archive = WeightArchive(session_dir)
+        self.assertEqual(len(records), CONFIG['generations'])
+        self.assertEqual(archive.count, CONFIG['generations'])
+
+        for generation, agents in enumerate(evaluated):
+            best = max(agents)
+            fitnesses = [fitness for fitness, _, _ in agents]
+            self.assertEqual(records[generation]['best_fitness'], best[0])
+            self.assertAlmostEqual(records[generation]['avg_fitness'], sum(fitnesses) / len(fitnesses))
+            self.assertEqual(records[generation]['max_size'], max(food for _, food, _ in agents) + 3)
+            self.assertEqual(best_agents[generation]['fitness'], best[0])
+
+            archived = archive.get(generation)
+            self.assertEqual(archived['fitness'], best[0])
+            self.assertIn((archived['fitness'], archived['food_eaten'], archived['steps_taken']), agents)
+            self.assertGreater(archived['steps_taken'], 0)
+
+        self.assertEqual(load_best_agent(training_data.session_id)['fitness'], max(evaluated[-1])[0])
+        self.assertEqual(training_data.best_fitness, max(max(agents)[0] for agents in evaluated))
+
+
+class BestFitnessTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.training_data = TrainingData(data_dir=self._tmp.name)
+
+    def _record(self, generation, fitnesses):
+        population = GeneticAlgorithm(population_size=len(fitnesses)).population
+        for agent, fitness in zip(population, fitnesses):
+            agent.fitness = fitness
+        self.training_data.record_generation(generation=generation, population=population,
+                                             best_fitness=max(fitnesses), diversity=0.0)
+
+    def _catalog_entry(self):
+        return get_session_catalog(self._tmp.name).get(self.training_data.session_id)
+
+    def test_negative_fitness(self):
+        for generation, fitnesses in enumerate(([-9.0, -5.0], [-7.0, -3.0], [-8.0, -4.0])):
+            self._record(generation, fitnesses)
+
+        self.assertEqual(self.training_data.best_fitness, -3.0)
+        self.training_data.save_training_data()
+        self.training_data.flush()
+        self.assertEqual(self._catalog_entry()['best_fitness'], -3.0)
+
+        self.training_data.save_training_session()
+        self.assertEqual(self._catalog_entry()['best_fitness'], -3.0)
+
+    def test_none_until_a_generation_is_recorded(self):
+        self.assertIsNone(self.training_data.best_fitness)
+        self.assertIsNone(self.training_data.export_for_dashboard()['current']['best_fitness'])
+
+        self.training_data.save_training_session()
+
+        entry = self._catalog_entry()
+        self.assertEqual((entry['status'], entry['best_fitness']), ('completed', 0))
+
+
+class ReportQueuesTest(unittest.TestCase):
+
+    def test_reports_until_stopped(self):
+        control = mock.Mock()
+        training_data = mock.Mock()
+        training_data.persistence_metrics.return_value = {'queue_depth': 2}
+        pool = mock.Mock(queue_depth=7)
+        stop = threading.Event()
+
+        def emit(event_type, **data):
+            if control.emit.call_count >= 2:
+                stop.set()
+
+        control.emit.side_effect = emit
+        snake_ga_training.report_queues(control, training_data, pool, stop, interval=0.01)
+
+        self.assertEqual(control.emit.call_count, 2)
+        control.emit.assert_called_with('queues', evaluation=7, persistence=2)
+
+    def test_no_evaluation_queue_without_a_pool(self):
+        control = mock.Mock()
+        training_data = mock.Mock()
+        training_data.persistence_metrics.return_value = {'queue_depth': 0}
+        stop = threading.Event()
+        control.emit.side_effect = lambda *args, **kwargs: stop.set()
+
+        snake_ga_training.report_queues(control, training_data, None, stop, interval=0.01)
+
+        control.emit.assert_called_once_with('queues', evaluation=0, persistence=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,231 @@
+"""Tests for the training service: job states, metrics and the CPU shares of concurrent jobs."""
+
+import unittest
+from unittest import mock
+
+from ga import snake_training_service
+from ga.snake_training_service import TrainingService, fair_shares
+
+
+class FakeProcess:
+    """Worker process stand-in: records the commands sent and replays events."""
+
+    def __init__(self, args, on_event=None, on_output=None, cwd=None):
+        self.on_event = on_event
+        self.sent = []
+        self.alive = True
+        self.process = mock.Mock(returncode=None)
+
+    def send(self, command_type, **data):
+        if not self.alive:
+            return False
+        self.sent.append(dict(data, type=command_type))
+        return True
+
+    def emit(self, event_type, **data):
+        self.on_event(dict(data, type=event_type))
+
+    def is_alive(self):
+        return self.alive
+
+    def close(self):
+        self.alive = False
+
+    def wait(self, timeout=None):
+        return 0
+
+    def terminate(self):
+        self.alive = False
+        self.process.returncode = -9
+
+
+class ServiceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(snake_training_service, 'TrainingProcess', FakeProcess)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = TrainingService(workers=2, capacity=4)
+        self.addCleanup(self.service.shutdown)
+        for worker in self.service._workers:
+            worker.process.emit('ready')
+
+    def process(self, job):
+        return self.service._workers[job.worker].process
+
+
+class JobStateTest(ServiceTestCase):
+
+    def test_submitted_jobs_start_on_idle_workers(self):
+        jobs = [self.service.submit({'workers': 1}) for _ in range(3)]
+
+        self.assertEqual([job.state for job in jobs], ['running', 'running', 'queued'])
+        self.assertEqual(self.process(jobs[0]).sent[0]['type'], 'job')
+        self.assertEqual(self.process(jobs[0]).sent[0]['job_id'], jobs[0].id)
+        self.assertEqual(self.service.queue_position(jobs[2].id), 0)
+
+    def test_budget_is_capped_at_the_capacity(self):
+        job = self.service.submit({'workers': 16})
+        self.assertEqual(job.config['workers'], 4)
+        self.assertEqual(job.share, 4)
+
+    def test_pause_resume_and_stop(self):
+        job = self.service.submit({'workers': 1})
+        process = self.process(job)
+
+        self.assertTrue(self.service.send(job.id, 'pause'))
+        self.assertEqual(process.sent[-1], {'type': 'pause', 'job_id': job.id})
+        process.emit('paused', job_id=job.id, generation=2)
+        self.assertEqual(job.state, 'paused')
+
+        self.service.send(job.id, 'resume')
+        process.emit('resumed', job_id=job.id, generation=2)
+        self.assertEqual(job.state, 'running')
+
+        self.service.send(job.id, 'stop')
+        process.emit('stopped', job_id=job.id)
+        self.assertEqual(job.state, 'stopped')
+        self.assertTrue(self.service.wait(job.id, 0))
+        self.assertFalse(self.service.send(job.id, 'pause'))
+
+    def test_job_done_frees_the_worker_for_the_next_job(self):
+        first = self.service.submit({'workers': 1})
+        self.service.submit({'workers': 1})
+        third = self.service.submit({'workers': 1})
+        process = self.process(first)
+
+        process.emit('finished', job_id=first.id)
+        self.assertEqual(first.state, 'finished')
+        self.assertEqual(third.state, 'queued')
+        process.emit('job_done', job_id=first.id)
+
+        self.assertEqual(third.state, 'running')
+        self.assertIs(self.process(third), process)
+
+    def test_error_fails_the_job(self):
+        job = self.service.submit({'workers': 1})
+        self.process(job).emit('job_done', job_id=job.id, error='boom')
+
+        self.assertEqual(job.state, 'failed')
+        self.assertEqual(job.error, 'boom')
+
+    def test_cancel(self):
+        running = self.service.submit({'workers': 1})
+        self.service.submit({'workers': 1})
+        queued = self.service.submit({'workers': 1})
+
+        self.assertTrue(self.service.cancel(queued.id))
+        self.assertEqual(queued.state, 'cancelled')
+        self.assertFalse(self.service.cancel(queued.id))
+
+        self.assertTrue(self.service.cancel(running.id))
+        self.assertEqual(self.process(running).sent[-1], {'type': 'stop', 'job_id': running.id,
+                                                          'reason': 'cancelled'})
+        self.process(running).emit('stopped', job_id=running.id)
+        self.assertEqual(running.state, 'cancelled')
+
+    def test_events_of_other_jobs_are_ignored(self):
+        job = self.service.submit({'workers': 1})
+        events = []
+        self.service.on_event = events.append
+
+        self.process(job).emit('paused', job_id='unknown')
+        self.process(job).emit('generation', job_id=job.id, record={'generation': 1})
+        self.process(job).emit('job_done', job_id=job.id)
+
+        self.assertEqual(job.state, 'finished')
+        self.assertEqual(job.last_generation, {'generation': 1})
+        self.assertEqual([event['type'] for event in events], ['generation'])
+
+    def test_sessions_are_ended_outside_the_lock(self):
+        job = self.service.submit({'workers': 1})
+        self.process(job).emit('started', job_id=job.id, session_id='session_1')
+        catalog = mock.Mock()
+        locked = []
+        catalog.end.side_effect = lambda *args: locked.append(self.service._lock.locked())
+
+        with mock.patch.object(snake_training_service, 'get_session_catalog', return_value=catalog):
+            self.process(job).emit('job_done', job_id=job.id, error='boom')
+
+        catalog.end.assert_called_once_with('session_1', 'failed')
+        self.assertEqual(locked, [False])
+
+
+class MetricsTest(ServiceTestCase):
+
+    def test_workers_jobs_and_shares(self):
+        first = self.service.submit({'workers': 4})
+        second = self.service.submit({'workers': 4})
+        self.service.submit({'workers': 1})
+        self.process(first).emit('paused', job_id=first.id)
+
+        metrics = self.service.metrics()
+        self.assertEqual((metrics['workers'], metrics['workers_ready'], metrics['workers_busy']), (2, 2, 2))
+        self.assertEqual(metrics['queued'], 1)
+        self.assertEqual(metrics['capacity'], 4)
+        # The paused job's CPUs go to the running one
+        self.assertEqual(second.share, 4)
+        self.assertEqual(metrics['allocated'], 4)
+        self.assertEqual(metrics['jobs']['running'], 1)
+        self.assertEqual(metrics['jobs']['paused'], 1)
+        self.assertEqual(metrics['jobs']['queued'], 1)
+
+
+class QueueDepthTest(ServiceTestCase):
+
+    def test_depths_of_the_active_jobs_are_summed(self):
+        first = self.service.submit({'workers': 2})
+        second = self.service.submit({'workers': 2})
+        self.process(first).emit('queues', job_id=first.id, evaluation=5, persistence=1)
+        self.process(second).emit('queues', job_id=second.id, evaluation=3, persistence=2)
+
+        metrics = self.service.metrics()
+        self.assertEqual(metrics['evaluation_queue_depth'], 8)
+        self.assertEqual(metrics['persistence_queue_depth'], 3)
+
+        self.process(second).emit('paused', job_id=second.id)
+        self.assertEqual(self.service.metrics()['evaluation_queue_depth'], 8)
+
+        self.process(first).emit('finished', job_id=first.id)
+        metrics = self.service.metrics()
+        self.assertEqual(metrics['evaluation_queue_depth'], 3)
+        self.assertEqual(metrics['persistence_queue_depth'], 2)
+
+
+class FairSharesTest(unittest.TestCase):
+
+    def test_small_budgets_are_met_and_the_rest_is_split(self):
+        self.assertEqual(fair_shares({'a': 4, 'b': 1, 'c': 8}, 8), {'a': 4, 'b': 1, 'c': 3})
+        self.assertEqual(fair_shares({'a': 1, 'b': 2, 'c': 10}, 12), {'a': 1, 'b': 2, 'c': 9})
+
+    def test_budgets_below_capacity_are_met(self):
+        self.assertEqual(fair_shares({'a': 2, 'b': 3}, 16), {'a': 2, 'b': 3})
+        self.assertEqual(fair_shares({'a': 4}, 4), {'a': 4})
+
+    def test_equal_budgets_split_evenly_older_jobs_first(self):
+        self.assertEqual(fair_shares({'a': 10, 'b': 10, 'c': 10}, 8), {'a': 3, 'b': 3, 'c': 2})
+        self.assertEqual(fair_shares({'c': 10, 'b': 10, 'a': 10}, 8), {'c': 3, 'b': 3, 'a': 2})
+
+    def test_max_min_fairness(self):
+        budgets = {f'job_{i}': budget for i, budget in enumerate((1, 7, 3, 12, 2, 5))}
+        for capacity in range(len(budgets), 40):
+            shares = fair_shares(budgets, capacity)
+
+            self.assertEqual(shares.keys(), budgets.keys())
+            self.assertEqual(sum(shares.values()), min(capacity, sum(budgets.values())))
+            self.assertTrue(all(1 <= shares[job_id] <= budgets[job_id] for job_id in budgets))
+            # A job gets less than its budget only if no other job gets more than one CPU above it
+            for job_id, share in shares.items():
+                if share < budgets[job_id]:
+                    self.assertLessEqual(max(shares.values()), share + 1)
+
+    def test_at_least_one_cpu_each(self):
+        self.assertEqual(fair_shares({'a': 1, 'b': 1}, 1), {'a': 1, 'b': 1})
+        self.assertEqual(fair_shares({'a': 4, 'b': 4, 'c': 4}, 2), {'a': 1, 'b': 1, 'c': 1})
+
+    def test_no_jobs(self):
+        self.assertEqual(fair_shares({}, 8), {})
+
+
+if __name__ == '__main__':
+    unittest.main()